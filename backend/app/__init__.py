@@ -1,11 +1,15 @@
+import json
 import os
 from flask import Flask, request, make_response
 from flask_cors import CORS
-from flask_session import Session
+from .log import init_logging
+from .serialization import FastJSONProvider
 
 # Import blueprints (to be created)
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
+    # orjson-backed jsonify when orjson is installed
+    app.json = FastJSONProvider(app)
     # Ensure the database directory exists
     db_dir = os.path.dirname(__file__)
     os.makedirs(db_dir, exist_ok=True)
@@ -14,13 +18,45 @@ def create_app():
     uploads_dir = os.path.join(db_dir, 'uploads')
     os.makedirs(uploads_dir, exist_ok=True)
     app.config['UPLOAD_FOLDER'] = uploads_dir
+    # How upload bodies are sent: 'app' (Flask streams them), 'x-sendfile'
+    # (Apache/lighttpd send the file) or 'x-accel' (nginx sends the file from
+    # an internal location such as
+    #   location /protected-uploads/ { internal; alias /app/app/uploads/; })
+    app.config['UPLOADS_SERVE_MODE'] = os.environ.get('UPLOADS_SERVE_MODE', 'app')
+    app.config['UPLOADS_ACCEL_PREFIX'] = os.environ.get('UPLOADS_ACCEL_PREFIX', '/protected-uploads/')
     app.secret_key = os.environ.get('SECRET_KEY', 'your-very-secret-key')
 
-    # Configure Flask-Session for filesystem-backed sessions
-    app.config['SESSION_TYPE'] = 'filesystem'
-    app.config['SESSION_FILE_DIR'] = os.path.join(db_dir, 'flask_session')
-    os.makedirs(app.config['SESSION_FILE_DIR'], exist_ok=True)
-    Session(app)
+    # Response cache for public GET endpoints: 'memory' (per-worker LRU),
+    # 'shared' (SQLite file used by every worker) or 'none'
+    app.config['RESPONSE_CACHE'] = os.environ.get('RESPONSE_CACHE', 'memory')
+    app.config['RESPONSE_CACHE_PATH'] = os.path.join(db_dir, 'response_cache.db')
+
+    # Session storage: 'sqlite' (server side, in the sessions table) or
+    # 'signed' (stateless signed cookie, no storage lookup)
+    app.config['SESSION_BACKEND'] = os.environ.get('SESSION_BACKEND', 'sqlite')
+
+    # Per-request SQL profiling (X-SQL-* response headers and debug log)
+    app.config['SQL_PROFILER'] = os.environ.get('SQL_PROFILER') == '1'
+
+    # Prometheus metrics at /metrics; workers share snapshots through
+    # METRICS_DIR (defaults to a metrics/ folder next to the database).
+    # Without METRICS_TOKEN only local, unproxied scrapers are answered.
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '1') == '1'
+    app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR')
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+    # /health reports 503 when a database round trip is slower than this
+    app.config['HEALTH_DB_TIMEOUT_MS'] = float(os.environ.get('HEALTH_DB_TIMEOUT_MS', 500))
+
+    # Structured logging: JSON lines (or 'text') written off the request
+    # thread. LOG_ROUTES maps a route to a minimum level and a sample rate.
+    app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO')
+    app.config['LOG_FORMAT'] = os.environ.get(
+        'LOG_FORMAT', 'text' if os.environ.get('FLASK_ENV') == 'development' else 'json')
+    app.config['LOG_REQUESTS'] = os.environ.get('LOG_REQUESTS', '1') == '1'
+    app.config['LOG_ROUTES'] = json.loads(os.environ['LOG_ROUTES']) if os.environ.get('LOG_ROUTES') else {
+        '/health': {'sample': 0.01},
+        '/metrics': {'level': 'WARNING'},
+    }
 
     # Configure session for cross-origin cookies
     app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production with HTTPS
@@ -29,12 +65,21 @@ def create_app():
     app.config['SESSION_COOKIE_DOMAIN'] = None  # Let Flask set the domain
     app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1 hour
 
+    # Overrides for benchmarks and scripts (e.g. a temporary DATABASE)
+    if test_config:
+        app.config.update(test_config)
+    # After the overrides, so a configured serve mode takes effect
+    app.config['USE_X_SENDFILE'] = app.config['UPLOADS_SERVE_MODE'] == 'x-sendfile'
+
+    init_logging(app)
+
     # Configure CORS for production - specify explicit origins for credentials
     CORS(app, 
          supports_credentials=True,
          origins=['https://nufl.netlify.app', 'http://localhost:5173', 'http://localhost:3000'],
          allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
-         expose_headers=['Set-Cookie'],
+         expose_headers=['Set-Cookie', 'X-Next-Cursor', 'Content-Disposition',
+                         'X-SQL-Queries', 'X-SQL-Time', 'X-SQL-Repeated', 'X-Request-ID'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
 
     # Add CORS preflight handler
@@ -61,6 +106,12 @@ def create_app():
     from .routes.auth import auth_bp
     from .routes.uploads import uploads_bp
     from .routes.misc import misc_bp
+    from .routes.changes import changes_bp
+    from .routes.live import live_bp
+    from .routes.exports import exports_bp
+    from .routes.imports import imports_bp
+    from .routes.search import search_bp
+    from .routes.metrics import metrics_bp
 
     app.register_blueprint(teams_bp)
     app.register_blueprint(players_bp)
@@ -69,11 +120,26 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(uploads_bp)
     app.register_blueprint(misc_bp)
+    app.register_blueprint(changes_bp)
+    app.register_blueprint(live_bp)
+    app.register_blueprint(exports_bp)
+    app.register_blueprint(imports_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(metrics_bp)
 
     # Import models and utils if needed
     from . import models, utils
+    from .commands import register_commands
+    from .sessions import init_sessions
+    from .profiler import init_profiler
+    from .metrics import init_metrics
 
     # Initialize DB if needed
+    app.teardown_appcontext(models.close_db_connection)
     models.init_db(app)
+    init_sessions(app)
+    init_profiler(app)
+    init_metrics(app)
+    register_commands(app)
 
     return app 
\ No newline at end of file
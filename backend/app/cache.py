@@ -0,0 +1,330 @@
+# Response cache and conditional GET support for public endpoints
+# Every cached view declares the tables it reads. Writers bump those tables'
+# counters in data_versions inside their own transaction, and the counters are
+# part of the cache key, so a worker can never serve a response built from
+# data that another worker has since changed.
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+from .db_pool import connect
+from .models import get_db_connection
+
+# Headers that belong to one particular response and must not be replayed
+UNCACHED_HEADERS = {'set-cookie', 'content-length', 'x-cache'}
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(('hits', 'misses', 'stores', 'evictions', 'invalidations'), 0)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_rate'] = round(counts['hits'] / lookups, 4) if lookups else 0.0
+        return counts
+
+
+class NullBackend:
+    name = 'none'
+
+    def get(self, key):
+        return None
+
+    def set(self, key, entry):
+        pass
+
+    def purge(self, tables):
+        pass
+
+    def clear(self):
+        pass
+
+    def size(self):
+        return {'entries': 0}
+
+
+class MemoryBackend:
+    # In-process LRU bounded by entry count and total body bytes
+    name = 'memory'
+
+    def __init__(self, stats, max_entries=512, max_bytes=32 * 1024 * 1024):
+        self.stats = stats
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        size = len(entry['body'])
+        if size > self.max_bytes:
+            return
+        evicted = 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old['body'])
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= len(old['body'])
+                evicted += 1
+        if evicted:
+            self.stats.incr('evictions', evicted)
+
+    def purge(self, tables):
+        tables = set(tables)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if tables & set(entry['tables'])]
+            for key in stale:
+                self._bytes -= len(self._entries.pop(key)['body'])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def size(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes}
+
+
+class SQLiteBackend:
+    # Cache file shared by every worker on the host
+    name = 'shared'
+    PRUNE_EVERY = 64
+
+    def __init__(self, stats, path, max_entries=4096):
+        self.stats = stats
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                tables TEXT NOT NULL,
+                entry BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_stored_at ON response_cache (stored_at)")
+        conn.commit()
+
+    def _conn(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.conn = connect(self.path, factory=sqlite3.Connection)
+            local.conn.isolation_level = None
+            local.pid = os.getpid()
+        return local.conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT entry FROM response_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, entry):
+        conn = self._conn()
+        payload = dict(entry, body=entry['body'].decode('utf-8'))
+        try:
+            conn.execute("INSERT OR REPLACE INTO response_cache (key, tables, entry, stored_at) VALUES (?, ?, ?, ?)",
+                         (key, ','.join(entry['tables']), json.dumps(payload), time.time()))
+        except sqlite3.OperationalError:
+            # Another worker holds the lock; skipping one store is harmless
+            return
+        self._sets += 1
+        if self._sets % self.PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn):
+        cursor = conn.execute("""
+            DELETE FROM response_cache WHERE key IN (
+                SELECT key FROM response_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+        if cursor.rowcount > 0:
+            self.stats.incr('evictions', cursor.rowcount)
+
+    def purge(self, tables):
+        # Entries keyed on old versions can no longer be hit; drop them early
+        conn = self._conn()
+        for table in tables:
+            conn.execute("DELETE FROM response_cache WHERE ',' || tables || ',' LIKE ?", (f'%,{table},%',))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM response_cache")
+
+    def size(self):
+        return {'entries': self._conn().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]}
+
+
+class ResponseCache:
+    def __init__(self, backend, stats):
+        self.backend = backend
+        self.stats = stats
+
+    def lookup(self, key):
+        entry = self.backend.get(key)
+        self.stats.incr('hits' if entry is not None else 'misses')
+        return entry
+
+    def store(self, key, entry):
+        self.backend.set(key, entry)
+        self.stats.incr('stores')
+
+    def purge(self, tables):
+        self.stats.incr('invalidations')
+        self.backend.purge(tables)
+
+    def info(self):
+        info = self.stats.snapshot()
+        info['backend'] = self.backend.name
+        info.update(self.backend.size())
+        return info
+
+
+def create_cache(app):
+    stats = CacheStats()
+    kind = app.config.get('RESPONSE_CACHE', 'memory')
+    if kind == 'memory':
+        backend = MemoryBackend(stats,
+                                max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 512),
+                                max_bytes=app.config.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    elif kind == 'shared':
+        backend = SQLiteBackend(stats, app.config['RESPONSE_CACHE_PATH'],
+                                max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 4096))
+    elif kind == 'none':
+        backend = NullBackend()
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE backend: {kind}")
+    return ResponseCache(backend, stats)
+
+
+def get_cache(app):
+    cache = app.extensions.get('response_cache')
+    if cache is None:
+        cache = app.extensions['response_cache'] = create_cache(app)
+    return cache
+
+
+def read_versions(conn, tables):
+    # Returns the tables' change counters and the time of the latest change
+    placeholders = ', '.join('?' for _ in tables)
+    rows = conn.execute(f"SELECT name, version, updated_at FROM data_versions WHERE name IN ({placeholders})",
+                        tables).fetchall()
+    versions = dict((name, version) for name, version, _ in rows)
+    last_modified = max((updated_at or 0 for _, _, updated_at in rows), default=0)
+    return tuple(versions.get(table, 0) for table in tables), last_modified
+
+
+def invalidate(cursor, *tables):
+    # Call inside the writing transaction, before commit
+    cursor.execute(f"""
+        UPDATE data_versions SET version = version + 1, updated_at = ?
+        WHERE name IN ({', '.join('?' for _ in tables)})
+    """, (time.time(),) + tables)
+    get_cache(current_app).purge(tables)
+
+
+def cache_key(versions, vary=None):
+    args = urlencode(sorted(request.args.items(multi=True)))
+    key = f"{request.path}?{args}#{'.'.join(map(str, versions))}"
+    return f"{key}@{vary()}" if vary else key
+
+
+def make_etag(key):
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def is_not_modified(etag, last_modified, exists=False):
+    # "If-None-Match: *" matches any current representation; only the caller
+    # knows one exists, so views that may still answer 404 pass exists=False
+    if request.if_none_match:
+        if request.if_none_match.star_tag:
+            return exists
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return int(last_modified) <= request.if_modified_since.timestamp()
+    return False
+
+
+def set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = int(last_modified)
+    # Let clients and proxies keep a copy but revalidate it on every use
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response
+
+
+def not_modified(etag, last_modified):
+    return set_validators(current_app.response_class(status=304), etag, last_modified)
+
+
+def cached(*tables, vary=None):
+    # Serves 304 Not Modified for matching If-None-Match / If-Modified-Since
+    # and otherwise answers from the response cache, running the view only
+    # on a miss. vary() is added to the key for views whose output also
+    # depends on something other than the tables, such as today's date
+    tables = tuple(sorted(tables))
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_cache(current_app)
+            versions, last_modified = read_versions(get_db_connection(current_app), tables)
+            key = cache_key(versions, vary)
+            etag = make_etag(key)
+            if is_not_modified(etag, last_modified):
+                return not_modified(etag, last_modified)
+            entry = cache.lookup(key)
+            if entry is not None:
+                if is_not_modified(etag, last_modified, exists=True):
+                    return not_modified(etag, last_modified)
+                response = current_app.response_class(entry['body'], status=entry['status'],
+                                                      headers=entry['headers'])
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            set_validators(response, etag, last_modified)
+            cache.store(key, {
+                'body': response.get_data(),
+                'status': response.status_code,
+                'headers': [(k, v) for k, v in response.headers.items()
+                            if k.lower() not in UNCACHED_HEADERS],
+                'tables': tables,
+            })
+            if is_not_modified(etag, last_modified, exists=True):
+                return not_modified(etag, last_modified)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,238 @@
+# Flask CLI commands (run with `flask --app wsgi <command>`)
+import os
+import shutil
+import time
+import click
+from flask import current_app
+from .cache import invalidate
+from .counters import counter_drift, refresh_counters
+from .images import Image, render_variants
+from .imports import BulkImportError, import_rows, read_rows
+from .models import get_db_connection
+from .migrations import schema_version, unindexed_queries
+from .scheduler import ScheduleError, plan_and_import
+from .search import create_search_index, fts5_available
+from .standings import populate_standings
+from .storage import (EXTENSION_ALIASES, HASH_RE, REFERENCE_COLUMNS, hash_file, referenced_uploads,
+                      unreferenced_files)
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_standings_command)
+    app.cli.add_command(check_indexes_command)
+    app.cli.add_command(prune_changes_command)
+    app.cli.add_command(gc_uploads_command)
+    app.cli.add_command(dedupe_uploads_command)
+    app.cli.add_command(import_data_command)
+    app.cli.add_command(schedule_season_command)
+    app.cli.add_command(rebuild_search_command)
+    app.cli.add_command(check_counters_command)
+
+
+@click.command('rebuild-standings')
+def rebuild_standings_command():
+    """Recompute the standings table from completed fixtures."""
+    conn = get_db_connection(current_app)
+    # Full rebuild in one transaction to repair drift
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    count = populate_standings(cursor)
+    # Cached league tables were built from the drifted rows
+    invalidate(cursor, 'fixtures')
+    conn.commit()
+    conn.close()
+    click.echo(f"Rebuilt standings for {count} teams")
+
+
+@click.command('check-indexes')
+@click.pass_context
+def check_indexes_command(ctx):
+    """Check that every hot query is served by an index."""
+    conn = get_db_connection(current_app)
+    click.echo(f"Schema version {schema_version(conn)}")
+    problems = unindexed_queries(conn)
+    conn.close()
+    for name, plan in problems.items():
+        click.echo(f"{name}: " + '; '.join(plan))
+    if problems:
+        ctx.exit(1)
+    click.echo("All hot queries use an index")
+
+
+@click.command('prune-changes')
+@click.option('--keep-days', default=30, show_default=True, help='Days of change log to keep.')
+def prune_changes_command(keep_days):
+    """Delete change-log entries older than --keep-days."""
+    conn = get_db_connection(current_app)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM change_log WHERE changed_at < ?", (time.time() - keep_days * 86400,))
+    conn.commit()
+    conn.close()
+    click.echo(f"Pruned {cursor.rowcount} change-log entries")
+
+
+@click.command('gc-uploads')
+@click.option('--dry-run', is_flag=True, help='List what would be deleted without deleting it.')
+@click.option('--grace-hours', default=24, show_default=True,
+              help='Keep files younger than this; they may belong to a form not yet saved.')
+@click.option('--include-legacy', is_flag=True, help='Also sweep pre-hash (timestamped) uploads.')
+def gc_uploads_command(dry_run, grace_hours, include_legacy):
+    """Delete uploads no team, player or news article references."""
+    conn = get_db_connection(current_app)
+    referenced = referenced_uploads(conn)
+    conn.close()
+    folder = current_app.config['UPLOAD_FOLDER']
+    garbage = unreferenced_files(folder, referenced, grace_hours * 3600, include_legacy)
+    for name, size in garbage:
+        click.echo(f"{'would delete' if dry_run else 'deleting'} {name} ({size} bytes)")
+        if not dry_run:
+            os.remove(os.path.join(folder, name))
+    total = sum(size for _, size in garbage)
+    click.echo(f"{len(garbage)} unreferenced files, {total} bytes{' (dry run)' if dry_run else ' freed'}")
+
+
+@click.command('dedupe-uploads')
+@click.option('--dry-run', is_flag=True, help='Report the renames without changing anything.')
+def dedupe_uploads_command(dry_run):
+    """Move referenced pre-hash uploads to content-addressed names."""
+    folder = current_app.config['UPLOAD_FOLDER']
+    conn = get_db_connection(current_app)
+    renames = {}
+    for name in sorted(referenced_uploads(conn)):
+        stem, ext = os.path.splitext(name)
+        path = os.path.join(folder, name)
+        if HASH_RE.match(stem) or not os.path.isfile(path):
+            continue
+        ext = ext[1:].lower()
+        renames[name] = f"{hash_file(path)}.{EXTENSION_ALIASES.get(ext, ext)}"
+    for old, new in renames.items():
+        click.echo(f"{old} -> {new}")
+    if dry_run or not renames:
+        conn.close()
+        click.echo(f"{len(renames)} uploads to move, {len(set(renames.values()))} distinct blobs")
+        return
+
+    for old, new in renames.items():
+        target = os.path.join(folder, new)
+        if os.path.exists(target):
+            continue
+        shutil.copyfile(os.path.join(folder, old), target)
+        if Image is not None:
+            render_variants(target)
+    # Rewrite the references in one transaction; the old files stay until
+    # gc-uploads --include-legacy removes them
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    changed = set()
+    for table, column in REFERENCE_COLUMNS:
+        for row_id, url in cursor.execute(
+                f"SELECT id, {column} FROM {table} WHERE {column} LIKE '%/static/uploads/%'").fetchall():
+            base, name = url.rsplit('/', 1)
+            if name in renames:
+                cursor.execute(f"UPDATE {table} SET {column} = ? WHERE id = ?", (f"{base}/{renames[name]}", row_id))
+                changed.add(table)
+    if changed:
+        invalidate(cursor, *sorted(changed))
+    conn.commit()
+    conn.close()
+    click.echo(f"Moved {len(renames)} uploads to {len(set(renames.values()))} blobs")
+
+
+@click.command('import-data')
+@click.argument('dataset', type=click.Choice(['teams', 'players', 'fixtures']))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--skip-invalid', is_flag=True, help='Import the valid rows even if some rows are invalid.')
+@click.option('--dry-run', is_flag=True, help='Validate only.')
+@click.pass_context
+def import_data_command(ctx, dataset, path, skip_invalid, dry_run):
+    """Bulk import teams, players or fixtures from a CSV or JSON file."""
+    with open(path, 'rb') as source:
+        payload = source.read()
+    conn = get_db_connection(current_app)
+    start = time.perf_counter()
+    try:
+        result = import_rows(conn, dataset, read_rows(payload, path.rsplit('.', 1)[-1].lower()),
+                             skip_invalid, dry_run)
+    except BulkImportError as e:
+        conn.close()
+        raise click.ClickException(str(e))
+    conn.close()
+    for error in result['errors']:
+        click.echo(f"row {error['row']}: " + '; '.join(error['errors']), err=True)
+    click.echo(f"Imported {result['imported']} of {result['received']} {dataset} rows "
+               f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    if result['errors'] and not skip_invalid:
+        ctx.exit(1)
+
+
+@click.command('schedule-season')
+@click.option('--start', required=True, help='First match day (YYYY-MM-DD).')
+@click.option('--end', help='Last allowed match day (YYYY-MM-DD).')
+@click.option('--rest-days', default=3, show_default=True, help='Minimum full days between two matches of a team.')
+@click.option('--blackout', multiple=True, help='Day with no matches (YYYY-MM-DD); repeatable.')
+@click.option('--weekday', multiple=True, help='Allowed match weekday (mon..sun); repeatable. Default: any.')
+@click.option('--kickoff', default='15:00', show_default=True)
+@click.option('--team', 'team_ids', multiple=True, type=int, help='Team id to include; repeatable. Default: all.')
+@click.option('--dry-run', is_flag=True, help='Print the schedule without saving it.')
+def schedule_season_command(start, end, rest_days, blackout, weekday, kickoff, team_ids, dry_run):
+    """Generate a double round-robin and insert it as scheduled fixtures."""
+    conn = get_db_connection(current_app)
+    started = time.perf_counter()
+    try:
+        fixtures, result = plan_and_import(conn, dry_run, start=start, end=end, rest_days=rest_days,
+                                           blackout_dates=blackout, weekdays=weekday, kickoff=kickoff,
+                                           team_ids=list(team_ids))
+    except ScheduleError as e:
+        conn.close()
+        raise click.ClickException(str(e))
+    conn.close()
+    elapsed = time.perf_counter() - started
+    if result is None:
+        for fixture in fixtures:
+            click.echo(f"R{fixture['round']:<3} {fixture['date']} {fixture['home_team_id']:>4} v "
+                       f"{fixture['away_team_id']:<4} {fixture['venue']}")
+        click.echo(f"{len(fixtures)} fixtures planned in {elapsed * 1000:.0f} ms (dry run)")
+        return
+    if result['errors']:
+        raise click.ClickException(f"Generated schedule failed validation: {result['errors'][:3]}")
+    click.echo(f"Scheduled {result['imported']} fixtures from {fixtures[0]['date']} to {fixtures[-1]['date']} "
+               f"(in {elapsed * 1000:.0f} ms)")
+
+
+@click.command('rebuild-search')
+def rebuild_search_command():
+    """Create the full-text search index if missing and rebuild it."""
+    conn = get_db_connection(current_app)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    if not fts5_available(cursor):
+        conn.rollback()
+        conn.close()
+        raise click.ClickException("This SQLite build has no FTS5; /api/search uses LIKE matching")
+    create_search_index(cursor)
+    invalidate(cursor, 'news', 'players', 'teams')
+    conn.commit()
+    conn.close()
+    click.echo("Search index rebuilt")
+
+
+@click.command('check-counters')
+@click.option('--fix', is_flag=True, help='Rewrite drifted counters from the base tables.')
+@click.pass_context
+def check_counters_command(ctx, fix):
+    """Recount the dashboard counters and report any drift."""
+    conn = get_db_connection(current_app)
+    drift = counter_drift(conn)
+    for name, stored, actual in drift:
+        click.echo(f"{name}: stored {stored}, actual {actual}")
+    if drift and fix:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        refresh_counters(cursor)
+        conn.commit()
+        click.echo(f"Fixed {len(drift)} counters")
+    conn.close()
+    if not drift:
+        click.echo("All counters match the base tables")
+    elif not fix:
+        ctx.exit(1)
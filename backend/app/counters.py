@@ -0,0 +1,129 @@
+# Dashboard counters
+# Row counts for the admin dashboard live in one league_counters row and a
+# team_counters row per team, kept current by triggers on the base tables,
+# so /api/stats reads a single row instead of scanning fixtures. Statuses are
+# compared with IS so a NULL status or published flag counts as 0. News
+# articles have no team column, so news is only counted league-wide.
+
+# counter: query that recomputes it from the base tables
+LEAGUE_COUNTERS = {
+    'teams': "SELECT COUNT(*) FROM teams",
+    'players': "SELECT COUNT(*) FROM players",
+    'fixtures': "SELECT COUNT(*) FROM fixtures",
+    'completed': "SELECT COUNT(*) FROM fixtures WHERE status = 'completed'",
+    'scheduled': "SELECT COUNT(*) FROM fixtures WHERE status = 'scheduled'",
+    'news': "SELECT COUNT(*) FROM news",
+    'published_news': "SELECT COUNT(*) FROM news WHERE published = 1",
+}
+SQUAD_SIZES = """
+    SELECT t.id, COUNT(p.id)
+    FROM teams t
+    LEFT JOIN players p ON p.team_id = t.id
+    GROUP BY t.id
+"""
+
+
+def league_update(changes):
+    return f"UPDATE league_counters SET {', '.join(f'{name} = {name} + ({delta})' for name, delta in changes)} WHERE id = 1;"
+
+
+def status_changes(ref, sign):
+    return [('completed', f"{sign}({ref}.status IS 'completed')"),
+            ('scheduled', f"{sign}({ref}.status IS 'scheduled')")]
+
+
+def create_counters(cursor):
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS league_counters (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            {', '.join(f'{name} INTEGER NOT NULL DEFAULT 0' for name in LEAGUE_COUNTERS)}
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO league_counters (id) VALUES (1)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS team_counters (
+            team_id INTEGER PRIMARY KEY,
+            squad_size INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    triggers = {
+        'teams_insert': ('AFTER INSERT ON teams', [
+            league_update([('teams', '1')]),
+            "INSERT OR REPLACE INTO team_counters (team_id, squad_size) "
+            "VALUES (new.id, (SELECT COUNT(*) FROM players WHERE team_id = new.id));",
+        ]),
+        'teams_delete': ('AFTER DELETE ON teams', [
+            league_update([('teams', '-1')]),
+            "DELETE FROM team_counters WHERE team_id = old.id;",
+        ]),
+        'players_insert': ('AFTER INSERT ON players', [
+            league_update([('players', '1')]),
+            "UPDATE team_counters SET squad_size = squad_size + 1 WHERE team_id = new.team_id;",
+        ]),
+        'players_delete': ('AFTER DELETE ON players', [
+            league_update([('players', '-1')]),
+            "UPDATE team_counters SET squad_size = squad_size - 1 WHERE team_id = old.team_id;",
+        ]),
+        'players_team': ('AFTER UPDATE OF team_id ON players WHEN old.team_id IS NOT new.team_id', [
+            "UPDATE team_counters SET squad_size = squad_size - 1 WHERE team_id = old.team_id;",
+            "UPDATE team_counters SET squad_size = squad_size + 1 WHERE team_id = new.team_id;",
+        ]),
+        'fixtures_insert': ('AFTER INSERT ON fixtures', [
+            league_update([('fixtures', '1')] + status_changes('new', '')),
+        ]),
+        'fixtures_delete': ('AFTER DELETE ON fixtures', [
+            league_update([('fixtures', '-1')] + status_changes('old', '-')),
+        ]),
+        'fixtures_status': ('AFTER UPDATE OF status ON fixtures WHEN old.status IS NOT new.status', [
+            league_update([(name, f'{new} + {old}') for (name, new), (_, old)
+                           in zip(status_changes('new', ''), status_changes('old', '-'))]),
+        ]),
+        'news_insert': ('AFTER INSERT ON news', [
+            league_update([('news', '1'), ('published_news', '(new.published IS 1)')]),
+        ]),
+        'news_delete': ('AFTER DELETE ON news', [
+            league_update([('news', '-1'), ('published_news', '-(old.published IS 1)')]),
+        ]),
+        'news_published': ('AFTER UPDATE OF published ON news', [
+            league_update([('published_news', '(new.published IS 1) - (old.published IS 1)')]),
+        ]),
+    }
+    for name, (event, statements) in triggers.items():
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_counters_{name} {event} BEGIN
+                {' '.join(statements)}
+            END
+        ''')
+    refresh_counters(cursor)
+
+
+def compute_counters(conn):
+    # (league counters, {team_id: squad size}) straight from the base tables
+    league = dict((name, conn.execute(query).fetchone()[0]) for name, query in LEAGUE_COUNTERS.items())
+    squads = dict((team_id, size) for team_id, size in conn.execute(SQUAD_SIZES))
+    return league, squads
+
+
+def read_counters(conn):
+    row = conn.execute(f"SELECT {', '.join(LEAGUE_COUNTERS)} FROM league_counters WHERE id = 1").fetchone()
+    return dict(zip(LEAGUE_COUNTERS, row)) if row is not None else dict.fromkeys(LEAGUE_COUNTERS, 0)
+
+
+def refresh_counters(cursor):
+    # Overwrite every counter with a fresh count
+    league, squads = compute_counters(cursor.connection)
+    cursor.execute(f"UPDATE league_counters SET {', '.join(f'{name} = ?' for name in league)} WHERE id = 1",
+                   list(league.values()))
+    cursor.execute("DELETE FROM team_counters")
+    cursor.executemany("INSERT INTO team_counters (team_id, squad_size) VALUES (?, ?)", squads.items())
+
+
+def counter_drift(conn):
+    # [(counter, stored, actual)] for every counter that disagrees with a recount
+    league, squads = compute_counters(conn)
+    drift = [(name, stored, league[name]) for name, stored in read_counters(conn).items() if stored != league[name]]
+    stored_squads = dict(conn.execute("SELECT team_id, squad_size FROM team_counters"))
+    for team_id in sorted(set(squads) | set(stored_squads)):
+        if stored_squads.get(team_id) != squads.get(team_id):
+            drift.append((f'squad_size[{team_id}]', stored_squads.get(team_id), squads.get(team_id)))
+    return drift
@@ -0,0 +1,138 @@
+# Per-process SQLite connection pool
+# Connections are opened and tuned once, then handed out for the length of an
+# app context and returned to the pool at teardown.
+import os
+import sqlite3
+import threading
+import time
+
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -16000),      # 16 MB page cache per connection
+    ('mmap_size', 64 * 1024 * 1024),
+    ('busy_timeout', 5000),      # ms to wait on a locked database
+    ('temp_store', 'MEMORY'),
+)
+
+
+class PoolExhausted(sqlite3.OperationalError):
+    pass
+
+
+class PooledConnection(sqlite3.Connection):
+    # Route handlers call close() when they are done with a connection. For a
+    # pooled connection that only ends any open transaction; the connection
+    # itself stays open until the pool disposes of it.
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def dispose(self):
+        sqlite3.Connection.close(self)
+
+
+def connect(database, factory=PooledConnection):
+    conn = sqlite3.connect(database, factory=factory, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+class ConnectionPool:
+    def __init__(self, database, max_size=8, max_idle=4, timeout=10.0):
+        self.database = database
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle = []
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = dict.fromkeys(
+            ('created', 'reused', 'released', 'discarded', 'waits', 'timeouts'), 0)
+        self._wait_time = 0.0
+
+    def _check_fork(self):
+        # A forked worker must not touch its parent's connections; drop them
+        # without closing so the parent's file handles are left alone.
+        if self._pid != os.getpid():
+            self._idle = []
+            self._in_use = 0
+            self._pid = os.getpid()
+
+    def acquire(self):
+        with self._cond:
+            self._check_fork()
+            if not self._idle and self._in_use >= self.max_size:
+                self._stats['waits'] += 1
+                start = time.perf_counter()
+                ready = self._cond.wait_for(
+                    lambda: self._idle or self._in_use < self.max_size, self.timeout)
+                self._wait_time += time.perf_counter() - start
+                if not ready:
+                    self._stats['timeouts'] += 1
+                    raise PoolExhausted('Timed out waiting for a database connection')
+            self._in_use += 1
+            if self._idle:
+                self._stats['reused'] += 1
+                return self._idle.pop()
+        try:
+            conn = connect(self.database)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+        return conn
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._in_use -= 1
+            if len(self._idle) < self.max_idle:
+                # LIFO so the warmest page cache is reused first
+                self._idle.append(conn)
+                self._stats['released'] += 1
+                conn = None
+            else:
+                self._stats['discarded'] += 1
+            self._cond.notify()
+        if conn is not None:
+            conn.dispose()
+
+    def _discard(self, conn):
+        with self._cond:
+            self._in_use -= 1
+            self._stats['discarded'] += 1
+            self._cond.notify()
+        try:
+            conn.dispose()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.dispose()
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+                'wait_time_ms': round(self._wait_time * 1000, 3),
+                'pid': self._pid,
+            })
+        return stats
@@ -0,0 +1,110 @@
+# Image renditions for uploads
+# Every uploaded image gets thumbnail, medium and normalized original
+# renditions in WebP and JPEG, written next to the upload as
+# <stem>_<rendition>.<ext>. Rendering runs in a process pool so request
+# threads (and gevent workers) never do the CPU work.
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow not installed: uploads are served as is
+    Image = None
+
+# Longest edge in pixels for each rendition
+RENDITIONS = {'thumb': 160, 'medium': 640, 'original': 2048}
+FORMATS = {'webp': ('WEBP', {'quality': 80, 'method': 4}),
+           'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True})}
+# Upload formats that get renditions; anything else (legacy .jfif and
+# the like) is only ever served as uploaded
+SOURCE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp'})
+VARIANT_SUFFIXES = tuple(f'_{rendition}' for rendition in RENDITIONS)
+VARIANT_RE = re.compile(r'^(?P<stem>.+)_(?P<rendition>thumb|medium|original)\.(?P<ext>webp|jpg)$')
+
+_executor = None
+_executor_pid = None
+
+
+def variant_name(filename, rendition, ext):
+    return f"{os.path.splitext(filename)[0]}_{rendition}.{ext}"
+
+
+def variant_names(filename):
+    return dict((rendition, dict((ext, variant_name(filename, rendition, ext)) for ext in FORMATS))
+                for rendition in RENDITIONS)
+
+
+def parse_variant(filename):
+    match = VARIANT_RE.match(filename)
+    return match.groupdict() if match else None
+
+
+def thumbnail_url(url, rendition='thumb', ext='webp'):
+    # Small rendition of an uploaded image URL; other URLs are returned as is.
+    # Called once per row by the list endpoints, so it avoids the regex.
+    if not url or '/static/uploads/' not in url:
+        return url
+    base, _, filename = url.rpartition('/')
+    stem, suffix = os.path.splitext(filename)
+    ext = suffix[1:].lower()
+    if ext not in SOURCE_EXTENSIONS or (ext in FORMATS and stem.endswith(VARIANT_SUFFIXES)):
+        return url
+    return f"{base}/{stem}_{rendition}.{ext}"
+
+
+def render_variants(path):
+    # Runs in a pool process; returns the names of the files written
+    with Image.open(path) as source:
+        source.seek(0)
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    if has_alpha:
+        flat = Image.new('RGB', image.size, (255, 255, 255))
+        flat.paste(image, mask=image.getchannel('A'))
+    else:
+        flat = image
+
+    directory, filename = os.path.split(path)
+    written = []
+    for rendition, size in RENDITIONS.items():
+        for ext, (fmt, options) in FORMATS.items():
+            target = image if fmt == 'WEBP' else flat
+            if max(target.size) > size:
+                target = target.copy()
+                target.thumbnail((size, size), Image.LANCZOS)
+            name = variant_name(filename, rendition, ext)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix='.tmp')
+            with os.fdopen(fd, 'wb') as out:
+                target.save(out, fmt, **options)
+            os.replace(tmp, os.path.join(directory, name))
+            written.append(name)
+    return written
+
+
+def get_executor(max_workers=2):
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        # spawn, not fork: the parent may be a threaded or gevent worker
+        _executor = ProcessPoolExecutor(max_workers=max_workers,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def submit_renditions(app, path):
+    if Image is None:
+        return None
+    future = get_executor(app.config.get('IMAGE_WORKERS', 2)).submit(render_variants, path)
+    # The callback runs on the executor's thread, outside the app context
+    logger = app.logger
+
+    def report(done):
+        if done.exception() is not None:
+            logger.warning("Could not render variants for %s: %s", path, done.exception())
+    future.add_done_callback(report)
+    return future
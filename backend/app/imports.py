@@ -0,0 +1,218 @@
+# Bulk import of teams, players and fixtures
+# Rows arrive as CSV or JSON, are validated as one batch against a single
+# team lookup map and are written with executemany in one transaction,
+# together with the standings deltas and cache invalidation.
+import csv
+import io
+import json
+
+from .cache import invalidate
+from .standings import add_fixture_delta, apply_deltas
+from .utils import parse_date
+
+FIXTURE_STATUSES = ('scheduled', 'live', 'completed', 'cancelled')
+MAX_ROWS = 20000
+
+
+class BulkImportError(Exception):
+    pass
+
+
+def text(value):
+    value = value.strip() if isinstance(value, str) else value
+    return None if value in (None, '') else str(value)
+
+
+def integer(value):
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+        raise ValueError('must be a whole number')
+    return int(value)
+
+
+def number(value):
+    if value in (None, ''):
+        return None
+    return float(value)
+
+
+# dataset: (column: converter) in insert order, required columns
+SCHEMAS = {
+    'teams': ({'name': text, 'university': text, 'city': text, 'founded': text, 'coach': text,
+               'stadium': text, 'logo_url': text}, ('name',)),
+    'players': ({'name': text, 'team_id': integer, 'position': text, 'jersey_number': integer,
+                 'age': integer, 'nationality': text, 'height': number, 'weight': number,
+                 'photo_url': text}, ('name', 'team_id')),
+    'fixtures': ({'home_team_id': integer, 'away_team_id': integer, 'date': text, 'time': text,
+                  'venue': text, 'status': text, 'home_score': integer, 'away_score': integer},
+                 ('home_team_id', 'away_team_id', 'date')),
+}
+# Columns that may be given as a team name instead of an id
+TEAM_REFERENCES = {'team': 'team_id', 'home_team': 'home_team_id', 'away_team': 'away_team_id'}
+
+
+def read_rows(payload, fmt):
+    # payload is text (or bytes); JSON may be a list or {"rows": [...]}
+    if isinstance(payload, bytes):
+        try:
+            payload = payload.decode('utf-8-sig')
+        except UnicodeDecodeError as e:
+            raise BulkImportError(f'File must be UTF-8 text; invalid byte at offset {e.start}')
+    if fmt == 'csv':
+        rows = []
+        try:
+            for row in csv.DictReader(io.StringIO(payload)):
+                rows.append(row)
+        except csv.Error as e:
+            # Numbered like validation errors: data rows from 1
+            raise BulkImportError(f'Invalid CSV at row {len(rows) + 1}: {e}')
+    elif fmt == 'json':
+        try:
+            rows = json.loads(payload)
+        except ValueError as e:
+            raise BulkImportError(f'Invalid JSON: {e}')
+        if isinstance(rows, dict):
+            rows = rows.get('rows')
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise BulkImportError('JSON must be a list of objects or {"rows": [...]}')
+    else:
+        raise BulkImportError('format must be csv or json')
+    if len(rows) > MAX_ROWS:
+        raise BulkImportError(f'At most {MAX_ROWS} rows per import')
+    return rows
+
+
+def team_lookup(cursor):
+    # One query: team ids by lower-cased name, plus the set of valid ids
+    by_name = {}
+    for team_id, name in cursor.execute("SELECT id, name FROM teams"):
+        by_name.setdefault((name or '').strip().lower(), team_id)
+    return by_name, set(by_name.values())
+
+
+def duplicate_team_error(name):
+    return f"name: team '{name}' already exists"
+
+
+def team_name_taken(cursor, name, exclude_id=None):
+    # Names compare trimmed and case-insensitively, as in team_lookup
+    key = (name or '').strip().lower()
+    return bool(key) and any(team_id != exclude_id and (other or '').strip().lower() == key
+               for team_id, other in cursor.execute("SELECT id, name FROM teams"))
+
+
+def validate_row(dataset, row, teams):
+    columns, required = SCHEMAS[dataset]
+    by_name, team_ids = teams
+    errors = []
+    failed = set()
+    row = dict(row)
+    for reference, column in TEAM_REFERENCES.items():
+        if column in columns and row.get(column) in (None, '') and text(row.get(reference)):
+            team_id = by_name.get(text(row[reference]).lower())
+            if team_id is None:
+                errors.append(f"{reference}: unknown team '{text(row[reference])}'")
+                failed.add(column)
+            row[column] = team_id
+    values = {}
+    for column, convert in columns.items():
+        try:
+            values[column] = convert(row.get(column))
+        except (TypeError, ValueError):
+            errors.append(f'{column}: invalid value {row.get(column)!r}')
+            values[column] = None
+            failed.add(column)
+    for column in required:
+        if values[column] is None and column not in failed:
+            errors.append(f'{column}: required')
+
+    for column in ('team_id', 'home_team_id', 'away_team_id'):
+        if values.get(column) is not None and values[column] not in team_ids:
+            errors.append(f'{column}: team {values[column]} does not exist')
+    if dataset == 'fixtures':
+        values['time'] = values['time'] or '15:00'
+        values['venue'] = values['venue'] or 'TBD'
+        values['status'] = values['status'] or 'scheduled'
+        if values['home_team_id'] is not None and values['home_team_id'] == values['away_team_id']:
+            errors.append('Home and away teams cannot be the same')
+        if values['date'] is not None:
+            values['date'] = parse_date(values['date'])
+            if values['date'] is None:
+                errors.append('date: must be a YYYY-MM-DD date')
+        if values['status'] not in FIXTURE_STATUSES:
+            errors.append(f"status: must be one of {', '.join(FIXTURE_STATUSES)}")
+        elif values['status'] == 'completed' and None in (values['home_score'], values['away_score']):
+            errors.append('Completed fixtures need home_score and away_score')
+    return values, errors
+
+
+def validate_rows(cursor, dataset, rows):
+    # Returns (valid rows as tuples, [{'row': n, 'errors': [...]}]); rows are
+    # numbered from 1 in input order
+    if dataset not in SCHEMAS:
+        raise BulkImportError(f"Unknown dataset; choose one of {', '.join(SCHEMAS)}")
+    columns = SCHEMAS[dataset][0]
+    teams = team_lookup(cursor)
+    seen_names = set(teams[0])
+    valid, errors = [], []
+    for index, row in enumerate(rows, 1):
+        values, row_errors = validate_row(dataset, row, teams)
+        if dataset == 'teams' and values['name'] is not None:
+            # Teams are referenced by name in later imports, so names must be unique
+            key = values['name'].lower()
+            if key in seen_names:
+                row_errors.append(duplicate_team_error(values['name']))
+            seen_names.add(key)
+        if row_errors:
+            errors.append({'row': index, 'errors': row_errors})
+        else:
+            valid.append(tuple(values[column] for column in columns))
+    return valid, errors
+
+
+def insert_rows(cursor, dataset, rows, skip_invalid=False, dry_run=False):
+    # Validates and writes inside the caller's transaction; nothing is
+    # written (result['imported'] is 0) when the batch is rejected
+    valid, errors = validate_rows(cursor, dataset, rows)
+    result = {'dataset': dataset, 'received': len(rows), 'valid': len(valid), 'imported': 0,
+              'errors': errors}
+    if dry_run or not valid or (errors and not skip_invalid):
+        return result
+    columns = list(SCHEMAS[dataset][0])
+    cursor.executemany(f"""
+        INSERT INTO {dataset} ({', '.join(columns)})
+        VALUES ({', '.join('?' for _ in columns)})
+    """, valid)
+    if dataset == 'teams':
+        cursor.execute("""
+            INSERT OR IGNORE INTO standings (team_id)
+            SELECT id FROM teams WHERE id NOT IN (SELECT team_id FROM standings)
+        """)
+    elif dataset == 'fixtures':
+        positions = [columns.index(column) for column in
+                     ('home_team_id', 'away_team_id', 'home_score', 'away_score', 'status')]
+        deltas = {}
+        for values in valid:
+            add_fixture_delta(deltas, tuple(values[position] for position in positions))
+        apply_deltas(cursor, deltas)
+    invalidate(cursor, dataset)
+    result['imported'] = len(valid)
+    return result
+
+
+def import_rows(conn, dataset, rows, skip_invalid=False, dry_run=False):
+    # All-or-nothing unless skip_invalid is set, in which case valid rows are
+    # imported and the invalid ones only reported
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        result = insert_rows(cursor, dataset, rows, skip_invalid, dry_run)
+    except Exception:
+        conn.rollback()
+        raise
+    if result['imported']:
+        conn.commit()
+    else:
+        conn.rollback()
+    return result
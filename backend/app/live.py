@@ -0,0 +1,229 @@
+# Live match updates over Server-Sent Events
+# Each worker runs one poller thread that tails the change log for fixture
+# changes and fans them out to that worker's subscribers. Because every
+# worker reads the same SQLite change log, a result entered through any
+# worker reaches subscribers on all of them.
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .db_pool import connect
+from .serialization import dumps_compact, row_mapper
+from .standings import STAT_COLUMNS
+
+logger = logging.getLogger(__name__)
+MAX_RESTART_DELAY = 30.0
+
+FIXTURE_QUERY = """
+    SELECT f.id, t1.name, t2.name, f.home_team_id, f.away_team_id, f.date, f.time, f.venue,
+           f.home_score, f.away_score, f.status
+    FROM fixtures f
+    JOIN teams t1 ON f.home_team_id = t1.id
+    JOIN teams t2 ON f.away_team_id = t2.id
+    WHERE f.id = ?
+"""
+fixture_row = row_mapper(('id', 'home_team', 'away_team', 'home_team_id', 'away_team_id', 'date', 'time',
+                          'venue', 'home_score', 'away_score', 'status'))
+
+
+def format_event(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {dumps_compact(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class SQLiteChangeSource:
+    # Notifier backed by the change_log table; works across processes
+    def __init__(self, database):
+        self.database = database
+
+    def connect(self):
+        return connect(self.database, factory=sqlite3.Connection)
+
+    def latest_version(self, conn):
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM change_log").fetchone()[0]
+
+    def fixture_changes(self, conn, since, limit):
+        return conn.execute("""
+            SELECT version, row_id, op
+            FROM change_log
+            WHERE version > ? AND table_name = 'fixtures'
+            ORDER BY version
+            LIMIT ?
+        """, (since, limit)).fetchall()
+
+    def fixture(self, conn, fixture_id):
+        row = conn.execute(FIXTURE_QUERY, (fixture_id,)).fetchone()
+        if row is None:
+            return {'id': fixture_id, 'deleted': True}
+        return fixture_row(row)
+
+    def standings(self, conn):
+        rows = conn.execute(f"SELECT team_id, {', '.join(STAT_COLUMNS)} FROM standings").fetchall()
+        return dict((row[0], dict(zip(('team_id',) + STAT_COLUMNS, row))) for row in rows)
+
+
+class Subscriber:
+    def __init__(self, max_queue):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def offer(self, message, version=None):
+        # Never block the broker on a slow client; mark it and let the stream
+        # tell the client to resync instead
+        try:
+            self.queue.put_nowait((version, message))
+        except queue.Full:
+            self.overflowed = True
+
+
+class LiveBroker:
+    def __init__(self, source, poll_interval=0.5, batch_size=500, max_queue=256, max_subscribers=5000):
+        self.source = source
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.stats = dict.fromkeys(('events', 'dropped_subscribers', 'rejected'), 0)
+
+    def subscribe(self):
+        self._ensure_started()
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.stats['rejected'] += 1
+                return None
+            subscriber = Subscriber(self.max_queue)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if subscriber.overflowed:
+                self.stats['dropped_subscribers'] += 1
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, message, version=None):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(message, version)
+        self.stats['events'] += 1
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='live-broker', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        # Any failure (including a lost database) is logged and the poller
+        # reconnects after a growing delay; the thread itself never exits
+        conn = None
+        last_version = standings = None
+        failures = 0
+        while True:
+            try:
+                if conn is None:
+                    conn = self.source.connect()
+                    if last_version is None:
+                        last_version = self.source.latest_version(conn)
+                    if standings is None:
+                        standings = self.source.standings(conn)
+                time.sleep(self.poll_interval)
+                last_version, standings = self._poll(conn, last_version, standings)
+                failures = 0
+            except Exception:
+                failures += 1
+                delay = min(self.poll_interval * 2 ** failures, MAX_RESTART_DELAY)
+                logger.exception('Live broker poll failed; reconnecting in %.1f s', delay)
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except sqlite3.Error:
+                        pass
+                    conn = None
+                time.sleep(delay)
+
+    def _poll(self, conn, last_version, standings):
+        if not self.subscriber_count():
+            # Nobody is listening; skip ahead instead of replaying later
+            return self.source.latest_version(conn), standings
+        changes = self.source.fixture_changes(conn, last_version, self.batch_size)
+        if not changes:
+            return last_version, standings
+        for version, fixture_id, _ in changes:
+            self.publish(format_event('fixture', self.source.fixture(conn, fixture_id), version), version)
+        last_version = changes[-1][0]
+        current = self.source.standings(conn)
+        delta = [row for team_id, row in current.items() if standings.get(team_id) != row]
+        removed = [team_id for team_id in standings if team_id not in current]
+        if delta or removed:
+            self.publish(format_event('standings', {'rows': delta, 'removed': removed}, last_version),
+                         last_version)
+        return last_version, current
+
+    def replay(self, conn, since):
+        # (events a reconnecting client missed, the version they cover up
+        # to); the events are None if there are too many to replay
+        changes = self.source.fixture_changes(conn, since, self.batch_size + 1)
+        if len(changes) > self.batch_size:
+            return None, since
+        # Only the latest state of each fixture matters to the client
+        latest = dict((fixture_id, version) for version, fixture_id, _ in changes)
+        messages = [format_event('fixture', self.source.fixture(conn, fixture_id), version)
+                    for fixture_id, version in sorted(latest.items(), key=lambda item: item[1])]
+        if changes:
+            rows = list(self.source.standings(conn).values())
+            messages.append(format_event('standings', {'rows': rows, 'removed': []}, changes[-1][0]))
+        return messages, changes[-1][0] if changes else since
+
+
+def get_broker(app):
+    broker = app.extensions.get('live_broker')
+    if broker is None:
+        broker = app.extensions['live_broker'] = LiveBroker(
+            SQLiteChangeSource(app.config['DATABASE']),
+            poll_interval=app.config.get('LIVE_POLL_INTERVAL', 0.5),
+            max_queue=app.config.get('LIVE_MAX_QUEUE', 256),
+            max_subscribers=app.config.get('LIVE_MAX_SUBSCRIBERS', 5000)
+        )
+    return broker
+
+
+def event_stream(broker, subscriber, backlog, heartbeat, replayed_through=None):
+    # The subscriber is registered before the backlog is read, so live events
+    # the backlog already covers are skipped
+    try:
+        yield 'retry: 3000\n\n'
+        for message in backlog:
+            yield message
+        while not subscriber.overflowed:
+            try:
+                version, message = subscriber.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            if version is not None and replayed_through is not None and version <= replayed_through:
+                continue
+            yield message
+        # The client fell behind; it reconnects with Last-Event-ID and the
+        # missed events are replayed from the change log
+        yield format_event('resync', {'reason': 'client too slow'})
+    finally:
+        broker.unsubscribe(subscriber)
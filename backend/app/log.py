@@ -0,0 +1,244 @@
+# Structured logging
+# Records are tagged with the current request (id, method, route) on the
+# calling thread, then handed to a bounded queue; a listener thread formats
+# them as one JSON object per line (or plain text with LOG_FORMAT=text) and
+# writes them out, so request threads never block on stdout. A full queue
+# drops records instead of stalling. Passwords, tokens, cookies and session
+# ids are redacted from messages and extra fields before they are written.
+# LOG_ROUTES sets a minimum level and a sample rate per route; sampling is
+# decided once per request and never drops warnings or errors.
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+from .serialization import dumps_compact
+
+REDACTED = '[REDACTED]'
+SENSITIVE_KEY_RE = re.compile(r'pass(word|wd)?|secret|token|authorization|cookie|session|api[_-]?key', re.I)
+SENSITIVE_VALUE_RES = (
+    # key=value / "key": "value" pairs in free text
+    re.compile(r'''(?i)(["']?\b(?:password|passwd|secret|[a-z_]*token|api[_-]?key|authorization|session|cookie)\b["']?\s*[:=]\s*)("[^"]*"|'[^']*'|(?:(?:bearer|basic)\s+)?[^\s,;&}]+)'''),
+    re.compile(r'(?i)\b(bearer\s+)[\w\-.~+/]+=*'),
+)
+# Attributes every LogRecord has; anything else came in through `extra`
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request'}
+
+
+def to_level(level):
+    return level if isinstance(level, int) else logging.getLevelName(str(level).upper())
+
+
+def redact_text(text):
+    for pattern in SENSITIVE_VALUE_RES:
+        text = pattern.sub(lambda match: match.group(1) + REDACTED, text)
+    return text
+
+
+def redact(value, key=None):
+    if key is not None and SENSITIVE_KEY_RE.search(str(key)):
+        return REDACTED
+    if isinstance(value, dict):
+        return dict((k, redact(v, k)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return redact_text(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return redact_text(str(value))
+
+
+def request_fields():
+    fields = {
+        'request_id': g.get('request_id'),
+        'method': request.method,
+        'path': request.path,
+        'remote_addr': request.remote_addr,
+    }
+    if request.url_rule is not None:
+        fields['route'] = request.url_rule.rule
+    return fields
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': redact_text(record.getMessage()),
+        }
+        if getattr(record, 'request', None):
+            entry.update(record.request)
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = redact(value, key)
+        if record.exc_text:
+            entry['exception'] = redact_text(record.exc_text)
+        return dumps_compact(entry)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('[%(asctime)s] %(levelname)s in %(name)s: %(message)s')
+
+    def format(self, record):
+        record = copy.copy(record)
+        record.msg = redact_text(record.getMessage())
+        record.args = None
+        if record.exc_text:
+            record.exc_text = redact_text(record.exc_text)
+        extras = dict((key, redact(value, key)) for key, value in vars(record).items()
+                      if key not in RECORD_ATTRIBUTES)
+        text = super().format(record)
+        if extras:
+            text += ' ' + ' '.join(f'{key}={value}' for key, value in extras.items())
+        return text
+
+
+class AsyncHandler(QueueHandler):
+    # prepare() runs on the thread that logged: it merges args, renders the
+    # traceback and captures request fields while the request is still there
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.request = request_fields() if has_request_context() else None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RouteFilter(logging.Filter):
+    # LOG_ROUTES: {route or endpoint: {'level': 'WARNING', 'sample': 0.1}}
+    def __init__(self, routes):
+        super().__init__()
+        self.routes = dict((route, (to_level(settings.get('level', 'NOTSET')),
+                                    float(settings.get('sample', 1.0))))
+                           for route, settings in (routes or {}).items())
+
+    def settings(self):
+        if request.url_rule is None:
+            return None
+        return self.routes.get(request.url_rule.rule) or self.routes.get(request.endpoint)
+
+    def filter(self, record):
+        if not self.routes or not has_request_context():
+            return True
+        settings = self.settings()
+        if settings is None:
+            return True
+        level, sample = settings
+        if record.levelno < level:
+            return False
+        if record.levelno >= logging.WARNING:
+            return True
+        sampled = g.get('_log_sampled')
+        if sampled is None:
+            sampled = g._log_sampled = random.random() < sample
+        return sampled
+
+
+class LogPipeline:
+    # One queue and listener thread per process
+    def __init__(self, handler, output, queue_size):
+        self.handler = handler
+        self.output = output
+        self.queue_size = queue_size
+        self.listener = None
+        self.start()
+
+    def start(self):
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+
+# The app logger is process-wide, so is its pipeline
+_pipeline = None
+
+
+def restart_after_fork():
+    # A forked worker (gunicorn --preload) needs its own listener thread,
+    # since threads do not survive fork
+    if _pipeline is not None:
+        _pipeline.start()
+
+
+def stop_logging():
+    # Drains the queue; runs at exit so the last records are written
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=restart_after_fork)
+atexit.register(stop_logging)
+
+
+def init_logging(app):
+    global _pipeline
+    level = to_level(app.config.get('LOG_LEVEL', 'INFO'))
+    output = logging.StreamHandler(app.config.get('LOG_STREAM') or sys.stdout)
+    output.setFormatter(TextFormatter() if app.config.get('LOG_FORMAT') == 'text' else JSONFormatter())
+    handler = AsyncHandler(queue.Queue())
+    handler.addFilter(RouteFilter(app.config.get('LOG_ROUTES')))
+
+    # Another create_app() in this process replaces the earlier pipeline
+    stop_logging()
+    app.logger.removeHandler(default_handler)
+    for existing in [h for h in app.logger.handlers if isinstance(h, AsyncHandler)]:
+        app.logger.removeHandler(existing)
+    app.logger.addHandler(handler)
+    app.logger.setLevel(level)
+    app.logger.propagate = False
+    _pipeline = LogPipeline(handler, output, app.config.get('LOG_QUEUE_SIZE', 10000))
+    access = app.logger.getChild('access')
+
+    @app.before_request
+    def start_request_log():
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+        g._log_start = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        response.headers.setdefault('X-Request-ID', g.get('request_id') or '')
+        start = g.pop('_log_start', None)
+        if start is not None and app.config.get('LOG_REQUESTS', True):
+            access.info('%s %s %s', request.method, request.path, response.status_code, extra={
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                # Measuring a streamed body would consume it here
+                'bytes': None if response.is_streamed else response.calculate_content_length(),
+            })
+        return response
@@ -0,0 +1,310 @@
+# Prometheus metrics
+# Each worker process counts into its own in-memory registry (one short lock
+# per observation) and a background thread writes a snapshot to
+# METRICS_DIR/<pid>.json every METRICS_FLUSH_INTERVAL seconds. /metrics merges the snapshots of all live workers
+# with the answering worker's current counts, so one scrape covers every
+# gunicorn worker. Snapshots of dead workers are dropped, which Prometheus
+# sees as a counter reset. Statements are timed by a cursor subclass around
+# execute() only, so rows are still fetched by sqlite3's C code.
+import bisect
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from flask import g, request
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# name: (type, help)
+METRICS = {
+    'nufl_http_requests_total': ('counter', 'HTTP requests handled, by route and status'),
+    'nufl_http_request_duration_seconds': ('histogram', 'Time to build the response (streamed bodies excluded)'),
+    'nufl_db_acquire_duration_seconds': ('histogram', 'Time to take a connection from the pool'),
+    'nufl_db_query_duration_seconds': ('histogram', 'Time to run a statement up to its first row'),
+    'nufl_db_pool_connections': ('gauge', 'Pooled connections by worker and state'),
+    'nufl_db_pool_events_total': ('counter', 'Connection pool events'),
+    'nufl_response_cache_events_total': ('counter', 'Response cache events'),
+    'nufl_response_cache_hit_ratio': ('gauge', 'Response cache hits / lookups over all workers'),
+    'nufl_upload_bytes_total': ('counter', 'Bytes received through the upload endpoint'),
+    'nufl_uploads_total': ('counter', 'Files received, by whether the blob already existed'),
+    'nufl_session_store_size': ('gauge', 'Rows in the server-side session table'),
+    'nufl_metrics_workers': ('gauge', 'Worker snapshots merged into this scrape'),
+}
+POOL_EVENTS = ('created', 'reused', 'released', 'discarded', 'waits', 'timeouts')
+CACHE_EVENTS = ('hits', 'misses', 'stores', 'evictions', 'invalidations')
+
+
+class Registry:
+    def __init__(self, directory, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+        os.makedirs(directory, exist_ok=True)
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self._counters = {}
+        self._histograms = {}
+        # A snapshot left by an earlier process with the same pid is stale
+        try:
+            os.remove(self.path(self.pid))
+        except OSError:
+            pass
+
+    def check_fork(self, snapshot):
+        # Workers forked from a preloaded app start counting from zero, and
+        # each process needs its own flusher thread (threads do not survive fork)
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            if self.pid != pid:
+                self._reset()
+            self._flusher_pid = pid
+        threading.Thread(target=self._flush_loop, args=(snapshot,), name='metrics-flusher', daemon=True).start()
+
+    def _flush_loop(self, snapshot):
+        while self._flusher_pid == os.getpid():
+            time.sleep(self.flush_interval)
+            try:
+                self.flush(snapshot())
+            except OSError:
+                continue
+
+    def path(self, pid):
+        return os.path.join(self.directory, f'{pid}.json')
+
+    def incr(self, name, amount=1, labels=()):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, labels=()):
+        key = (name, labels)
+        index = bisect.bisect_left(BUCKETS, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def snapshot(self, pool_stats=None, cache_stats=None):
+        with self._lock:
+            counters = [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, list(labels), list(buckets), total, count]
+                          for (name, labels), (buckets, total, count) in self._histograms.items()]
+        gauges = []
+        pid = str(self.pid)
+        if pool_stats is not None:
+            for event in POOL_EVENTS:
+                counters.append(['nufl_db_pool_events_total', [['event', event]], pool_stats[event]])
+            for state in ('in_use', 'idle'):
+                gauges.append(['nufl_db_pool_connections', [['pid', pid], ['state', state]], pool_stats[state]])
+        if cache_stats is not None:
+            for event in CACHE_EVENTS:
+                counters.append(['nufl_response_cache_events_total', [['event', event]], cache_stats[event]])
+        return {'pid': self.pid, 'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+    def flush(self, snapshot):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, self.path(self.pid))
+
+    def worker_snapshots(self):
+        # Snapshots of other live workers; files of exited processes are removed
+        snapshots = []
+        for entry in os.scandir(self.directory):
+            pid, ext = os.path.splitext(entry.name)
+            if ext != '.json' or not pid.isdigit() or int(pid) == self.pid:
+                continue
+            if not pid_alive(int(pid)):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(entry.path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+
+class TimedCursor(sqlite3.Cursor):
+    registry = None
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self.registry.observe('nufl_db_query_duration_seconds', time.perf_counter() - start)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self.registry.observe('nufl_db_query_duration_seconds', time.perf_counter() - start)
+        return self
+
+
+class TimedConnection:
+    def __init__(self, conn, registry):
+        self._conn = conn
+        self._registry = registry
+
+    def cursor(self, *args):
+        cursor = self._conn.cursor(TimedCursor)
+        cursor.registry = self._registry
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge(snapshots):
+    counters, histograms, gauges = {}, {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, total, count in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+        for name, labels, value in snapshot['gauges']:
+            gauges[(name, tuple(map(tuple, labels)))] = value
+    return counters, histograms, gauges
+
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(counters, histograms, gauges):
+    # Prometheus text exposition format, one HELP/TYPE block per metric
+    samples = {}
+    for (name, labels), value in sorted(counters.items()):
+        samples.setdefault(name, []).append(f'{name}{format_labels(labels)} {format_value(value)}')
+    for (name, labels), value in sorted(gauges.items()):
+        samples.setdefault(name, []).append(f'{name}{format_labels(labels)} {format_value(value)}')
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        lines = samples.setdefault(name, [])
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS + (float('inf'),), buckets):
+            cumulative += bucket
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{format_labels(labels, [("le", le)])} {cumulative}')
+        lines.append(f'{name}_sum{format_labels(labels)} {format_value(total)}')
+        lines.append(f'{name}_count{format_labels(labels)} {count}')
+    out = []
+    for name, (kind, help_text) in METRICS.items():
+        if name in samples:
+            out.append(f'# HELP {name} {help_text}')
+            out.append(f'# TYPE {name} {kind}')
+            out.extend(samples[name])
+    return '\n'.join(out) + '\n'
+
+
+def get_registry(app):
+    return app.extensions.get('metrics')
+
+
+def incr(app, name, amount=1, **labels):
+    registry = get_registry(app)
+    if registry is not None:
+        registry.incr(name, amount, tuple(labels.items()))
+
+
+def observe(app, name, value, **labels):
+    registry = get_registry(app)
+    if registry is not None:
+        registry.observe(name, value, tuple(labels.items()))
+
+
+def timed(app, conn):
+    registry = get_registry(app)
+    return TimedConnection(conn, registry) if registry is not None else conn
+
+
+def local_snapshot(app):
+    # Pool and cache keep their own per-process counts; either may not exist yet
+    pool = app.extensions.get('db_pool')
+    cache = app.extensions.get('response_cache')
+    return get_registry(app).snapshot(pool.stats() if pool is not None else None,
+                                      cache.stats.snapshot() if cache is not None else None)
+
+
+def collect(app, session_store_size=None):
+    # Text for /metrics: this worker's live counts plus every other worker's
+    # latest snapshot
+    registry = get_registry(app)
+    snapshot = local_snapshot(app)
+    registry.flush(snapshot)
+    snapshots = [snapshot] + registry.worker_snapshots()
+    counters, histograms, gauges = merge(snapshots)
+    hits = counters.get(('nufl_response_cache_events_total', (('event', 'hits'),)), 0)
+    misses = counters.get(('nufl_response_cache_events_total', (('event', 'misses'),)), 0)
+    gauges[('nufl_response_cache_hit_ratio', ())] = round(hits / (hits + misses), 4) if hits + misses else 0.0
+    if session_store_size is not None:
+        gauges[('nufl_session_store_size', ())] = session_store_size
+    gauges[('nufl_metrics_workers', ())] = len(snapshots)
+    return render(counters, histograms, gauges)
+
+
+def init_metrics(app):
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    directory = app.config.get('METRICS_DIR') or os.path.join(os.path.dirname(app.config['DATABASE']), 'metrics')
+    registry = app.extensions['metrics'] = Registry(directory, app.config.get('METRICS_FLUSH_INTERVAL', 5.0))
+
+    @app.before_request
+    def start_request_metrics():
+        registry.check_fork(lambda: local_snapshot(app))
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop('_metrics_start', None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        registry.incr('nufl_http_requests_total', 1,
+                      (('method', request.method), ('route', route), ('status', str(response.status_code))))
+        registry.observe('nufl_http_request_duration_seconds', time.perf_counter() - start,
+                         (('method', request.method), ('route', route)))
+        return response
@@ -0,0 +1,291 @@
+# Versioned schema migrations
+# The schema version is tracked in PRAGMA user_version. Each migration runs
+# in its own transaction together with the version bump, so a database is
+# always at exactly one known version.
+from .counters import create_counters
+from .search import create_search_index, fts5_available
+from .standings import populate_standings
+
+MIGRATIONS = []
+
+
+def migration(version):
+    def register(func):
+        MIGRATIONS.append((version, func))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return func
+    return register
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    applied = []
+    for version, func in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        cursor = conn.cursor()
+        # Take the write lock first so concurrent workers apply each step once
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= schema_version(conn):
+                conn.rollback()
+                continue
+            func(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+@migration(1)
+def base_schema(cursor):
+    # Create teams table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            city TEXT,
+            coach TEXT,
+            logo_url TEXT,
+            university TEXT,
+            founded TEXT,
+            stadium TEXT
+        )
+    ''')
+    # Create players table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS players (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            team_id INTEGER,
+            position TEXT,
+            jersey_number INTEGER,
+            age INTEGER,
+            nationality TEXT,
+            height REAL,
+            weight REAL,
+            photo_url TEXT,
+            FOREIGN KEY (team_id) REFERENCES teams(id)
+        )
+    ''')
+    # Create fixtures table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fixtures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            home_team_id INTEGER,
+            away_team_id INTEGER,
+            home_score INTEGER,
+            away_score INTEGER,
+            date TEXT,
+            time TEXT,
+            venue TEXT,
+            status TEXT,
+            FOREIGN KEY (home_team_id) REFERENCES teams(id),
+            FOREIGN KEY (away_team_id) REFERENCES teams(id)
+        )
+    ''')
+    # Create news table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS news (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT,
+            author TEXT,
+            category TEXT,
+            image_url TEXT,
+            published INTEGER,
+            published_at TEXT,
+            created_at TEXT
+        )
+    ''')
+
+
+@migration(2)
+def standings_table(cursor):
+    # Materialized league table, one row per team
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS standings (
+            team_id INTEGER PRIMARY KEY,
+            matches_played INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            draws INTEGER NOT NULL DEFAULT 0,
+            losses INTEGER NOT NULL DEFAULT 0,
+            points INTEGER NOT NULL DEFAULT 0,
+            goals_for INTEGER NOT NULL DEFAULT 0,
+            goals_against INTEGER NOT NULL DEFAULT 0,
+            goal_difference INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (team_id) REFERENCES teams(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_standings_rank
+        ON standings (points DESC, goal_difference DESC, goals_for DESC)
+    ''')
+    populate_standings(cursor)
+
+
+@migration(3)
+def hot_query_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_team_id ON players (team_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_status_date ON fixtures (status, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_date ON fixtures (date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_home_team_id ON fixtures (home_team_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_away_team_id ON fixtures (away_team_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_published_created_at ON news (published, created_at)")
+
+
+
+@migration(4)
+def data_versions(cursor):
+    # Per-table change counters; bumped by every write, read by cached views
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL
+        )
+    ''')
+    cursor.executemany(
+        "INSERT OR IGNORE INTO data_versions (name, version, updated_at) VALUES (?, 1, strftime('%s', 'now'))",
+        [(table,) for table in ('teams', 'players', 'fixtures', 'news')]
+    )
+
+
+CHANGE_LOGGED_TABLES = ('teams', 'players', 'fixtures', 'news')
+
+
+@migration(5)
+def change_log(cursor):
+    # Append-only log of row changes, written by triggers, for delta sync
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at REAL NOT NULL
+        )
+    ''')
+    now = "(julianday('now') - 2440587.5) * 86400.0"
+    for table in CHANGE_LOGGED_TABLES:
+        for event, op, ref in (('INSERT', 'insert', 'NEW'), ('UPDATE', 'update', 'NEW'), ('DELETE', 'delete', 'OLD')):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{op}_log
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, row_id, op, changed_at)
+                    VALUES ('{table}', {ref}.id, '{op}', {now});
+                END
+            ''')
+
+
+@migration(6)
+def sessions_table(cursor):
+    # Server-side sessions; expired rows are swept through the expiry index
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            sid TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)")
+
+
+@migration(7)
+def search_index(cursor):
+    # FTS5 indexes for /api/search; builds without FTS5 fall back to LIKE
+    # and can add the index later with `flask rebuild-search`
+    if fts5_available(cursor):
+        create_search_index(cursor)
+
+
+@migration(8)
+def dashboard_counters(cursor):
+    # Trigger-maintained row counts behind /api/stats and team player counts
+    create_counters(cursor)
+
+
+@migration(9)
+def fixture_sort_indexes(cursor):
+    # /api/fixtures pages on (COALESCE(date, ''), id) so undated fixtures
+    # sort first instead of falling out of the keyset comparison
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_sort_date ON fixtures (COALESCE(date, ''))")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_status_sort_date ON fixtures (status, COALESCE(date, ''))")
+
+# Hot read queries that must be served from an index. `flask check-indexes`
+# runs EXPLAIN QUERY PLAN on each one and reports any full table scan or
+# temporary sort.
+HOT_QUERIES = {
+    'players by team': (
+        "SELECT * FROM players WHERE team_id = ?", (1,)),
+    'fixtures by date': ("""
+        SELECT f.id, t1.name, t2.name, f.date
+        FROM fixtures f
+        JOIN teams t1 ON f.home_team_id = t1.id
+        JOIN teams t2 ON f.away_team_id = t2.id
+        ORDER BY f.date DESC
+    """, ()),
+    'fixtures by status': (
+        "SELECT id FROM fixtures WHERE status = ? ORDER BY date", ('scheduled',)),
+    'upcoming fixtures': ("""
+        SELECT id FROM fixtures
+        WHERE status = 'scheduled' AND date >= ?
+        ORDER BY date, id
+        LIMIT 5
+    """, ('2025-01-01',)),
+    'fixtures page': ("""
+        SELECT id FROM fixtures
+        WHERE (COALESCE(date, ''), id) < (?, ?)
+        ORDER BY COALESCE(date, '') DESC, id DESC
+        LIMIT 20
+    """, ('2025-01-01', 1)),
+    'fixtures page by status': ("""
+        SELECT id FROM fixtures
+        WHERE status = ? AND (COALESCE(date, ''), id) < (?, ?)
+        ORDER BY COALESCE(date, '') DESC, id DESC
+        LIMIT 20
+    """, ('completed', '2025-01-01', 1)),
+    'completed fixtures': ("""
+        SELECT home_team_id, away_team_id, home_score, away_score
+        FROM fixtures
+        WHERE status = 'completed'
+    """, ()),
+    'fixtures by team': (
+        "SELECT id FROM fixtures WHERE home_team_id = ? OR away_team_id = ?", (1, 1)),
+    'published news': ("""
+        SELECT id, title, created_at
+        FROM news
+        WHERE published = 1
+        ORDER BY created_at DESC
+    """, ()),
+    'expired sessions': (
+        "SELECT sid FROM sessions WHERE expires_at <= ?", (0,)),
+    'league table': ("""
+        SELECT s.team_id, t.name
+        FROM standings s
+        JOIN teams t ON t.id = s.team_id
+        ORDER BY s.points DESC, s.goal_difference DESC, s.goals_for DESC, s.team_id
+    """, ()),
+}
+
+
+def query_plan(conn, sql, params=()):
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def unindexed_queries(conn):
+    problems = {}
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = query_plan(conn, sql, params)
+        bad = [step for step in plan
+               if (step.startswith('SCAN') and 'USING' not in step) or 'TEMP B-TREE' in step]
+        if bad:
+            problems[name] = plan
+    return problems
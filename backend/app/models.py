@@ -1,73 +1,46 @@
 import sqlite3
 import os
+import time
+from flask import current_app, g, has_app_context
+from .db_pool import ConnectionPool, connect
+from .metrics import observe, timed
+from .migrations import migrate
+from .profiler import current_profile
+
+def get_pool(app):
+    pool = app.extensions.get('db_pool')
+    if pool is None:
+        pool = app.extensions['db_pool'] = ConnectionPool(
+            app.config['DATABASE'],
+            max_size=app.config.get('DB_POOL_SIZE', 8),
+            max_idle=app.config.get('DB_POOL_IDLE', 4)
+        )
+    return pool
 
 def get_db_connection(app):
-    conn = sqlite3.connect(app.config['DATABASE'])
-    conn.row_factory = sqlite3.Row
+    # Within an app context every call shares one pooled connection, which is
+    # returned to the pool by close_db_connection at teardown
+    if not has_app_context():
+        return connect(app.config['DATABASE'], factory=sqlite3.Connection)
+    conn = g.get('_db_conn')
+    if conn is None:
+        start = time.perf_counter()
+        conn = g._db_conn = get_pool(app).acquire()
+        observe(app, 'nufl_db_acquire_duration_seconds', time.perf_counter() - start)
+    # Statement timing for /metrics, then the opt-in per-request profiler
+    conn = timed(app, conn)
+    profile = current_profile()
+    if profile is not None:
+        return profile.wrap(conn)
     return conn
 
+def close_db_connection(exception=None):
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        get_pool(current_app).release(conn)
+
 def init_db(app):
     with app.app_context():
         conn = get_db_connection(app)
-        cursor = conn.cursor()
-        # Create teams table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS teams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                city TEXT,
-                coach TEXT,
-                logo_url TEXT,
-                university TEXT,
-                founded TEXT,
-                stadium TEXT
-            )
-        ''')
-        # Create players table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS players (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                team_id INTEGER,
-                position TEXT,
-                jersey_number INTEGER,
-                age INTEGER,
-                nationality TEXT,
-                height REAL,
-                weight REAL,
-                photo_url TEXT,
-                FOREIGN KEY (team_id) REFERENCES teams(id)
-            )
-        ''')
-        # Create fixtures table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS fixtures (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                home_team_id INTEGER,
-                away_team_id INTEGER,
-                home_score INTEGER,
-                away_score INTEGER,
-                date TEXT,
-                time TEXT,
-                venue TEXT,
-                status TEXT,
-                FOREIGN KEY (home_team_id) REFERENCES teams(id),
-                FOREIGN KEY (away_team_id) REFERENCES teams(id)
-            )
-        ''')
-        # Create news table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS news (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT,
-                author TEXT,
-                category TEXT,
-                image_url TEXT,
-                published INTEGER,
-                published_at TEXT,
-                created_at TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close() 
\ No newline at end of file
+        migrate(conn)
+        conn.close()
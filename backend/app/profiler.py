@@ -0,0 +1,159 @@
+# Per-request SQL profiler
+# Opt-in with SQL_PROFILER=1. While a request runs, connections handed out by
+# get_db_connection are wrapped so every statement is recorded with its
+# duration (execute plus fetches) and the rows it returned or changed.
+# Statements that repeat the same shape within one request, the usual sign of
+# an N+1 loop, are listed in the X-SQL-Repeated header and in a debug log
+# entry. With the profiler off no profile is created and connections are
+# not wrapped.
+import re
+import time
+from collections import Counter
+
+from flask import g, request
+
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+SPACE_RE = re.compile(r'\s+')
+MAX_SHAPE_LENGTH = 200
+
+
+def statement_shape(sql):
+    # Same statement with different literals or IN-list lengths → same shape
+    shape = LITERAL_RE.sub('?', SPACE_RE.sub(' ', sql).strip())
+    return IN_LIST_RE.sub('(?)', shape)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.statements = []
+
+    def wrap(self, conn):
+        return ProfiledConnection(conn, self)
+
+    def record(self, sql, duration, rows):
+        entry = {'sql': sql, 'duration': duration, 'rows': rows}
+        self.statements.append(entry)
+        return entry
+
+    def total_time(self):
+        return sum(entry['duration'] for entry in self.statements)
+
+    def repeated(self, threshold):
+        # [(count, shape)] for shapes run at least `threshold` times, most first
+        counts = Counter(statement_shape(entry['sql']) for entry in self.statements)
+        return sorted(((count, shape) for shape, count in counts.items() if count >= threshold),
+                      key=lambda item: (-item[0], item[1]))
+
+
+class ProfiledCursor:
+    def __init__(self, cursor, profile):
+        self._cursor = cursor
+        self._profile = profile
+        self._entry = None
+
+    def _run(self, method, sql, *args):
+        start = time.perf_counter()
+        method(sql, *args)
+        self._entry = self._profile.record(sql, time.perf_counter() - start, max(self._cursor.rowcount, 0))
+        return self
+
+    def execute(self, sql, parameters=()):
+        return self._run(self._cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(self._cursor.executemany, sql, seq_of_parameters)
+
+    def _fetched(self, start, rows):
+        if self._entry is not None:
+            self._entry['duration'] += time.perf_counter() - start
+            self._entry['rows'] += rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, row is not None)
+        return row
+
+    def fetchmany(self, *args):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(*args)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ProfiledConnection:
+    def __init__(self, conn, profile):
+        self._conn = conn
+        self._profile = profile
+
+    def cursor(self, *args):
+        return ProfiledCursor(self._conn.cursor(*args), self._profile)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def current_profile():
+    return g.get('_sql_profile')
+
+
+def start_profile():
+    if g.get('_sql_profile') is None:
+        g._sql_profile = RequestProfile()
+
+
+def header_value(shape):
+    return shape[:MAX_SHAPE_LENGTH].encode('ascii', 'replace').decode('ascii')
+
+
+def init_profiler(app):
+    if not app.config.get('SQL_PROFILER'):
+        return
+    threshold = app.config.get('SQL_PROFILER_REPEAT_THRESHOLD', 2)
+
+    @app.before_request
+    def start_sql_profile():
+        start_profile()
+
+    @app.after_request
+    def report_sql_profile(response):
+        profile = g.pop('_sql_profile', None)
+        if profile is None:
+            return response
+        repeated = profile.repeated(threshold)
+        response.headers['X-SQL-Queries'] = str(len(profile.statements))
+        response.headers['X-SQL-Time'] = f'{profile.total_time() * 1000:.3f}'
+        for count, shape in repeated:
+            response.headers.add('X-SQL-Repeated', f'{count}x {header_value(shape)}')
+        if repeated:
+            app.logger.debug('%s %s ran %d statements in %.3f ms; repeated: %s', request.method, request.path,
+                             len(profile.statements), profile.total_time() * 1000,
+                             '; '.join(f'{count}x {shape}' for count, shape in repeated))
+        if profile.statements:
+            app.logger.debug('%s %s statements:\n%s', request.method, request.path, '\n'.join(
+                f"  {entry['duration'] * 1000:8.3f} ms {entry['rows']:6d} rows  {statement_shape(entry['sql'])}"
+                for entry in profile.statements))
+        return response
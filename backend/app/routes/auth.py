@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify, session
 import hashlib
+import logging
 import time
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api')
+logger = logging.getLogger(__name__)
 
 @auth_bp.route('/login', methods=['POST', 'OPTIONS'])
 def login():
@@ -10,13 +12,8 @@ def login():
     if request.method == 'OPTIONS':
         return jsonify({'message': 'OK'}), 200
     
-    print(f"Login attempt - Method: {request.method}")
-    print(f"Request headers: {dict(request.headers)}")
-    print(f"Request data: {request.get_data()}")
-    
     try:
         data = request.get_json()
-        print(f"Parsed JSON data: {data}")
         
         if not data:
             return jsonify({'success': False, 'message': 'No data provided'}), 400
@@ -24,7 +21,7 @@ def login():
         username = data.get('username')
         password = data.get('password')
         
-        print(f"Login attempt for username: {username}")
+        logger.debug('Login attempt', extra={'username': username})
         
         if username == 'admin' and password == 'admin123':
             # Generate a simple token
@@ -34,8 +31,7 @@ def login():
             session['auth_token'] = token
             session['username'] = username
             
-            print(f"Login successful, token generated: {token}")
-            print(f"Session after login: {dict(session)}")
+            logger.info('Login succeeded', extra={'username': username})
             
             response = jsonify({
                 'success': True,
@@ -49,23 +45,23 @@ def login():
             
             return response
         else:
-            print(f"Login failed - Invalid credentials for username: {username}")
+            logger.warning('Login failed: invalid credentials', extra={'username': username})
             return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
             
     except Exception as e:
-        print(f"Login error: {str(e)}")
+        logger.exception('Login error')
         return jsonify({'success': False, 'message': f'Server error: {str(e)}'}), 500
 
 @auth_bp.route('/logout', methods=['POST'])
 def logout():
-    print("Logout request received")
+    username = session.get('username')
     session.clear()
-    print("Logout successful, session cleared")
+    logger.info('Logout', extra={'username': username})
     return jsonify({'success': True, 'message': 'Logout successful'})
 
 @auth_bp.route('/check_auth')
 def check_auth():
-    print(f"Check auth request - Session contents: {dict(session)}")
+    logger.debug('Auth check', extra={'authenticated': 'auth_token' in session})
     if 'auth_token' in session:
         return jsonify({
             'authenticated': True,
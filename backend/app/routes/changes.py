@@ -0,0 +1,122 @@
+from flask import Blueprint, request, jsonify, current_app
+from ..models import get_db_connection
+from ..serialization import row_mapper
+
+changes_bp = Blueprint('changes', __name__, url_prefix='/api')
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 5000
+
+# Current row shape for each synced table, matching the list endpoints
+ROW_QUERIES = {
+    'teams': ("""
+        SELECT id, name, university, city, founded, coach, stadium, logo_url
+        FROM teams
+        WHERE id IN ({ids})
+    """, ('id', 'name', 'university', 'city', 'founded', 'coach', 'stadium', 'logo_url')),
+    'players': ("""
+        SELECT p.id, p.name, p.team_id, t.name as team_name, p.position, p.jersey_number, p.age, p.nationality, p.height, p.weight, p.photo_url
+        FROM players p
+        LEFT JOIN teams t ON p.team_id = t.id
+        WHERE p.id IN ({ids})
+    """, ('id', 'name', 'team_id', 'team_name', 'position', 'jersey_number', 'age',
+          'nationality', 'height', 'weight', 'photo_url')),
+    'fixtures': ("""
+        SELECT f.id, t1.name, t2.name, f.home_team_id, f.away_team_id, f.date, f.time, f.venue,
+               f.home_score, f.away_score, f.status, t1.logo_url, t2.logo_url
+        FROM fixtures f
+        JOIN teams t1 ON f.home_team_id = t1.id
+        JOIN teams t2 ON f.away_team_id = t2.id
+        WHERE f.id IN ({ids})
+    """, ('id', 'home_team', 'away_team', 'home_team_id', 'away_team_id', 'date', 'time', 'venue',
+          'home_score', 'away_score', 'status', 'home_team_logo', 'away_team_logo')),
+    # Unpublished articles are reported as deleted to public clients
+    'news': ("""
+        SELECT id, title, content, author, category, image_url, published, created_at
+        FROM news
+        WHERE published = 1 AND id IN ({ids})
+    """, ('id', 'title', 'content', 'author', 'category', 'image_url', 'published', 'created_at')),
+}
+
+
+def fetch_rows(cursor, table, ids):
+    query, fields = ROW_QUERIES[table]
+    mapper = row_mapper(fields)
+    rows = {}
+    # Stay well below SQLite's bound-parameter limit
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        cursor.execute(query.format(ids=', '.join('?' for _ in chunk)), chunk)
+        for row in cursor.fetchall():
+            rows[row[0]] = mapper(row)
+    return rows
+
+
+def log_versions(cursor):
+    # (oldest version still in the log, latest version ever written). The
+    # AUTOINCREMENT high-water mark in sqlite_sequence survives pruning.
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")
+    row = cursor.fetchone()
+    current = row[0] if row else 0
+    cursor.execute("SELECT MIN(version) FROM change_log")
+    oldest = cursor.fetchone()[0]
+    return (oldest if oldest is not None else current + 1), current
+
+
+@changes_bp.route('/changes', methods=['GET'])
+def get_changes():
+    # Rows inserted, updated or deleted after version `since`, newest state
+    # only. Page with the returned `version` while `has_more` is true.
+    since = request.args.get('since', '0')
+    limit = request.args.get('limit', str(DEFAULT_PAGE_SIZE))
+    if not since.isdigit():
+        return jsonify({'error': 'since must be a non-negative integer'}), 400
+    if not limit.isdigit() or not 0 < int(limit) <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    since, limit = int(since), int(limit)
+
+    conn = get_db_connection(current_app)
+    cursor = conn.cursor()
+    oldest, current = log_versions(cursor)
+    if since < oldest - 1 or since > current:
+        # Versions are contiguous, so a gap means the log was pruned; a
+        # version from the future means the database was replaced
+        conn.close()
+        return jsonify({'error': 'Change log no longer covers this version; reload all data',
+                        'version': current}), 410
+
+    # One entry per row: SQLite returns op from the row holding MAX(version)
+    cursor.execute("""
+        SELECT table_name, row_id, op, MAX(version) as version
+        FROM change_log
+        WHERE version > ?
+        GROUP BY table_name, row_id
+        ORDER BY version
+        LIMIT ?
+    """, (since, limit + 1))
+    entries = cursor.fetchall()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    wanted = {}
+    for table_name, row_id, op, _ in entries:
+        if op != 'delete':
+            wanted.setdefault(table_name, []).append(row_id)
+    current_rows = dict((table, fetch_rows(cursor, table, ids)) for table, ids in wanted.items())
+    conn.close()
+
+    changes = []
+    for table_name, row_id, op, version in entries:
+        data = current_rows.get(table_name, {}).get(row_id)
+        if op != 'delete' and data is None:
+            op = 'delete'
+        changes.append({'table': table_name, 'id': row_id, 'op': op, 'version': version, 'data': data})
+    if has_more:
+        version = entries[-1][3]
+    else:
+        version = max([current, since] + [entry[3] for entry in entries[-1:]])
+    return jsonify({
+        'version': version,
+        'has_more': has_more,
+        'changes': changes
+    })
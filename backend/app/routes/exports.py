@@ -0,0 +1,106 @@
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
+import csv
+import io
+from ..cache import cache_key, is_not_modified, make_etag, not_modified, read_versions, set_validators
+from ..models import get_db_connection
+from ..serialization import dumps_compact, row_mapper
+from ..standings import STAT_COLUMNS
+
+exports_bp = Blueprint('exports', __name__, url_prefix='/api')
+
+BATCH_SIZE = 500
+
+# dataset: (query, fields, tables it reads). Every query walks an index in
+# its ORDER BY so SQLite streams rows without sorting the whole table.
+EXPORTS = {
+    'players': ("""
+        SELECT p.id, p.name, p.team_id, t.name, p.position, p.jersey_number, p.age, p.nationality,
+               p.height, p.weight, p.photo_url
+        FROM players p
+        LEFT JOIN teams t ON p.team_id = t.id
+        ORDER BY p.id
+    """, ('id', 'name', 'team_id', 'team_name', 'position', 'jersey_number', 'age', 'nationality',
+          'height', 'weight', 'photo_url'), ('players', 'teams')),
+    'fixtures': ("""
+        SELECT f.id, f.date, f.time, f.home_team_id, t1.name, f.away_team_id, t2.name, f.venue,
+               f.home_score, f.away_score, f.status
+        FROM fixtures f
+        JOIN teams t1 ON f.home_team_id = t1.id
+        JOIN teams t2 ON f.away_team_id = t2.id
+        ORDER BY f.date, f.id
+    """, ('id', 'date', 'time', 'home_team_id', 'home_team', 'away_team_id', 'away_team', 'venue',
+          'home_score', 'away_score', 'status'), ('fixtures', 'teams')),
+    'news': ("""
+        SELECT id, title, content, author, category, image_url, created_at
+        FROM news
+        WHERE published = 1
+        ORDER BY id
+    """, ('id', 'title', 'content', 'author', 'category', 'image_url', 'created_at'), ('news',)),
+    'standings': (f"""
+        SELECT s.team_id, t.name, {', '.join('s.' + column for column in STAT_COLUMNS)}
+        FROM standings s
+        JOIN teams t ON s.team_id = t.id
+        ORDER BY s.points DESC, s.goal_difference DESC, s.goals_for DESC, s.team_id
+    """, ('team_id', 'team_name') + STAT_COLUMNS, ('fixtures', 'teams')),
+}
+FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def ndjson_chunks(cursor, fields):
+    mapper = row_mapper(fields)
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        yield ''.join(dumps_compact(mapper(row)) + '\n' for row in rows)
+
+
+def csv_chunks(cursor, fields):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for an empty table
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@exports_bp.route('/export/<dataset>', methods=['GET'])
+def export(dataset):
+    # Streams a whole dataset as NDJSON (default) or CSV in fixed-size
+    # batches, so memory use does not grow with the table
+    if dataset not in EXPORTS:
+        return jsonify({'error': f"Unknown dataset; choose one of {', '.join(EXPORTS)}"}), 404
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    query, fields, tables = EXPORTS[dataset]
+
+    conn = get_db_connection(current_app)
+    versions, last_modified = read_versions(conn, tables)
+    etag = make_etag(cache_key(versions))
+    # Every known dataset has a current representation, even when empty
+    if is_not_modified(etag, last_modified, exists=True):
+        conn.close()
+        return not_modified(etag, last_modified)
+    # One statement reads one snapshot, however long the client takes
+    cursor = conn.cursor()
+    cursor.execute(query)
+
+    def generate():
+        try:
+            yield from (ndjson_chunks if fmt == 'ndjson' else csv_chunks)(cursor, fields)
+        finally:
+            cursor.close()
+            conn.close()
+
+    response = current_app.response_class(stream_with_context(generate()), mimetype=FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{dataset}.{fmt}"'
+    return set_validators(response, etag, last_modified)
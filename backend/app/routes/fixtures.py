@@ -1,14 +1,72 @@
 from flask import Blueprint, request, jsonify, current_app, session
+import logging
 import sqlite3
+from ..cache import cached, invalidate
+from ..images import thumbnail_url
 from ..models import get_db_connection
+from ..scheduler import ScheduleError, plan_and_import
+from ..serialization import map_rows, row_mapper
+from ..standings import read_fixture, add_fixture_delta, apply_deltas
+from ..utils import decode_cursor, encode_cursor, parse_date
 
 fixtures_bp = Blueprint('fixtures', __name__, url_prefix='/api')
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 500
+MAX_BATCH_RESULTS = 1000
+# Pages are keyed on (sort date, id); undated fixtures sort as ''
+SORT_DATE = "COALESCE(f.date, '')"
+
+fixture_list_row = row_mapper(
+    ('id', 'home_team', 'away_team', 'home_team_id', 'away_team_id', 'date', 'time', 'venue',
+     'home_score', 'away_score', 'status', 'home_team_logo', 'away_team_logo'),
+    computed=(('home_team_logo_thumb', thumbnail_url, 'home_team_logo'),
+              ('away_team_logo_thumb', thumbnail_url, 'away_team_logo'))
+)
+fixture_row = row_mapper(('id', 'home_team', 'away_team', 'date', 'time', 'venue', 'home_score',
+                          'away_score', 'status'))
 
 @fixtures_bp.route('/fixtures', methods=['GET'])
+@cached('fixtures', 'teams')
 def get_fixtures():
-    conn = get_db_connection(current_app)
-    cursor = conn.cursor()
-    cursor.execute("""
+    # Optional filters: status, team_id, date_from, date_to (YYYY-MM-DD),
+    # order (asc/desc), limit and cursor for keyset pagination on (date, id)
+    conditions = []
+    params = []
+    status = request.args.get('status')
+    if status:
+        conditions.append("f.status = ?")
+        params.append(status)
+    team_id = request.args.get('team_id')
+    if team_id is not None:
+        if not team_id.isdigit():
+            return jsonify({'error': 'team_id must be an integer'}), 400
+        conditions.append("(f.home_team_id = ? OR f.away_team_id = ?)")
+        params.extend([int(team_id), int(team_id)])
+    for arg, operator in (('date_from', '>='), ('date_to', '<=')):
+        value = request.args.get(arg)
+        if value is not None:
+            if parse_date(value) is None:
+                return jsonify({'error': f'{arg} must be a YYYY-MM-DD date'}), 400
+            conditions.append(f"f.date {operator} ?")
+            params.append(parse_date(value))
+    order = request.args.get('order', 'desc').lower()
+    if order not in ('asc', 'desc'):
+        return jsonify({'error': 'order must be asc or desc'}), 400
+    cursor_token = request.args.get('cursor')
+    if cursor_token:
+        position = decode_cursor(cursor_token, 2)
+        if position is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        conditions.append(f"({SORT_DATE}, f.id) {'>' if order == 'asc' else '<'} (?, ?)")
+        params.extend([position[0] or '', position[1]])
+    limit = request.args.get('limit')
+    if limit is not None:
+        if not limit.isdigit() or not 0 < int(limit) <= MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+        limit = int(limit)
+
+    query = """
         SELECT 
             f.id, 
             t1.name as home_team, 
@@ -26,30 +84,28 @@ def get_fixtures():
         FROM fixtures f
         JOIN teams t1 ON f.home_team_id = t1.id
         JOIN teams t2 ON f.away_team_id = t2.id
-        ORDER BY f.date DESC
-    """)
-    fixtures = cursor.fetchall()
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {SORT_DATE} {order.upper()}, f.id {order.upper()}"
+    if limit is not None:
+        # Fetch one extra row to learn whether another page exists
+        query += " LIMIT ?"
+        params.append(limit + 1)
+
+    conn = get_db_connection(current_app)
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    fixtures_list = map_rows(fixture_list_row, cursor.fetchall())
     conn.close()
-    fixtures_list = []
-    for fixture in fixtures:
-        fixtures_list.append({
-            'id': fixture[0],
-            'home_team': fixture[1],
-            'away_team': fixture[2],
-            'home_team_id': fixture[3],
-            'away_team_id': fixture[4],
-            'date': fixture[5],
-            'time': fixture[6],
-            'venue': fixture[7],
-            'home_score': fixture[8],
-            'away_score': fixture[9],
-            'status': fixture[10],
-            'home_team_logo': fixture[11],
-            'away_team_logo': fixture[12]
-        })
-    return jsonify(fixtures_list)
+    response = jsonify(fixtures_list[:limit])
+    if limit is not None and len(fixtures_list) > limit:
+        last = fixtures_list[limit - 1]
+        response.headers['X-Next-Cursor'] = encode_cursor(last['date'] or '', last['id'])
+    return response
 
 @fixtures_bp.route('/fixtures/<int:fixture_id>', methods=['GET'])
+@cached('fixtures', 'teams')
 def get_fixture(fixture_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
@@ -63,17 +119,7 @@ def get_fixture(fixture_id):
     fixture = cursor.fetchone()
     conn.close()
     if fixture:
-        return jsonify({
-            'id': fixture[0],
-            'home_team': fixture[1],
-            'away_team': fixture[2],
-            'date': fixture[3],
-            'time': fixture[4],
-            'venue': fixture[5],
-            'home_score': fixture[6],
-            'away_score': fixture[7],
-            'status': fixture[8]
-        })
+        return jsonify(fixture_row(fixture))
     else:
         return jsonify({'error': 'Fixture not found'}), 404
 
@@ -82,7 +128,7 @@ def create_fixture():
     if 'auth_token' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     data = request.get_json()
-    print(data)
+    logger.debug('Create fixture', extra={'fixture': data})
     home_team_name = data.get('home_team_id')
     away_team_name = data.get('away_team_id')
     match_date = data.get('date')
@@ -117,6 +163,8 @@ def create_fixture():
             INSERT INTO fixtures (home_team_id, away_team_id, date, time, venue, status, home_score, away_score)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (home_team_id[0], away_team_id[0], match_date, match_time, venue, status, home_score, away_score))
+        apply_deltas(cursor, add_fixture_delta({}, (home_team_id[0], away_team_id[0], home_score, away_score, status)))
+        invalidate(cursor, 'fixtures')
         conn.commit()
         fixture_id = cursor.lastrowid
         conn.close()
@@ -133,6 +181,11 @@ def update_fixture(fixture_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
     try:
+        cursor.execute("BEGIN IMMEDIATE")
+        old_fixture = read_fixture(cursor, fixture_id)
+        if old_fixture is None:
+            conn.close()
+            return jsonify({'error': 'Fixture not found'}), 404
         cursor.execute("""
             UPDATE fixtures 
             SET date = ?, time = ?, venue = ?, status = ?
@@ -144,9 +197,9 @@ def update_fixture(fixture_id):
             data.get('status'),
             fixture_id
         ))
-        if cursor.rowcount == 0:
-            conn.close()
-            return jsonify({'error': 'Fixture not found'}), 404
+        deltas = add_fixture_delta({}, old_fixture, -1)
+        apply_deltas(cursor, add_fixture_delta(deltas, read_fixture(cursor, fixture_id)))
+        invalidate(cursor, 'fixtures')
         conn.commit()
         conn.close()
         return jsonify({'message': 'Fixture updated successfully'})
@@ -161,10 +214,14 @@ def delete_fixture(fixture_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
     try:
-        cursor.execute("DELETE FROM fixtures WHERE id = ?", (fixture_id,))
-        if cursor.rowcount == 0:
+        cursor.execute("BEGIN IMMEDIATE")
+        old_fixture = read_fixture(cursor, fixture_id)
+        if old_fixture is None:
             conn.close()
             return jsonify({'error': 'Fixture not found'}), 404
+        cursor.execute("DELETE FROM fixtures WHERE id = ?", (fixture_id,))
+        apply_deltas(cursor, add_fixture_delta({}, old_fixture, -1))
+        invalidate(cursor, 'fixtures')
         conn.commit()
         conn.close()
         return jsonify({'message': 'Fixture deleted successfully'})
@@ -186,17 +243,134 @@ def update_result(fixture_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
     try:
+        cursor.execute("BEGIN IMMEDIATE")
+        old_fixture = read_fixture(cursor, fixture_id)
+        if old_fixture is None:
+            conn.close()
+            return jsonify({'error': 'Fixture not found'}), 404
         cursor.execute("""
             UPDATE fixtures 
             SET home_score = ?, away_score = ?, status = 'completed'
             WHERE id = ?
         """, (home_score, away_score, fixture_id))
-        if cursor.rowcount == 0:
-            conn.close()
-            return jsonify({'error': 'Fixture not found'}), 404
+        deltas = add_fixture_delta({}, old_fixture, -1)
+        apply_deltas(cursor, add_fixture_delta(deltas, read_fixture(cursor, fixture_id)))
+        invalidate(cursor, 'fixtures')
         conn.commit()
         conn.close()
         return jsonify({'success': True, 'message': 'Result updated successfully'})
     except Exception as e:
         conn.close()
-        return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500 
+
+@fixtures_bp.route('/fixtures/results', methods=['POST'])
+def update_results():
+    # A whole round of scores in one transaction: either every result is
+    # recorded or none is. Body: {"results": [{"fixture_id", "home_score",
+    # "away_score"}, ...]} (a bare list works too)
+    if 'auth_token' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    data = request.get_json(silent=True)
+    results = data.get('results') if isinstance(data, dict) else data
+    if not isinstance(results, list) or not results:
+        return jsonify({'error': 'results must be a non-empty list'}), 400
+    if len(results) > MAX_BATCH_RESULTS:
+        return jsonify({'error': f'At most {MAX_BATCH_RESULTS} results per batch'}), 400
+
+    errors = []
+    scores = {}
+    for index, result in enumerate(results):
+        if not isinstance(result, dict):
+            errors.append({'index': index, 'error': 'Each result must be an object'})
+            continue
+        fixture_id = result.get('fixture_id', result.get('id'))
+        home_score, away_score = result.get('home_score'), result.get('away_score')
+        if not isinstance(fixture_id, int) or isinstance(fixture_id, bool):
+            errors.append({'index': index, 'error': 'fixture_id must be an integer'})
+        elif not all(isinstance(score, int) and not isinstance(score, bool) and score >= 0
+                     for score in (home_score, away_score)):
+            errors.append({'index': index, 'fixture_id': fixture_id,
+                           'error': 'home_score and away_score must be non-negative integers'})
+        elif fixture_id in scores:
+            errors.append({'index': index, 'fixture_id': fixture_id, 'error': 'Duplicate fixture'})
+        else:
+            scores[fixture_id] = (home_score, away_score)
+    if errors:
+        return jsonify({'error': 'Invalid results; nothing was saved', 'errors': errors}), 400
+
+    conn = get_db_connection(current_app)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        ids = list(scores)
+        old_fixtures = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.execute(f"""
+                SELECT id, home_team_id, away_team_id, home_score, away_score, status
+                FROM fixtures
+                WHERE id IN ({', '.join('?' for _ in chunk)})
+            """, chunk)
+            old_fixtures.update((row[0], tuple(row[1:])) for row in cursor.fetchall())
+        missing = [fixture_id for fixture_id in ids if fixture_id not in old_fixtures]
+        if missing:
+            conn.close()
+            return jsonify({'error': 'Fixtures not found; nothing was saved', 'missing': missing}), 404
+        cursor.executemany("""
+            UPDATE fixtures 
+            SET home_score = ?, away_score = ?, status = 'completed'
+            WHERE id = ?
+        """, [(home_score, away_score, fixture_id) for fixture_id, (home_score, away_score) in scores.items()])
+        # Net standings change for the whole round, written once
+        deltas = {}
+        for fixture_id, old_fixture in old_fixtures.items():
+            add_fixture_delta(deltas, old_fixture, -1)
+            add_fixture_delta(deltas, old_fixture[:2] + scores[fixture_id] + ('completed',))
+        apply_deltas(cursor, deltas)
+        invalidate(cursor, 'fixtures')
+        conn.commit()
+        conn.close()
+        return jsonify({'success': True, 'message': f'{len(scores)} results updated', 'updated': len(scores)})
+    except Exception as e:
+        conn.close()
+        return jsonify({'error': str(e)}), 500
+
+@fixtures_bp.route('/fixtures/schedule', methods=['POST'])
+def schedule_fixtures():
+    # Generates a double round-robin for all teams (or team_ids) and inserts
+    # it through the bulk import path. Options: start_date (required),
+    # end_date, rest_days, blackout_dates, weekdays, venue_blackouts
+    # ({stadium: [dates]}), kickoff_time, team_ids, dry_run
+    if 'auth_token' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    conn = get_db_connection(current_app)
+    try:
+        fixtures, result = plan_and_import(
+            conn,
+            dry_run=bool(data.get('dry_run')),
+            start=data.get('start_date'),
+            end=data.get('end_date'),
+            rest_days=data.get('rest_days', 3),
+            blackout_dates=data.get('blackout_dates') or (),
+            weekdays=data.get('weekdays') or (),
+            venue_blackouts=data.get('venue_blackouts'),
+            kickoff=data.get('kickoff_time'),
+            team_ids=data.get('team_ids')
+        )
+    except ScheduleError as e:
+        conn.close()
+        return jsonify({'error': str(e)}), 400
+    conn.close()
+    summary = {
+        'rounds': max(fixture['round'] for fixture in fixtures),
+        'first_date': fixtures[0]['date'],
+        'last_date': fixtures[-1]['date']
+    }
+    if result is None:
+        return jsonify(dict(summary, fixtures=fixtures))
+    if result['errors']:
+        return jsonify(dict(result, error='Generated schedule failed validation')), 500
+    return jsonify(dict(summary, created=result['imported'])), 201
@@ -0,0 +1,38 @@
+from flask import Blueprint, request, jsonify, current_app, session
+from ..imports import BulkImportError, import_rows, read_rows
+from ..models import get_db_connection
+
+imports_bp = Blueprint('imports', __name__, url_prefix='/api')
+
+def request_payload():
+    # A multipart `file` (format from its extension) or a raw CSV/JSON body
+    upload = request.files.get('file')
+    if upload is not None:
+        fmt = upload.filename.rsplit('.', 1)[-1].lower() if '.' in upload.filename else ''
+        return upload.read(), request.args.get('format', fmt)
+    fmt = 'csv' if request.mimetype in ('text/csv', 'text/plain') else 'json'
+    return request.get_data(), request.args.get('format', fmt)
+
+@imports_bp.route('/import/<dataset>', methods=['POST'])
+def bulk_import(dataset):
+    # Bulk insert of teams, players or fixtures. Players and fixtures may name
+    # teams (team, home_team, away_team) instead of giving ids. Nothing is
+    # written if any row is invalid unless ?skip_invalid=1; ?dry_run=1 only
+    # validates.
+    if 'auth_token' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    skip_invalid = request.args.get('skip_invalid') in ('1', 'true')
+    dry_run = request.args.get('dry_run') in ('1', 'true')
+    payload, fmt = request_payload()
+    conn = get_db_connection(current_app)
+    try:
+        result = import_rows(conn, dataset, read_rows(payload, fmt), skip_invalid, dry_run)
+    except BulkImportError as e:
+        conn.close()
+        return jsonify({'error': str(e)}), 400
+    conn.close()
+    if result['imported']:
+        return jsonify(result), 201
+    if result['errors']:
+        return jsonify(result), 422
+    return jsonify(result)
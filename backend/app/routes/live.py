@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify, current_app
+from ..live import event_stream, format_event, get_broker
+from ..models import close_db_connection, get_db_connection
+
+live_bp = Blueprint('live', __name__, url_prefix='/api')
+
+@live_bp.route('/live', methods=['GET'])
+def live_stream():
+    # Server-Sent Events: `fixture` events for score/status changes and
+    # `standings` events with the rows that changed
+    broker = get_broker(current_app)
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+    if last_event_id is not None and not last_event_id.isdigit():
+        return jsonify({'error': 'Last-Event-ID must be a change version'}), 400
+    # Subscribe before reading the backlog so nothing committed in between
+    # is lost; event_stream drops live events the backlog already covers
+    subscriber = broker.subscribe()
+    if subscriber is None:
+        return jsonify({'error': 'Too many live subscribers, try again later'}), 503
+    backlog = []
+    replayed_through = None
+    if last_event_id is not None:
+        try:
+            conn = get_db_connection(current_app)
+            backlog, replayed_through = broker.replay(conn, int(last_event_id))
+            conn.close()
+        except Exception:
+            broker.unsubscribe(subscriber)
+            raise
+        if backlog is None:
+            backlog = [format_event('resync', {'reason': 'too many missed events'})]
+    # The stream can stay open for hours; hand the pooled connection back now
+    close_db_connection()
+
+    heartbeat = current_app.config.get('LIVE_HEARTBEAT', 15)
+    response = current_app.response_class(
+        event_stream(broker, subscriber, backlog, heartbeat, replayed_through),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx and similar proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,27 @@
+from flask import Blueprint, request, jsonify, current_app
+import hmac
+from ..metrics import collect, get_registry
+
+metrics_bp = Blueprint('metrics', __name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    # Prometheus scrape target. With METRICS_TOKEN set it requires
+    # "Authorization: Bearer <token>"; without one it only answers scrapers
+    # on this host that did not come in through a proxy
+    if get_registry(current_app) is None:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return jsonify({'error': 'Unauthorized'}), 401
+    elif request.remote_addr not in LOOPBACK_ADDRESSES or 'X-Forwarded-For' in request.headers:
+        return jsonify({'error': 'Set METRICS_TOKEN to scrape metrics from another host'}), 403
+    session_store_size = None
+    store_size = getattr(current_app.session_interface, 'store_size', None)
+    if store_size is not None:
+        session_store_size = store_size(current_app)
+    return current_app.response_class(collect(current_app, session_store_size), content_type=CONTENT_TYPE)
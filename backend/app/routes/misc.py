@@ -1,6 +1,14 @@
-from flask import Blueprint, jsonify, redirect, current_app, session
+from flask import Blueprint, jsonify, redirect, current_app, request, session
 import sqlite3
-from ..models import get_db_connection
+import time
+from datetime import datetime, timezone
+from functools import partial
+from ..cache import cached, get_cache
+from ..counters import read_counters
+from ..images import thumbnail_url
+from ..models import get_db_connection, get_pool
+from ..serialization import map_rows, row_mapper
+from ..standings import read_standings
 
 misc_bp = Blueprint('misc', __name__)
 
@@ -14,17 +22,42 @@ def index():
             'teams': '/api/teams',
             'fixtures': '/api/fixtures',
             'news': '/api/news',
-            'league_table': '/api/league_table'
+            'league_table': '/api/league_table',
+            'home': '/api/home',
+            'changes': '/api/changes?since=<version>',
+            'live': '/api/live',
+            'search': '/api/search?q=<text>',
+            'metrics': '/metrics',
+            'export': '/api/export/<players|fixtures|news|standings>?format=<ndjson|csv>'
         }
     })
 
 @misc_bp.route('/health')
 def health_check():
+    # Readiness probe: times one round trip through the connection pool and
+    # answers 503 when the database is unreachable or too slow
+    timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+    start = time.perf_counter()
+    try:
+        conn = get_db_connection(current_app)
+        schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+    except sqlite3.Error as e:
+        return jsonify({
+            'status': 'unavailable',
+            'message': f'Database error: {e}',
+            'timestamp': timestamp
+        }), 503
+    latency_ms = round((time.perf_counter() - start) * 1000, 3)
+    healthy = latency_ms <= current_app.config.get('HEALTH_DB_TIMEOUT_MS', 500)
     return jsonify({
-        'status': 'healthy',
-        'message': 'Backend is running',
-        'timestamp': '2024-07-26T00:00:00Z'
-    })
+        'status': 'healthy' if healthy else 'degraded',
+        'message': 'Backend is running' if healthy else 'Database round trip is slow',
+        'timestamp': timestamp,
+        'database': {'latency_ms': latency_ms, 'schema_version': schema_version},
+        'db_pool': get_pool(current_app).stats(),
+        'response_cache': get_cache(current_app).info()
+    }), 200 if healthy else 503
 
 @misc_bp.route('/test')
 def test_endpoint():
@@ -34,82 +67,83 @@ def test_endpoint():
     })
 
 @misc_bp.route('/api/league_table')
+@cached('fixtures', 'teams')
 def league_table():
+    conn = get_db_connection(current_app)
+    table = read_standings(conn)
+    conn.close()
+    return jsonify(table)
+
+HOME_SECTIONS = {'news': 6, 'fixtures': 5, 'table': 10}
+HOME_MAX_ITEMS = 50
+
+home_news_row = row_mapper(('id', 'title', 'excerpt', 'author', 'category', 'image_url', 'created_at'),
+                           computed=(('image_medium_url', partial(thumbnail_url, rendition='medium'), 'image_url'),))
+home_fixture_row = row_mapper(
+    ('id', 'home_team', 'away_team', 'home_team_id', 'away_team_id', 'date', 'time', 'venue', 'status',
+     'home_team_logo', 'away_team_logo'),
+    computed=(('home_team_logo_thumb', thumbnail_url, 'home_team_logo'),
+              ('away_team_logo_thumb', thumbnail_url, 'away_team_logo'))
+)
+
+def utc_today():
+    return time.strftime('%Y-%m-%d', time.gmtime())
+
+@misc_bp.route('/api/home')
+@cached('fixtures', 'news', 'teams', vary=utc_today)
+def home():
+    # Everything the home page shows, from three bounded queries:
+    # ?news=&fixtures=&table= override how many items each section holds
+    limits = {}
+    for section, default in HOME_SECTIONS.items():
+        value = request.args.get(section, str(default))
+        if not value.isdigit() or int(value) > HOME_MAX_ITEMS:
+            return jsonify({'error': f'{section} must be between 0 and {HOME_MAX_ITEMS}'}), 400
+        limits[section] = int(value)
+
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
-    cursor.execute("SELECT id, name, logo_url FROM teams")
-    teams = cursor.fetchall()
-    league_table = []
-    for team_id, team_name, logo_url in teams:
-        cursor.execute("""
-            SELECT 
-                SUM(CASE 
-                    WHEN home_team_id = ? AND home_score > away_score THEN 3
-                    WHEN away_team_id = ? AND away_score > home_score THEN 3
-                    WHEN (home_team_id = ? OR away_team_id = ?) AND home_score = away_score THEN 1
-                    ELSE 0 
-                END) as points,
-                SUM(CASE 
-                    WHEN home_team_id = ? THEN home_score
-                    WHEN away_team_id = ? THEN away_score
-                    ELSE 0 
-                END) as goals_for,
-                SUM(CASE 
-                    WHEN home_team_id = ? THEN away_score
-                    WHEN away_team_id = ? THEN home_score
-                    ELSE 0 
-                END) as goals_against,
-                COUNT(CASE WHEN (home_team_id = ? OR away_team_id = ?) AND status = 'completed' THEN 1 END) as matches_played
-            FROM fixtures 
-            WHERE status = 'completed' AND (home_team_id = ? OR away_team_id = ?)
-        """, (team_id, team_id, team_id, team_id, team_id, team_id, team_id, team_id, team_id, team_id, team_id, team_id))
-        result = cursor.fetchone()
-        points = result[0] or 0
-        goals_for = result[1] or 0
-        goals_against = result[2] or 0
-        matches_played = result[3] or 0
-        goal_difference = goals_for - goals_against
-        league_table.append({
-            'team_name': team_name,
-            'logo_url': logo_url,
-            'matches_played': matches_played,
-            'points': points,
-            'goals_for': goals_for,
-            'goals_against': goals_against,
-            'goal_difference': goal_difference
-        })
-    league_table.sort(key=lambda x: (x['points'], x['goal_difference'], x['goals_for']), reverse=True)
+    cursor.execute("""
+        SELECT id, title, substr(content, 1, 200), author, category, image_url, created_at
+        FROM news
+        WHERE published = 1
+        ORDER BY created_at DESC
+        LIMIT ?
+    """, (limits['news'],))
+    news = map_rows(home_news_row, cursor.fetchall())
+    # Overdue fixtures still marked scheduled stay off the page, and so do
+    # undated ones: NULL never compares >= today
+    cursor.execute("""
+        SELECT f.id, t1.name, t2.name, f.home_team_id, f.away_team_id, f.date, f.time, f.venue,
+               f.status, t1.logo_url, t2.logo_url
+        FROM fixtures f
+        JOIN teams t1 ON f.home_team_id = t1.id
+        JOIN teams t2 ON f.away_team_id = t2.id
+        WHERE f.status = 'scheduled' AND f.date >= ?
+        ORDER BY f.date, f.id
+        LIMIT ?
+    """, (utc_today(), limits['fixtures']))
+    fixtures = map_rows(home_fixture_row, cursor.fetchall())
+    table = read_standings(conn, limits['table'])
     conn.close()
-    return jsonify(league_table)
+    return jsonify({'news': news, 'upcoming_fixtures': fixtures, 'league_table': table})
 
 @misc_bp.route('/api/stats')
 def stats():
     if 'auth_token' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
+    # One row kept current by triggers; `flask check-counters` verifies it
     conn = get_db_connection(current_app)
-    cursor = conn.cursor()
-    # Get total teams
-    cursor.execute("SELECT COUNT(*) FROM teams")
-    total_teams = cursor.fetchone()[0]
-    # Get total players
-    cursor.execute("SELECT COUNT(*) FROM players")
-    total_players = cursor.fetchone()[0]
-    # Get total fixtures
-    cursor.execute("SELECT COUNT(*) FROM fixtures")
-    total_fixtures = cursor.fetchone()[0]
-    # Get completed matches
-    cursor.execute("SELECT COUNT(*) FROM fixtures WHERE status = 'completed'")
-    completed_matches = cursor.fetchone()[0]
-    # Get upcoming matches
-    cursor.execute("SELECT COUNT(*) FROM fixtures WHERE status = 'scheduled'")
-    upcoming_matches = cursor.fetchone()[0]
+    counters = read_counters(conn)
     conn.close()
     stats = {
-        'total_teams': total_teams,
-        'total_players': total_players,
-        'total_fixtures': total_fixtures,
-        'completed_matches': completed_matches,
-        'upcoming_matches': upcoming_matches
+        'total_teams': counters['teams'],
+        'total_players': counters['players'],
+        'total_fixtures': counters['fixtures'],
+        'completed_matches': counters['completed'],
+        'upcoming_matches': counters['scheduled'],
+        'total_news': counters['news'],
+        'published_news': counters['published_news']
     }
     return jsonify(stats)
 
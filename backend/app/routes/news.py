@@ -1,11 +1,20 @@
 from flask import Blueprint, request, jsonify, current_app, session
 import sqlite3
 from datetime import datetime
+from functools import partial
+from ..cache import cached, invalidate
+from ..images import thumbnail_url
 from ..models import get_db_connection
+from ..serialization import map_rows, row_mapper
 
 news_bp = Blueprint('news', __name__, url_prefix='/api')
 
+NEWS_FIELDS = ('id', 'title', 'content', 'author', 'category', 'image_url', 'published', 'created_at')
+news_row = row_mapper(NEWS_FIELDS)
+news_list_row = row_mapper(NEWS_FIELDS, computed=(('image_medium_url', partial(thumbnail_url, rendition='medium'), 'image_url'),))
+
 @news_bp.route('/news', methods=['GET'])
+@cached('news')
 def get_news():
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
@@ -15,23 +24,12 @@ def get_news():
         WHERE published = 1
         ORDER BY created_at DESC
     """)
-    news = cursor.fetchall()
+    news_list = map_rows(news_list_row, cursor.fetchall())
     conn.close()
-    news_list = []
-    for article in news:
-        news_list.append({
-            'id': article[0],
-            'title': article[1],
-            'content': article[2],
-            'author': article[3],
-            'category': article[4],
-            'image_url': article[5],
-            'published': article[6],
-            'created_at': article[7]
-        })
     return jsonify(news_list)
 
 @news_bp.route('/news/<int:news_id>', methods=['GET'])
+@cached('news')
 def get_news_article(news_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
@@ -43,16 +41,7 @@ def get_news_article(news_id):
     article = cursor.fetchone()
     conn.close()
     if article:
-        return jsonify({
-            'id': article[0],
-            'title': article[1],
-            'content': article[2],
-            'author': article[3],
-            'category': article[4],
-            'image_url': article[5],
-            'published': article[6],
-            'created_at': article[7]
-        })
+        return jsonify(news_row(article))
     else:
         return jsonify({'error': 'News article not found'}), 404
 
@@ -76,8 +65,9 @@ def create_news():
             data.get('published', 1),
             datetime.now().isoformat()
         ))
-        conn.commit()
         news_id = cursor.lastrowid
+        invalidate(cursor, 'news')
+        conn.commit()
         conn.close()
         return jsonify({'message': 'News article created successfully', 'id': news_id}), 201
     except Exception as e:
@@ -108,6 +98,7 @@ def update_news(news_id):
         if cursor.rowcount == 0:
             conn.close()
             return jsonify({'error': 'News article not found'}), 404
+        invalidate(cursor, 'news')
         conn.commit()
         conn.close()
         return jsonify({'message': 'News article updated successfully'})
@@ -126,6 +117,7 @@ def delete_news(news_id):
         if cursor.rowcount == 0:
             conn.close()
             return jsonify({'error': 'News article not found'}), 404
+        invalidate(cursor, 'news')
         conn.commit()
         conn.close()
         return jsonify({'message': 'News article deleted successfully'})
@@ -1,10 +1,19 @@
 from flask import Blueprint, request, jsonify, current_app, session
 import sqlite3
+from ..cache import cached, invalidate
+from ..images import thumbnail_url
 from ..models import get_db_connection
+from ..serialization import map_rows, row_mapper
 
 players_bp = Blueprint('players', __name__, url_prefix='/api')
 
+PLAYER_FIELDS = ('id', 'name', 'team_id', 'team_name', 'position', 'jersey_number', 'age',
+                 'nationality', 'height', 'weight', 'photo_url')
+player_row = row_mapper(PLAYER_FIELDS)
+player_list_row = row_mapper(PLAYER_FIELDS, computed=(('photo_thumb_url', thumbnail_url, 'photo_url'),))
+
 @players_bp.route('/players', methods=['GET'])
+@cached('players', 'teams')
 def get_players():
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
@@ -14,26 +23,12 @@ def get_players():
         LEFT JOIN teams t ON p.team_id = t.id
         ORDER BY t.name, p.name
     """)
-    players = cursor.fetchall()
+    players_list = map_rows(player_list_row, cursor.fetchall())
     conn.close()
-    players_list = []
-    for player in players:
-        players_list.append({
-            'id': player[0],
-            'name': player[1],
-            'team_id': player[2],
-            'team_name': player[3],
-            'position': player[4],
-            'jersey_number': player[5],
-            'age': player[6],
-            'nationality': player[7],
-            'height': player[8],
-            'weight': player[9],
-            'photo_url': player[10]
-        })
     return jsonify(players_list)
 
 @players_bp.route('/players/<int:player_id>', methods=['GET'])
+@cached('players', 'teams')
 def get_player(player_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
@@ -46,19 +41,7 @@ def get_player(player_id):
     player = cursor.fetchone()
     conn.close()
     if player:
-        return jsonify({
-            'id': player[0],
-            'name': player[1],
-            'team_id': player[2],
-            'team_name': player[3],
-            'position': player[4],
-            'jersey_number': player[5],
-            'age': player[6],
-            'nationality': player[7],
-            'height': player[8],
-            'weight': player[9],
-            'photo_url': player[10]
-        })
+        return jsonify(player_row(player))
     else:
         return jsonify({'error': 'Player not found'}), 404
 
@@ -84,8 +67,9 @@ def create_player():
             data.get('weight'),
             data.get('photo_url')
         ))
-        conn.commit()
         player_id = cursor.lastrowid
+        invalidate(cursor, 'players')
+        conn.commit()
         conn.close()
         return jsonify({'message': 'Player created successfully', 'id': player_id}), 201
     except Exception as e:
@@ -119,6 +103,7 @@ def update_player(player_id):
         if cursor.rowcount == 0:
             conn.close()
             return jsonify({'error': 'Player not found'}), 404
+        invalidate(cursor, 'players')
         conn.commit()
         conn.close()
         return jsonify({'message': 'Player updated successfully'})
@@ -137,6 +122,7 @@ def delete_player(player_id):
         if cursor.rowcount == 0:
             conn.close()
             return jsonify({'error': 'Player not found'}), 404
+        invalidate(cursor, 'players')
         conn.commit()
         conn.close()
         return jsonify({'message': 'Player deleted successfully'})
@@ -0,0 +1,41 @@
+from flask import Blueprint, request, jsonify, current_app
+from ..cache import cached
+from ..models import get_db_connection
+from ..search import SEARCH_INDEXES, TOKEN_RE, search
+
+search_bp = Blueprint('search', __name__, url_prefix='/api')
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_QUERY_LENGTH = 200
+
+@search_bp.route('/search', methods=['GET'])
+@cached('news', 'players', 'teams')
+def search_all():
+    # Ranked matches with highlighted snippets. Optional: type (comma
+    # separated teams,players,news), limit and offset
+    query = request.args.get('q', '').strip()
+    if not TOKEN_RE.search(query):
+        return jsonify({'error': 'q must contain at least one word'}), 400
+    if len(query) > MAX_QUERY_LENGTH:
+        return jsonify({'error': f'q must be at most {MAX_QUERY_LENGTH} characters'}), 400
+    types = [kind for kind in request.args.get('type', ','.join(SEARCH_INDEXES)).split(',') if kind]
+    if not types or any(kind not in SEARCH_INDEXES for kind in types):
+        return jsonify({'error': f"type must be one or more of {', '.join(SEARCH_INDEXES)}"}), 400
+    limit = request.args.get('limit', str(DEFAULT_PAGE_SIZE))
+    offset = request.args.get('offset', '0')
+    if not limit.isdigit() or not 0 < int(limit) <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    if not offset.isdigit():
+        return jsonify({'error': 'offset must be a non-negative integer'}), 400
+    limit, offset = int(limit), int(offset)
+
+    conn = get_db_connection(current_app)
+    # One extra row tells whether another page exists
+    results = search(conn, query, types, limit + 1, offset)
+    conn.close()
+    return jsonify({
+        'query': query,
+        'results': results[:limit],
+        'next_offset': offset + limit if len(results) > limit else None
+    })
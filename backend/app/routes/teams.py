@@ -1,67 +1,67 @@
 from flask import Blueprint, request, jsonify, current_app, session
+import logging
 import sqlite3
+from ..cache import cached, invalidate
+from ..images import thumbnail_url
+from ..imports import duplicate_team_error, team_name_taken
 from ..models import get_db_connection
+from ..serialization import map_rows, row_mapper
+from ..standings import add_team, remove_team
 
 teams_bp = Blueprint('teams', __name__, url_prefix='/api')
+logger = logging.getLogger(__name__)
+
+TEAM_FIELDS = ('id', 'name', 'university', 'city', 'founded', 'coach', 'stadium', 'logo_url')
+team_row = row_mapper(TEAM_FIELDS)
+team_list_row = row_mapper(TEAM_FIELDS + ('player_count',),
+                           computed=(('logo_thumb_url', thumbnail_url, 'logo_url'),))
+SQUAD_FIELDS = ('id', 'name', 'team_id', 'position', 'jersey_number', 'age', 'nationality', 'height',
+                'weight', 'photo_url')
+squad_row = row_mapper(SQUAD_FIELDS)
 
 @teams_bp.route('/teams', methods=['GET'])
+@cached('teams', 'players')
 def get_teams():
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT t.id, t.name, t.university, t.city, t.founded, t.coach, t.stadium, t.logo_url, COUNT(p.id) as player_count
+        SELECT t.id, t.name, t.university, t.city, t.founded, t.coach, t.stadium, t.logo_url,
+               COALESCE(c.squad_size, 0) as player_count
         FROM teams t
-        LEFT JOIN players p ON t.id = p.team_id
-        GROUP BY t.id
+        LEFT JOIN team_counters c ON c.team_id = t.id
         ORDER BY t.name
     """)
-    teams = cursor.fetchall()
+    teams_list = map_rows(team_list_row, cursor.fetchall())
     conn.close()
-    teams_list = []
-    for team in teams:
-        teams_list.append({
-            'id': team[0],
-            'name': team[1],
-            'university': team[2],
-            'city': team[3],
-            'founded': team[4],
-            'coach': team[5],
-            'stadium': team[6],
-            'logo_url': team[7],
-            'player_count': team[8]
-        })
     return jsonify(teams_list)
 
 @teams_bp.route('/teams/<int:team_id>', methods=['GET'])
+@cached('teams')
 def get_team(team_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM teams WHERE id = ?", (team_id,))
+    cursor.execute(f"SELECT {', '.join(TEAM_FIELDS)} FROM teams WHERE id = ?", (team_id,))
     team = cursor.fetchone()
     conn.close()
     if team:
-        return jsonify({
-            'id': team[0],
-            'name': team[1],
-            'university': team[2] if len(team) > 2 else None,
-            'city': team[3] if len(team) > 3 else None,
-            'founded': team[4] if len(team) > 4 else None,
-            'coach': team[5] if len(team) > 5 else None,
-            'stadium': team[6] if len(team) > 6 else None,
-            'logo_url': team[7] if len(team) > 7 else None
-        })
+        return jsonify(team_row(team))
     else:
         return jsonify({'error': 'Team not found'}), 404
 
 @teams_bp.route('/teams', methods=['POST'])
 def create_team():
-    print('Session contents at team creation:', dict(session))
+    logger.debug('Create team', extra={'authenticated': 'auth_token' in session})
     if 'auth_token' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     data = request.get_json()
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
     try:
+        # Same uniqueness rule as the bulk import, checked under the write lock
+        cursor.execute("BEGIN IMMEDIATE")
+        if team_name_taken(cursor, data.get('name')):
+            conn.close()
+            return jsonify({'error': duplicate_team_error(data.get('name'))}), 400
         cursor.execute("""
             INSERT INTO teams (name, university, city, founded, coach, stadium, logo_url)
             VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -74,8 +74,10 @@ def create_team():
             data.get('stadium'),
             data.get('logo_url')
         ))
-        conn.commit()
         team_id = cursor.lastrowid
+        add_team(cursor, team_id)
+        invalidate(cursor, 'teams')
+        conn.commit()
         conn.close()
         return jsonify({'message': 'Team created successfully', 'id': team_id}), 201
     except sqlite3.IntegrityError:
@@ -93,6 +95,10 @@ def update_team(team_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
     try:
+        cursor.execute("BEGIN IMMEDIATE")
+        if team_name_taken(cursor, data.get('name'), exclude_id=team_id):
+            conn.close()
+            return jsonify({'error': duplicate_team_error(data.get('name'))}), 400
         cursor.execute("""
             UPDATE teams 
             SET name = ?, university = ?, city = ?, founded = ?, coach = ?, stadium = ?, logo_url = ?
@@ -110,6 +116,7 @@ def update_team(team_id):
         if cursor.rowcount == 0:
             conn.close()
             return jsonify({'error': 'Team not found'}), 404
+        invalidate(cursor, 'teams')
         conn.commit()
         conn.close()
         return jsonify({'message': 'Team updated successfully'})
@@ -131,6 +138,8 @@ def delete_team(team_id):
         if cursor.rowcount == 0:
             conn.close()
             return jsonify({'error': 'Team not found'}), 404
+        remove_team(cursor, team_id)
+        invalidate(cursor, 'teams')
         conn.commit()
         conn.close()
         return jsonify({'message': 'Team deleted successfully'})
@@ -142,24 +151,11 @@ def delete_team(team_id):
         return jsonify({'error': str(e)}), 500
 
 @teams_bp.route('/teams/<int:team_id>/players', methods=['GET'])
+@cached('players')
 def get_players_by_team(team_id):
     conn = get_db_connection(current_app)
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM players WHERE team_id = ?", (team_id,))
-    players = cursor.fetchall()
+    cursor.execute(f"SELECT {', '.join(SQUAD_FIELDS)} FROM players WHERE team_id = ?", (team_id,))
+    players_list = map_rows(squad_row, cursor.fetchall())
     conn.close()
-    players_list = []
-    for player in players:
-        players_list.append({
-            'id': player[0],
-            'name': player[1],
-            'team_id': player[2],
-            'position': player[3],
-            'jersey_number': player[4],
-            'age': player[5] if len(player) > 5 else None,
-            'nationality': player[6] if len(player) > 6 else None,
-            'height': player[7] if len(player) > 7 else None,
-            'weight': player[8] if len(player) > 8 else None,
-            'photo_url': player[9] if len(player) > 9 else None
-        })
     return jsonify(players_list) 
\ No newline at end of file
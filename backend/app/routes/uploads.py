@@ -1,10 +1,23 @@
-from flask import Blueprint, request, jsonify, current_app, send_from_directory
+from flask import Blueprint, request, jsonify, current_app, send_from_directory, abort
+import glob
+import logging
+import mimetypes
 import os
+from urllib.parse import quote
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
+from ..images import SOURCE_EXTENSIONS, Image, parse_variant, submit_renditions, variant_name, variant_names
+from ..metrics import incr
+from ..storage import HASH_RE, normalize_extension, store_stream
 
 uploads_bp = Blueprint('uploads', __name__, url_prefix='/api')
+logger = logging.getLogger(__name__)
 
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+ALLOWED_EXTENSIONS = SOURCE_EXTENSIONS
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+LEGACY_CACHE = 'public, max-age=86400'
+SHORT_CACHE = 'public, max-age=60'
 
 def allowed_file(filename):
     return '.' in filename and \
@@ -13,7 +26,7 @@ def allowed_file(filename):
 @uploads_bp.route('/upload', methods=['POST'])
 def upload_file():
     from flask import session
-    print('Session contents at upload:', dict(session))
+    logger.debug('Upload', extra={'authenticated': 'auth_token' in session})
     if 'file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
     
@@ -22,29 +35,65 @@ def upload_file():
         return jsonify({'error': 'No selected file'}), 400
     
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        # Add timestamp to prevent filename conflicts
-        import time
-        name, ext = os.path.splitext(filename)
-        filename = f"{name}_{int(time.time())}{ext}"
-        
+        # Stored by content hash: re-uploading a file reuses the existing blob
         upload_folder = current_app.config['UPLOAD_FOLDER']
+        filename, created = store_stream(file.stream, upload_folder, normalize_extension(file.filename))
         file_path = os.path.join(upload_folder, filename)
-        
-        # Ensure upload directory exists
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        file.save(file_path)
+        incr(current_app, 'nufl_upload_bytes_total', os.path.getsize(file_path))
+        incr(current_app, 'nufl_uploads_total', deduplicated=str(not created).lower())
+        # Thumbnail/medium/original renditions are rendered off the request thread
+        if created or not os.path.exists(os.path.join(upload_folder, variant_name(filename, 'thumb', 'webp'))):
+            submit_renditions(current_app, file_path)
         
         # Return the URL for the uploaded file
         from flask import url_for
         url = url_for('uploads.uploaded_file', filename=filename, _external=True)
+        result = {'url': url, 'hash': os.path.splitext(filename)[0], 'deduplicated': not created}
+        if Image is not None:
+            result['variants'] = dict(
+                (rendition, dict((ext, url_for('uploads.uploaded_file', filename=name, _external=True))
+                                 for ext, name in names.items()))
+                for rendition, names in variant_names(filename).items()
+            )
         
-        return jsonify({'url': url}), 201
+        return jsonify(result), 201
     
     return jsonify({'error': 'File type not allowed'}), 400
 
+def serve_upload(upload_folder, filename, cache_control):
+    mode = current_app.config.get('UPLOADS_SERVE_MODE', 'app')
+    if mode == 'x-accel':
+        # nginx streams the file (with its own range/conditional handling)
+        # from an internal location mapped to UPLOAD_FOLDER
+        path = safe_join(upload_folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        response = current_app.response_class(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = current_app.config['UPLOADS_ACCEL_PREFIX'].rstrip('/') + '/' + quote(filename)
+    else:
+        # send_file answers Range and If-None-Match/If-Modified-Since itself,
+        # and emits X-Sendfile instead of the body when USE_X_SENDFILE is set
+        response = send_from_directory(upload_folder, filename, max_age=0)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
 @uploads_bp.route('/static/uploads/<filename>')
 def uploaded_file(filename):
     upload_folder = current_app.config['UPLOAD_FOLDER']
-    return send_from_directory(upload_folder, filename) 
\ No newline at end of file
+    variant = parse_variant(filename)
+    stem = variant['stem'] if variant else os.path.splitext(filename)[0]
+    if variant and not os.path.exists(os.path.join(upload_folder, secure_filename(filename))):
+        # Rendition not written yet (or Pillow missing): serve the upload
+        # itself, but only briefly so the rendition is picked up once ready
+        for ext in ALLOWED_EXTENSIONS | {ext.upper() for ext in ALLOWED_EXTENSIONS}:
+            original = f"{stem}.{ext}"
+            if os.path.exists(os.path.join(upload_folder, original)):
+                return serve_upload(upload_folder, original, SHORT_CACHE)
+        # Older clients may still hold rendition URLs for uploads that never
+        # get renditions; serve whatever file carries the stem
+        for path in sorted(glob.glob(os.path.join(glob.escape(upload_folder), glob.escape(stem) + '.*'))):
+            original = os.path.basename(path)
+            if parse_variant(original) is None:
+                return serve_upload(upload_folder, original, SHORT_CACHE)
+    # A content-addressed name never changes what it points at
+    return serve_upload(upload_folder, filename, IMMUTABLE_CACHE if HASH_RE.match(stem) else LEGACY_CACHE)
@@ -0,0 +1,207 @@
+# Double round-robin fixture scheduler
+# Pairings come from the circle method: N-1 rounds in which every team
+# plays once, mirrored for the return legs. Dates are then assigned greedily,
+# round by round, giving each match the earliest day that keeps both teams
+# rested, avoids blackout days and finds its stadium free. Existing fixtures
+# count as already booked.
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from .imports import insert_rows
+from .utils import parse_date
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+# Venue placeholder that is never treated as a booked stadium
+UNKNOWN_VENUE = 'TBD'
+
+
+class ScheduleError(Exception):
+    pass
+
+
+def round_robin(team_ids):
+    # Returns 2 * (N - 1) rounds of (home, away) pairs (N rounded up to even)
+    teams = list(team_ids)
+    if len(teams) < 2:
+        raise ScheduleError('At least two teams are needed')
+    if len(teams) % 2:
+        teams.append(None)  # bye
+    n = len(teams)
+    fixed = teams[-1]
+    first_half = []
+    for round_number in range(n - 1):
+        # Canonical pattern: the last team stays put while the others rotate,
+        # with venues chosen so each team mostly alternates home and away
+        other = teams[round_number]
+        pairs = [(fixed, other) if round_number % 2 else (other, fixed)]
+        for k in range(1, n // 2):
+            a = teams[(round_number + k) % (n - 1)]
+            b = teams[(round_number - k) % (n - 1)]
+            pairs.append((a, b) if k % 2 else (b, a))
+        first_half.append([(home, away) for home, away in pairs if home is not None and away is not None])
+    return first_half + [[(away, home) for home, away in pairs] for pairs in first_half]
+
+
+class Calendar:
+    # Booked days per team and per stadium
+    def __init__(self, rest_days, blackout_dates=(), weekdays=None, venue_blackouts=None):
+        self.rest_days = rest_days
+        self.blackout_dates = set(blackout_dates)
+        self.weekdays = set(weekdays) if weekdays else set(range(7))
+        self.venue_blackouts = dict((venue, set(days)) for venue, days in (venue_blackouts or {}).items())
+        self.team_days = defaultdict(set)
+        self.venue_days = Counter()
+
+    def book(self, home, away, venue, day):
+        self.team_days[home].add(day)
+        self.team_days[away].add(day)
+        if venue and venue != UNKNOWN_VENUE:
+            self.venue_days[(venue, day)] += 1
+
+    def team_rested(self, team, day):
+        booked = self.team_days[team]
+        return not any(day + timedelta(days=offset) in booked
+                       for offset in range(-self.rest_days, self.rest_days + 1))
+
+    def available(self, home, away, venue, day):
+        if day in self.blackout_dates or day.weekday() not in self.weekdays:
+            return False
+        if venue and venue != UNKNOWN_VENUE:
+            if self.venue_days[(venue, day)] or day in self.venue_blackouts.get(venue, ()):
+                return False
+        return self.team_rested(home, day) and self.team_rested(away, day)
+
+    def earliest(self, home, away, venue, start, end):
+        day = start
+        while end is None or day <= end:
+            if self.available(home, away, venue, day):
+                return day
+            day += timedelta(days=1)
+        return None
+
+
+def schedule_season(teams, start, end=None, rest_days=3, blackout_dates=(), weekdays=None,
+                    venue_blackouts=None, kickoff='15:00', existing=()):
+    # teams: [(id, stadium)], existing: [(home_id, away_id, venue, date)]
+    # Returns fixture rows ready for the bulk import path
+    venues = dict((team_id, stadium or UNKNOWN_VENUE) for team_id, stadium in teams)
+    calendar = Calendar(rest_days, blackout_dates, weekdays, venue_blackouts)
+    for home, away, venue, day in existing:
+        calendar.book(home, away, venue, day)
+
+    fixtures = []
+    round_start = start
+    for round_number, pairs in enumerate(round_robin(sorted(venues)), 1):
+        first_day = None
+        for home, away in pairs:
+            day = calendar.earliest(home, away, venues[home], round_start, end)
+            if day is None:
+                raise ScheduleError(f'Round {round_number} does not fit before {end.isoformat()}')
+            calendar.book(home, away, venues[home], day)
+            first_day = day if first_day is None else min(first_day, day)
+            fixtures.append({'round': round_number, 'home_team_id': home, 'away_team_id': away,
+                             'date': day.isoformat(), 'time': kickoff, 'venue': venues[home],
+                             'status': 'scheduled'})
+        # The next round never starts before this one did
+        round_start = first_day + timedelta(days=1)
+    fixtures.sort(key=lambda fixture: (fixture['date'], fixture['round']))
+    return fixtures
+
+
+def load_teams(cursor, team_ids=None):
+    cursor.execute("SELECT id, stadium FROM teams ORDER BY id")
+    teams = cursor.fetchall()
+    if team_ids:
+        wanted = set(team_ids)
+        missing = wanted - set(team_id for team_id, _ in teams)
+        if missing:
+            raise ScheduleError(f"Unknown team ids: {', '.join(map(str, sorted(missing)))}")
+        teams = [team for team in teams if team[0] in wanted]
+    return [tuple(team) for team in teams]
+
+
+def load_existing(cursor, start):
+    # Fixtures already on the calendar from `start` on block their days
+    cursor.execute("""
+        SELECT home_team_id, away_team_id, venue, date
+        FROM fixtures
+        WHERE date >= ? AND status != 'cancelled'
+    """, (start.isoformat(),))
+    existing = []
+    for home, away, venue, day in cursor.fetchall():
+        try:
+            existing.append((home, away, venue, date.fromisoformat(day)))
+        except (TypeError, ValueError):
+            continue
+    return existing
+
+
+def parse_weekdays(values):
+    days = []
+    for value in values or ():
+        key = str(value).strip().lower()[:3]
+        if key not in WEEKDAYS:
+            raise ScheduleError(f"Unknown weekday '{value}'")
+        days.append(WEEKDAYS.index(key))
+    return days
+
+
+def as_list(value, name):
+    # A single value or a JSON list of them
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, (list, tuple)):
+        raise ScheduleError(f'{name} must be a list')
+    return list(value)
+
+
+def to_date(value, name):
+    day = parse_date(value)
+    if day is None:
+        raise ScheduleError(f'{name} must be a YYYY-MM-DD date')
+    return date.fromisoformat(day)
+
+
+def plan_season(cursor, start, end=None, rest_days=3, blackout_dates=(), weekdays=(), venue_blackouts=None,
+                kickoff='15:00', team_ids=None):
+    # Validates request-style options (ISO date strings, weekday names) and
+    # schedules every selected team against the current fixture calendar
+    start = to_date(start, 'start_date')
+    end = to_date(end, 'end_date') if end else None
+    if end is not None and end < start:
+        raise ScheduleError('end_date is before start_date')
+    if not isinstance(rest_days, int) or isinstance(rest_days, bool) or not 0 <= rest_days <= 30:
+        raise ScheduleError('rest_days must be an integer between 0 and 30')
+    blackout_dates = [to_date(day, 'blackout_dates') for day in as_list(blackout_dates or (), 'blackout_dates')]
+    weekdays = as_list(weekdays or (), 'weekdays')
+    if venue_blackouts is not None and not isinstance(venue_blackouts, dict):
+        raise ScheduleError('venue_blackouts must be an object of {stadium: [dates]}')
+    venue_blackouts = dict((venue, [to_date(day, 'venue_blackouts') for day in as_list(days, 'venue_blackouts')])
+                           for venue, days in (venue_blackouts or {}).items())
+    if team_ids is not None and not (isinstance(team_ids, (list, tuple)) and all(
+            isinstance(team_id, int) and not isinstance(team_id, bool) for team_id in team_ids)):
+        raise ScheduleError('team_ids must be a list of integer team ids')
+    if kickoff is not None and not isinstance(kickoff, str):
+        raise ScheduleError('kickoff_time must be a HH:MM string')
+    teams = load_teams(cursor, team_ids)
+    return schedule_season(teams, start, end, rest_days, blackout_dates, parse_weekdays(weekdays),
+                           venue_blackouts, kickoff or '15:00', load_existing(cursor, start))
+
+
+def plan_and_import(conn, dry_run=False, **options):
+    # Plans and inserts under one write lock, so a team deleted or a fixture
+    # booked meanwhile cannot slip in between. Returns (fixtures, import
+    # result); the result is None for a dry run.
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        fixtures = plan_season(cursor, **options)
+        result = None if dry_run else insert_rows(cursor, 'fixtures', fixtures)
+    except Exception:
+        conn.rollback()
+        raise
+    if result is not None and result['imported']:
+        conn.commit()
+    else:
+        conn.rollback()
+    return fixtures, result
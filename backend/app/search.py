@@ -0,0 +1,126 @@
+# Full-text search over teams, players and news
+# Each table has an external-content FTS5 index kept in sync by triggers, so
+# the text is stored once and searches never scan the base tables. Where the
+# SQLite build lacks FTS5 the search falls back to LIKE matching.
+import html
+import re
+import sqlite3
+
+# type: (table, indexed columns with the title first, bm25 column weights)
+SEARCH_INDEXES = {
+    'teams': ('teams', ('name', 'university', 'city'), (10.0, 5.0, 2.0)),
+    'players': ('players', ('name', 'nationality', 'position'), (10.0, 2.0, 1.0)),
+    'news': ('news', ('title', 'content'), (5.0, 1.0)),
+}
+# Only published articles are searchable
+VISIBLE = {'news': 'published = 1'}
+# Snippet markers that cannot appear in stored text; replaced after escaping
+MARK_START, MARK_END = '\x02', '\x03'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts5_available(cursor):
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        cursor.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def search_index_exists(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'").fetchone() is not None
+
+
+def create_search_index(cursor):
+    for table, columns, _ in SEARCH_INDEXES.values():
+        fts = f'{table}_fts'
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list}, content='{table}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        # Only edits to indexed columns touch the index
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def match_expression(query):
+    # Every word must match, each as a prefix; quoting keeps user input from
+    # being read as FTS5 syntax
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(query))
+
+
+def render_snippet(snippet):
+    return html.escape(snippet or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def fts_search(conn, query, types, limit, offset):
+    selects = []
+    params = []
+    for kind in types:
+        table, columns, weights = SEARCH_INDEXES[kind]
+        fts = f'{table}_fts'
+        visible = f" AND b.{VISIBLE[kind]}" if kind in VISIBLE else ''
+        selects.append(f"""
+            SELECT '{kind}' AS type, b.id, b.{columns[0]} AS title,
+                   snippet({fts}, -1, '{MARK_START}', '{MARK_END}', '…', 12) AS snippet,
+                   bm25({fts}, {', '.join(map(str, weights))}) AS rank
+            FROM {fts}
+            JOIN {table} b ON b.id = {fts}.rowid
+            WHERE {fts} MATCH ?{visible}
+        """)
+        params.append(match_expression(query))
+    rows = conn.execute(' UNION ALL '.join(selects) + " ORDER BY rank LIMIT ? OFFSET ?",
+                        params + [limit, offset]).fetchall()
+    return [{'type': kind, 'id': row_id, 'title': title, 'snippet': render_snippet(snippet),
+             'rank': rank} for kind, row_id, title, snippet, rank in rows]
+
+
+def like_search(conn, query, types, limit, offset):
+    # Fallback without FTS5: every word must appear in one of the columns
+    tokens = TOKEN_RE.findall(query)
+    selects = []
+    params = []
+    for kind in types:
+        table, columns, _ = SEARCH_INDEXES[kind]
+        conditions = []
+        for token in tokens:
+            conditions.append('(' + ' OR '.join(f'{column} LIKE ?' for column in columns) + ')')
+            params.extend([f'%{token}%'] * len(columns))
+        if kind in VISIBLE:
+            conditions.append(VISIBLE[kind])
+        selects.append(f"""
+            SELECT '{kind}' AS type, id, {columns[0]} AS title, substr({columns[-1]}, 1, 160) AS snippet
+            FROM {table}
+            WHERE {' AND '.join(conditions)}
+        """)
+    rows = conn.execute(' UNION ALL '.join(selects) + " ORDER BY title LIMIT ? OFFSET ?",
+                        params + [limit, offset]).fetchall()
+    return [{'type': kind, 'id': row_id, 'title': title, 'snippet': html.escape(snippet or ''), 'rank': None}
+            for kind, row_id, title, snippet in rows]
+
+
+def search(conn, query, types, limit, offset):
+    if search_index_exists(conn):
+        return fts_search(conn, query, types, limit, offset)
+    return like_search(conn, query, types, limit, offset)
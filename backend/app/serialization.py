@@ -0,0 +1,78 @@
+# Row serialization and JSON encoding
+# Each query shape gets a row -> dict function generated once from its field
+# list, so list endpoints build response dicts with a single dict display per
+# row instead of hand-written index lookups. Responses are encoded with
+# orjson when it is installed and with the stdlib json module otherwise.
+import json
+import threading
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+_mappers = {}
+_mappers_lock = threading.Lock()
+
+
+def row_mapper(fields, computed=()):
+    # fields: response names in column order (None skips a column)
+    # computed: (name, func, source_field) for values derived from a column
+    key = (tuple(fields), tuple(computed))
+    mapper = _mappers.get(key)
+    if mapper is not None:
+        return mapper
+    positions = dict((name, index) for index, name in enumerate(fields) if name is not None)
+    items = [f"{name!r}: row[{index}]" for name, index in positions.items()]
+    namespace = {}
+    for number, (name, func, source) in enumerate(computed):
+        namespace[f'_computed{number}'] = func
+        items.append(f"{name!r}: _computed{number}(row[{positions[source]}])")
+    source = "def map_row(row):\n    return {" + ', '.join(items) + "}\n"
+    exec(compile(source, f"<row_mapper {', '.join(positions)}>", 'exec'), namespace)
+    with _mappers_lock:
+        mapper = _mappers.setdefault(key, namespace['map_row'])
+    return mapper
+
+
+def map_rows(mapper, rows):
+    return list(map(mapper, rows))
+
+
+def dumps_compact(obj):
+    # Compact JSON text for use outside a request (e.g. SSE payloads)
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # Same output rules as Flask's provider (sorted keys, Flask's handling of
+    # dates, decimals and dataclasses) with orjson doing the encoding
+    def _options(self, pretty=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._options(pretty))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
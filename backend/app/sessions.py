@@ -0,0 +1,160 @@
+# Session backends
+# 'sqlite' keeps session data server side in the sessions table, with a short
+# in-process read cache and an amortized sweep of expired rows. 'signed' is
+# Flask's stateless signed-cookie session, so auth checks need no storage
+# lookup at all.
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+from .models import get_db_connection
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires_at=None):
+        def on_update(session):
+            session.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class SQLiteSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, cache_ttl=2.0, cache_size=1024, sweep_interval=60.0):
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.sweep_interval = sweep_interval
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session')
+
+    def _cached(self, sid):
+        with self._lock:
+            entry = self._cache.get(sid)
+            if entry is None:
+                return None
+            data, expires_at, cached_at = entry
+            if time.time() - cached_at > self.cache_ttl:
+                del self._cache[sid]
+                return None
+            return data, expires_at
+
+    def _remember(self, sid, data, expires_at):
+        with self._lock:
+            self._cache[sid] = (data, expires_at, time.time())
+            self._cache.move_to_end(sid)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _forget(self, sid):
+        with self._lock:
+            self._cache.pop(sid, None)
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie:
+            return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+        try:
+            sid = self._signer(app).unsign(cookie).decode()
+        except BadSignature:
+            return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+        now = time.time()
+        cached = self._cached(sid)
+        if cached is None:
+            conn = get_db_connection(app)
+            row = conn.execute("SELECT data, expires_at FROM sessions WHERE sid = ?", (sid,)).fetchone()
+            conn.close()
+            cached = (row[0], row[1]) if row is not None else (None, 0)
+            self._remember(sid, *cached)
+        data, expires_at = cached
+        if data is None or expires_at <= now:
+            return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+        return ServerSideSession(self.serializer.loads(data), sid=sid, expires_at=expires_at)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if not session.new and session.modified:
+                self._delete(app, session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        now = time.time()
+        # Extend the expiry once half the lifetime has passed rather than
+        # writing the row on every request
+        refresh = session.expires_at is None or session.expires_at - now < lifetime / 2
+        if not (session.modified or refresh):
+            return
+        expires_at = now + lifetime
+        data = self.serializer.dumps(dict(session))
+        conn = get_db_connection(app)
+        conn.execute("""
+            INSERT INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(sid) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at
+        """, (session.sid, data, expires_at))
+        conn.commit()
+        self._remember(session.sid, data, expires_at)
+        self._maybe_sweep(conn, now)
+        conn.close()
+
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid).decode(),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+    def _delete(self, app, sid):
+        self._forget(sid)
+        conn = get_db_connection(app)
+        conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        conn.commit()
+        conn.close()
+
+    def _maybe_sweep(self, conn, now):
+        # Amortized cleanup: at most one indexed range delete per interval
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        conn.commit()
+
+    def store_size(self, app):
+        conn = get_db_connection(app)
+        count = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        conn.close()
+        return count
+
+
+def init_sessions(app):
+    backend = app.config.get('SESSION_BACKEND', 'sqlite')
+    if backend == 'sqlite':
+        app.session_interface = SQLiteSessionInterface(
+            cache_ttl=app.config.get('SESSION_CACHE_TTL', 2.0),
+            sweep_interval=app.config.get('SESSION_SWEEP_INTERVAL', 60.0)
+        )
+    elif backend == 'signed':
+        app.session_interface = SecureCookieSessionInterface()
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
@@ -0,0 +1,158 @@
+# League standings engine
+# Builds the whole table in a single pass over completed fixtures instead of
+# running one aggregate query per team.
+
+from .images import thumbnail_url
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+
+
+def empty_row(team_id, team_name, logo_url):
+    return {
+        'team_id': team_id,
+        'team_name': team_name,
+        'logo_url': logo_url,
+        'matches_played': 0,
+        'wins': 0,
+        'draws': 0,
+        'losses': 0,
+        'points': 0,
+        'goals_for': 0,
+        'goals_against': 0,
+        'goal_difference': 0
+    }
+
+
+def record_result(home, away, home_score, away_score):
+    # Apply one completed match to the two team rows
+    for row, scored, conceded in ((home, home_score, away_score), (away, away_score, home_score)):
+        if row is None:
+            continue
+        row['matches_played'] += 1
+        if scored is None or conceded is None:
+            # A completed fixture without a score counts as played only
+            continue
+        row['goals_for'] += scored
+        row['goals_against'] += conceded
+        row['goal_difference'] = row['goals_for'] - row['goals_against']
+        if scored > conceded:
+            row['wins'] += 1
+            row['points'] += POINTS_FOR_WIN
+        elif scored == conceded:
+            row['draws'] += 1
+            row['points'] += POINTS_FOR_DRAW
+        else:
+            row['losses'] += 1
+
+
+def sort_key(row):
+    # Points, then goal difference, then goals scored, then the lower team
+    # id, matching the ORDER BY in read_standings
+    return (row['points'], row['goal_difference'], row['goals_for'], -row['team_id'])
+
+
+def sort_table(rows):
+    return sorted(rows, key=sort_key, reverse=True)
+
+
+def compute_standings(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, name, logo_url FROM teams ORDER BY id")
+    table = {}
+    for team_id, team_name, logo_url in cursor.fetchall():
+        table[team_id] = empty_row(team_id, team_name, logo_url)
+
+    cursor.execute("""
+        SELECT home_team_id, away_team_id, home_score, away_score
+        FROM fixtures
+        WHERE status = 'completed'
+    """)
+    for home_team_id, away_team_id, home_score, away_score in cursor:
+        record_result(table.get(home_team_id), table.get(away_team_id), home_score, away_score)
+
+    return sort_table(table.values())
+
+
+# Materialized standings
+# The standings table holds one row per team and is kept up to date by
+# applying per-fixture deltas in the same transaction as the fixture write.
+
+STAT_COLUMNS = ('matches_played', 'wins', 'draws', 'losses', 'points',
+                'goals_for', 'goals_against', 'goal_difference')
+
+
+def read_fixture(cursor, fixture_id):
+    cursor.execute("""
+        SELECT home_team_id, away_team_id, home_score, away_score, status
+        FROM fixtures
+        WHERE id = ?
+    """, (fixture_id,))
+    return cursor.fetchone()
+
+
+def add_fixture_delta(deltas, fixture, sign=1):
+    # Accumulate the effect of one fixture (or its reversal when sign is -1)
+    home_team_id, away_team_id, home_score, away_score, status = fixture
+    if status != 'completed':
+        return deltas
+    home = empty_row(home_team_id, None, None)
+    away = empty_row(away_team_id, None, None)
+    record_result(home, away, home_score, away_score)
+    for row in (home, away):
+        totals = deltas.setdefault(row['team_id'], dict.fromkeys(STAT_COLUMNS, 0))
+        for column in STAT_COLUMNS:
+            totals[column] += sign * row[column]
+    return deltas
+
+
+def apply_deltas(cursor, deltas):
+    rows = [(team_id,) + tuple(totals[c] for c in STAT_COLUMNS)
+            for team_id, totals in deltas.items()
+            if any(totals.values())]
+    if not rows:
+        return
+    cursor.executemany(f"""
+        INSERT INTO standings (team_id, {', '.join(STAT_COLUMNS)})
+        VALUES (?, {', '.join('?' for _ in STAT_COLUMNS)})
+        ON CONFLICT(team_id) DO UPDATE SET
+            {', '.join(f'{c} = {c} + excluded.{c}' for c in STAT_COLUMNS)}
+    """, rows)
+
+
+def add_team(cursor, team_id):
+    cursor.execute("INSERT OR IGNORE INTO standings (team_id) VALUES (?)", (team_id,))
+
+
+def remove_team(cursor, team_id):
+    cursor.execute("DELETE FROM standings WHERE team_id = ?", (team_id,))
+
+
+def populate_standings(cursor):
+    # Recompute every row from the fixtures table
+    table = compute_standings(cursor.connection)
+    cursor.execute("DELETE FROM standings")
+    cursor.executemany(f"""
+        INSERT INTO standings (team_id, {', '.join(STAT_COLUMNS)})
+        VALUES (?, {', '.join('?' for _ in STAT_COLUMNS)})
+    """, [(row['team_id'],) + tuple(row[c] for c in STAT_COLUMNS) for row in table])
+    return len(table)
+
+
+def read_standings(conn, limit=-1):
+    # A negative limit returns the whole table
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT s.team_id, t.name, t.logo_url, {', '.join('s.' + c for c in STAT_COLUMNS)}
+        FROM standings s
+        JOIN teams t ON t.id = s.team_id
+        ORDER BY s.points DESC, s.goal_difference DESC, s.goals_for DESC, s.team_id
+        LIMIT ?
+    """, (limit,))
+    table = []
+    for row in cursor.fetchall():
+        entry = {'team_id': row[0], 'team_name': row[1], 'logo_url': row[2],
+                 'logo_thumb_url': thumbnail_url(row[2])}
+        entry.update(zip(STAT_COLUMNS, row[3:]))
+        table.append(entry)
+    return table
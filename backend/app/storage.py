@@ -0,0 +1,116 @@
+# Content-addressed upload storage
+# Uploads are stored as <sha256>.<ext>, hashed while the request body is
+# streamed to disk, so identical files become one blob however many teams,
+# players or articles point at it. Blobs nobody references any more are
+# removed by `flask gc-uploads`.
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+from .images import parse_variant, variant_names
+
+CHUNK_SIZE = 64 * 1024
+HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+# Same image, same blob: normalize extensions that name one format
+EXTENSION_ALIASES = {'jpeg': 'jpg'}
+# Columns that hold upload URLs
+REFERENCE_COLUMNS = (('teams', 'logo_url'), ('players', 'photo_url'), ('news', 'image_url'))
+
+
+def normalize_extension(filename):
+    ext = filename.rsplit('.', 1)[1].lower()
+    return EXTENSION_ALIASES.get(ext, ext)
+
+
+def store_stream(stream, folder, ext):
+    # Returns (filename, created); created is False when the blob already existed
+    os.makedirs(folder, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.upload-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        filename = f"{digest.hexdigest()}.{ext}"
+        target = os.path.join(folder, filename)
+        if os.path.exists(target):
+            os.remove(tmp)
+            # Touch it so a concurrent gc-uploads sees a fresh blob
+            touch_upload(folder, filename)
+            return filename, False
+        os.replace(tmp, target)
+        return filename, True
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def touch_upload(folder, filename):
+    # The blob and its renditions age together, so gc-uploads never keeps a
+    # re-uploaded blob while collecting the renditions it will be served as
+    os.utime(os.path.join(folder, filename))
+    for names in variant_names(filename).values():
+        for name in names.values():
+            try:
+                os.utime(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upload_filename(url):
+    # File name behind an upload URL, or None for external URLs
+    if not url or '/static/uploads/' not in url:
+        return None
+    return url.rsplit('/', 1)[-1]
+
+
+def referenced_uploads(conn):
+    referenced = set()
+    for table, column in REFERENCE_COLUMNS:
+        for (url,) in conn.execute(f"SELECT {column} FROM {table} WHERE {column} LIKE '%/static/uploads/%'"):
+            referenced.add(upload_filename(url))
+    return referenced
+
+
+def owning_stem(filename):
+    # Renditions belong to the upload they were rendered from
+    variant = parse_variant(filename)
+    if variant is not None:
+        return variant['stem']
+    return os.path.splitext(filename)[0]
+
+
+def unreferenced_files(folder, referenced, grace_period, include_legacy=False):
+    # Files whose upload no record points at and that are older than the
+    # grace period, so uploads not yet saved on a team/player/article survive.
+    # Only content-addressed blobs are considered unless include_legacy is set.
+    # A record may point at a rendition; it keeps the whole upload alive
+    referenced_stems = set(owning_stem(name) for name in referenced)
+    cutoff = time.time() - grace_period
+    garbage = []
+    for entry in os.scandir(folder):
+        if not entry.is_file() or entry.name.startswith('.'):
+            continue
+        stem = owning_stem(entry.name)
+        if stem in referenced_stems or not (include_legacy or HASH_RE.match(stem)):
+            continue
+        stat = entry.stat()
+        if stat.st_mtime > cutoff:
+            continue
+        garbage.append((entry.name, stat.st_size))
+    return sorted(garbage)
@@ -1,5 +1,31 @@
+import base64
+import json
+from datetime import date
+
 # Utility functions for the app
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'png', 'jpg', 'jpeg', 'gif'}
  
-# Add more helpers as needed 
\ No newline at end of file
+# Add more helpers as needed 
+
+def encode_cursor(*values):
+    # Opaque pagination cursor for keyset queries
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token, size):
+    # Returns the cursor values, or None if the token is malformed
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        return None
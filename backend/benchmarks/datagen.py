@@ -0,0 +1,166 @@
+# Synthetic league generator
+# Fills the schema with a deterministic league: the same size and seed always
+# give the same teams, players, fixtures and news, so benchmark runs on
+# different commits read identical data. Rows go in through the normal
+# triggers (change log, search index) and standings are rebuilt at the end.
+#
+# Usage (from backend/):
+#     python -m benchmarks.datagen DATABASE [--size small|medium|large] [--seed 21]
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db_pool import connect
+from app.migrations import migrate
+from app.standings import populate_standings
+
+# size: (teams, players, fixtures, news)
+SIZES = {
+    'small': (20, 500, 380, 50),
+    'medium': (200, 5000, 10000, 500),
+    'large': (2000, 50000, 100000, 2000),
+}
+SEASON_START = date(2025, 8, 1)
+# Fixtures before this day are completed, the rest scheduled
+CUTOFF = date(2026, 1, 1)
+SEASON_DAYS = 300
+
+CITIES = ('Lagos', 'Ibadan', 'Abuja', 'Enugu', 'Kano', 'Jos', 'Benin', 'Calabar', 'Owerri', 'Ilorin',
+          'Zaria', 'Akure', 'Uyo', 'Abeokuta', 'Nsukka', 'Ife', 'Port Harcourt', 'Maiduguri', 'Sokoto', 'Yola')
+NICKNAMES = ('Lions', 'Eagles', 'Stars', 'Rangers', 'Pillars', 'Sharks', 'Tornadoes', 'Warriors', 'Royals',
+             'Falcons', 'Titans', 'Rockets', 'Comets', 'Kings', 'Bulls', 'Strikers', 'Hawks', 'Giants',
+             'Panthers', 'United')
+FIRST_NAMES = ('Chinedu', 'Emeka', 'Tunde', 'Ahmed', 'Ifeanyi', 'Sola', 'Musa', 'Kelechi', 'Segun', 'Ibrahim',
+               'Uche', 'Femi', 'Yusuf', 'Obinna', 'Dayo', 'Samuel', 'Victor', 'Daniel', 'Joseph', 'Peter')
+LAST_NAMES = ('Okafor', 'Adeyemi', 'Bello', 'Eze', 'Ogunleye', 'Abubakar', 'Nwosu', 'Balogun', 'Okonkwo',
+              'Lawal', 'Onyeka', 'Adebayo', 'Danjuma', 'Ibe', 'Olawale', 'Chukwu', 'Sani', 'Akande', 'Obi',
+              'Afolabi')
+POSITIONS = ('Goalkeeper', 'Defender', 'Midfielder', 'Forward')
+NATIONALITIES = ('Nigeria', 'Nigeria', 'Nigeria', 'Ghana', 'Cameroon', 'Benin', 'Niger', 'Togo')
+CATEGORIES = ('Match Report', 'Transfer', 'League', 'Interview', 'Announcement')
+WORDS = ('league', 'season', 'match', 'goal', 'coach', 'victory', 'derby', 'campus', 'training', 'fans',
+         'stadium', 'striker', 'defence', 'title', 'table', 'fixture', 'injury', 'debut', 'final', 'cup')
+
+
+def team_rows(rng, n_teams):
+    combos = len(CITIES) * len(NICKNAMES)
+    rows = []
+    for i in range(n_teams):
+        city = CITIES[i % len(CITIES)]
+        name = f"{city} {NICKNAMES[i // len(CITIES) % len(NICKNAMES)]}"
+        if i >= combos:
+            name += f" {i // combos + 1}"
+        rows.append((name, f"University of {city}", city, str(rng.randint(1950, 2020)),
+                     f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"{name} Stadium",
+                     f"/api/static/uploads/{rng.getrandbits(256):064x}.png"))
+    return rows
+
+
+def player_rows(rng, n_players, n_teams):
+    rows = []
+    for i in range(n_players):
+        # Squads fill evenly so every team gets players
+        rows.append((f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", i % n_teams + 1,
+                     rng.choice(POSITIONS), rng.randint(1, 99), rng.randint(17, 30), rng.choice(NATIONALITIES),
+                     round(rng.uniform(1.6, 2.0), 2), round(rng.uniform(60, 95), 1),
+                     f"/api/static/uploads/{rng.getrandbits(256):064x}.jpg" if rng.random() < 0.8 else None))
+    return rows
+
+
+def fixture_rows(rng, n_fixtures, stadiums):
+    n_teams = len(stadiums)
+    rows = []
+    for _ in range(n_fixtures):
+        home = rng.randint(1, n_teams)
+        away = rng.randint(1, n_teams - 1)
+        if away >= home:
+            away += 1
+        day = SEASON_START + timedelta(days=rng.randrange(SEASON_DAYS))
+        if day < CUTOFF:
+            status, home_score, away_score = 'completed', rng.randint(0, 5), rng.randint(0, 4)
+        else:
+            status, home_score, away_score = 'scheduled', None, None
+        rows.append((home, away, home_score, away_score, day.isoformat(), rng.choice(('13:00', '15:00', '17:30')),
+                     stadiums[home - 1], status))
+    return rows
+
+
+def news_rows(rng, n_news):
+    rows = []
+    for i in range(n_news):
+        created = datetime(2025, 8, 1) + timedelta(minutes=rng.randrange(SEASON_DAYS * 24 * 60))
+        content = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(80, 300)))
+        published = 1 if rng.random() < 0.9 else 0
+        rows.append((f"{rng.choice(CITIES)} {rng.choice(WORDS)} {rng.choice(WORDS)} #{i + 1}", content,
+                     f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice(CATEGORIES),
+                     f"/api/static/uploads/{rng.getrandbits(256):064x}.jpg", published,
+                     created.isoformat() if published else None, created.isoformat()))
+    return rows
+
+
+def generate(conn, teams=20, players=500, fixtures=380, news=50, seed=21):
+    # Expects an empty, migrated database; returns the row counts
+    if teams < 2:
+        raise ValueError('At least two teams are needed')
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        team_list = team_rows(rng, teams)
+        cursor.executemany("""
+            INSERT INTO teams (name, university, city, founded, coach, stadium, logo_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, team_list)
+        cursor.executemany("""
+            INSERT INTO players (name, team_id, position, jersey_number, age, nationality, height, weight, photo_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, player_rows(rng, players, teams))
+        cursor.executemany("""
+            INSERT INTO fixtures (home_team_id, away_team_id, home_score, away_score, date, time, venue, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, fixture_rows(rng, fixtures, [row[5] for row in team_list]))
+        cursor.executemany("""
+            INSERT INTO news (title, content, author, category, image_url, published, published_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, news_rows(rng, news))
+        populate_standings(cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return {'teams': teams, 'players': players, 'fixtures': fixtures, 'news': news}
+
+
+def generate_size(conn, size, seed=21):
+    if size not in SIZES:
+        raise ValueError(f"Unknown size; choose one of {', '.join(SIZES)}")
+    return generate(conn, *SIZES[size], seed=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic league generator')
+    parser.add_argument('database')
+    parser.add_argument('--size', choices=SIZES, default='small')
+    parser.add_argument('--seed', type=int, default=21)
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        parser.error(f'{args.database} already exists')
+    conn = connect(args.database, factory=sqlite3.Connection)
+    migrate(conn)
+    start = time.perf_counter()
+    counts = generate_size(conn, args.size, args.seed)
+    conn.close()
+    print(f"{args.database}: " + ', '.join(f'{count:,} {table}' for table, count in counts.items()) +
+          f" in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# Connection pool benchmark
+# Compares opening a fresh sqlite3 connection per request with borrowing a
+# tuned connection from the per-process pool, running the same small query.
+#
+# Usage (from backend/):
+#     python -m benchmarks.db_pool [--requests 5000] [--teams 200]
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from app.migrations import migrate
+from app.models import get_db_connection, get_pool, close_db_connection
+
+QUERY = "SELECT id, name, logo_url FROM teams WHERE id = ?"
+
+
+def connect_per_request(app, n_requests, n_teams):
+    for i in range(n_requests):
+        conn = sqlite3.connect(app.config['DATABASE'])
+        conn.row_factory = sqlite3.Row
+        conn.execute(QUERY, (i % n_teams + 1,)).fetchone()
+        conn.close()
+
+
+def pooled(app, n_requests, n_teams):
+    for i in range(n_requests):
+        with app.app_context():
+            conn = get_db_connection(app)
+            conn.execute(QUERY, (i % n_teams + 1,)).fetchone()
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Connection pool benchmark')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--teams', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['DATABASE'] = os.path.join(tmp, 'bench.db')
+        app.teardown_appcontext(close_db_connection)
+        conn = sqlite3.connect(app.config['DATABASE'])
+        migrate(conn)
+        conn.executemany("INSERT INTO teams (name) VALUES (?)",
+                         [(f"Team {i}",) for i in range(args.teams)])
+        conn.commit()
+        conn.close()
+
+        for label, func in (('connect per request', connect_per_request), ('pooled', pooled)):
+            start = time.perf_counter()
+            func(app, args.requests, args.teams)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>20}: {elapsed * 1e6 / args.requests:8.1f} us/request "
+                  f"({args.requests / elapsed:,.0f} req/s)")
+        print(f"{'pool stats':>20}: {get_pool(app).stats()}")
+        get_pool(app).close_all()
+
+
+if __name__ == '__main__':
+    main()
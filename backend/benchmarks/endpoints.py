@@ -0,0 +1,266 @@
+# Endpoint benchmark
+# Builds a synthetic league (see benchmarks.datagen) in a temporary database,
+# then drives every public endpoint through create_app's test client. For each
+# scenario it reports p50/p95/p99 latency, SQL statements per request and the
+# tracemalloc peak of one request. Results can be written as JSON and compared
+# against an earlier run.
+#
+# Usage (from backend/):
+#     python -m benchmarks.endpoints [--size small|medium|large] [--requests 50] [--cache none] [--profile]
+#                                    [--scenarios teams players ...] [--output results.json]
+#                                    [--baseline old.json] [--threshold 0.10] [--min-delta-ms 0.5]
+#                                    [--fail-on-regression]
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.db_pool import connect
+from app.models import get_pool
+from benchmarks.datagen import SIZES, generate_size
+
+# name: (path template, needs a login). Templates are filled per request from
+# the generated ids, cycling through them so requests do not all hit one row.
+SCENARIOS = {
+    'health': ('/health', False),
+    'teams': ('/api/teams', False),
+    'team': ('/api/teams/{team}', False),
+    'team_players': ('/api/teams/{team}/players', False),
+    'players': ('/api/players', False),
+    'player': ('/api/players/{player}', False),
+    'fixtures': ('/api/fixtures', False),
+    'fixtures_page': ('/api/fixtures?limit=50', False),
+    'fixtures_team': ('/api/fixtures?team_id={team}', False),
+    'fixtures_completed': ('/api/fixtures?status=completed&limit=50', False),
+    'fixture': ('/api/fixtures/{fixture}', False),
+    'news': ('/api/news', False),
+    'news_item': ('/api/news/{news}', False),
+    'league_table': ('/api/league_table', False),
+    'home': ('/api/home', False),
+    'stats': ('/api/stats', True),
+    'changes': ('/api/changes?since=0&limit=1000', False),
+    'search': ('/api/search?q={word}', False),
+    'export_players': ('/api/export/players', False),
+    'export_fixtures_csv': ('/api/export/fixtures?format=csv', False),
+}
+SEARCH_WORDS = ('lagos', 'eagles', 'okafor', 'derby', 'chinedu', 'stadium', 'abuja lions', 'goal')
+
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an ascending list
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def trace_queries(app):
+    # Counts statements on every pooled connection handed out from now on;
+    # statements run by triggers are reported as comments and skipped
+    counter = {'queries': 0}
+    pool = get_pool(app)
+    acquire = pool.acquire
+
+    def count(statement):
+        if not statement.lstrip().startswith('--'):
+            counter['queries'] += 1
+
+    def traced_acquire(*args, **kwargs):
+        conn = acquire(*args, **kwargs)
+        conn.set_trace_callback(count)
+        return conn
+
+    pool.acquire = traced_acquire
+    return counter
+
+
+def load_ids(database):
+    conn = connect(database, factory=sqlite3.Connection)
+    ids = {}
+    for key, query in (('team', "SELECT id FROM teams ORDER BY id"),
+                       ('player', "SELECT id FROM players ORDER BY id"),
+                       ('fixture', "SELECT id FROM fixtures ORDER BY id"),
+                       ('news', "SELECT id FROM news WHERE published = 1 ORDER BY id")):
+        ids[key] = [row[0] for row in conn.execute(query)]
+    conn.close()
+    ids['word'] = list(SEARCH_WORDS)
+    return ids
+
+
+def paths(template, ids, count):
+    # Deterministic walk through the ids with a stride, so consecutive
+    # requests land on different rows
+    for i in range(count):
+        values = {}
+        for key, items in ids.items():
+            values[key] = items[i * 7919 % len(items)] if items else 0
+        yield template.format(**values)
+
+
+def request(client, path):
+    start = time.perf_counter()
+    response = client.get(path)
+    body = response.get_data()
+    elapsed = time.perf_counter() - start
+    return response, len(body), elapsed
+
+
+def run_scenario(client, counter, template, ids, n_requests, warmup):
+    for path in paths(template, ids, warmup):
+        request(client, path)
+
+    timings = []
+    statuses = set()
+    repeated = set()
+    size = 0
+    counter['queries'] = 0
+    for path in paths(template, ids, n_requests):
+        response, size, elapsed = request(client, path)
+        statuses.add(response.status_code)
+        # Only present with --profile
+        repeated.update(response.headers.getlist('X-SQL-Repeated'))
+        timings.append(elapsed * 1000)
+    queries = counter['queries'] / n_requests
+
+    # Memory is measured on a separate request so tracing does not skew timings
+    path = next(paths(template, ids, 1))
+    tracemalloc.start()
+    request(client, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'path': template,
+        'requests': n_requests,
+        'status': sorted(statuses),
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'queries_per_request': round(queries, 2),
+        'peak_kib': round(peak / 1024, 1),
+        'response_bytes': size,
+        'repeated_statements': sorted(repeated),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    # Returns the scenarios whose p95 latency grew by more than `threshold`
+    # (and by at least `min_delta_ms`, so sub-millisecond jitter is not
+    # reported) or that now run more statements per request
+    regressions = []
+    print(f"\n{'scenario':>22} {'p50':>9} {'p95':>9} {'queries':>9}  vs baseline")
+    for name, result in results['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old is None:
+            print(f"{name:>22}   (not in baseline)")
+            continue
+        p50 = result['p50_ms'] / old['p50_ms'] - 1 if old['p50_ms'] else 0
+        p95 = result['p95_ms'] / old['p95_ms'] - 1 if old['p95_ms'] else 0
+        queries = result['queries_per_request'] - old['queries_per_request']
+        flag = ''
+        if p95 > threshold and result['p95_ms'] - old['p95_ms'] >= min_delta_ms or queries > 0:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:>22} {p50:>+9.1%} {p95:>+9.1%} {queries:>+9.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Endpoint benchmark')
+    parser.add_argument('--size', choices=SIZES, default='small')
+    parser.add_argument('--seed', type=int, default=21)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--cache', choices=('none', 'memory', 'shared'), default='none',
+                        help='RESPONSE_CACHE backend; none measures the handlers themselves')
+    parser.add_argument('--profile', action='store_true',
+                        help='enable the SQL profiler and list repeated statements (adds overhead)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='p95 growth counted as a regression (default 0.10 = 10%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help='smallest p95 growth in ms counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull:
+        database = os.path.join(tmp, 'bench.db')
+        app = create_app({
+            'DATABASE': database,
+            'UPLOAD_FOLDER': os.path.join(tmp, 'uploads'),
+            'RESPONSE_CACHE': args.cache,
+            'RESPONSE_CACHE_PATH': os.path.join(tmp, 'response_cache.db'),
+            'SQL_PROFILER': args.profile,
+            # Logging still runs (its cost is part of each request) but not to the terminal
+            'LOG_STREAM': devnull,
+        })
+        conn = connect(database, factory=sqlite3.Connection)
+        start = time.perf_counter()
+        counts = generate_size(conn, args.size, args.seed)
+        conn.close()
+        print(f"{args.size}: " + ', '.join(f'{count:,} {table}' for table, count in counts.items()) +
+              f" generated in {time.perf_counter() - start:.1f}s")
+
+        ids = load_ids(database)
+        counter = trace_queries(app)
+        client = app.test_client()
+        results = {
+            'meta': {
+                'size': args.size,
+                'seed': args.seed,
+                'counts': counts,
+                'requests': args.requests,
+                'cache': args.cache,
+                'profile': args.profile,
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            },
+            'scenarios': {},
+        }
+        print(f"\n{'scenario':>22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KiB':>10} {'status':>7}")
+        for name in args.scenarios:
+            template, login = SCENARIOS[name]
+            if login:
+                with client.session_transaction() as session:
+                    session['auth_token'] = 'benchmark'
+            result = run_scenario(client, counter, template, ids, args.requests, args.warmup)
+            if login:
+                with client.session_transaction() as session:
+                    session.clear()
+            results['scenarios'][name] = result
+            print(f"{name:>22} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                  f"{result['queries_per_request']:>8.2f} {result['peak_kib']:>10,.0f} "
+                  f"{','.join(map(str, result['status'])):>7}")
+            for statement in result['repeated_statements']:
+                print(f"{'':>22} repeated: {statement}")
+        get_pool(app).close_all()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('size') != args.size:
+            print(f"\nWarning: baseline was run at size {baseline.get('meta', {}).get('size')}")
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# League table benchmark
+# Compares the old per-team aggregate query with the single-pass standings
+# engine on synthetic leagues of 20, 200 and 2,000 teams.
+#
+# Usage (from backend/):
+#     python -m benchmarks.league_table [--sizes 20 200 2000] [--matches 38] [--skip-legacy]
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.migrations import migrate
+from app.standings import compute_standings, sort_table
+
+LEGACY_QUERY = """
+    SELECT
+        SUM(CASE
+            WHEN home_team_id = ? AND home_score > away_score THEN 3
+            WHEN away_team_id = ? AND away_score > home_score THEN 3
+            WHEN (home_team_id = ? OR away_team_id = ?) AND home_score = away_score THEN 1
+            ELSE 0
+        END) as points,
+        SUM(CASE
+            WHEN home_team_id = ? THEN home_score
+            WHEN away_team_id = ? THEN away_score
+            ELSE 0
+        END) as goals_for,
+        SUM(CASE
+            WHEN home_team_id = ? THEN away_score
+            WHEN away_team_id = ? THEN home_score
+            ELSE 0
+        END) as goals_against,
+        COUNT(CASE WHEN (home_team_id = ? OR away_team_id = ?) AND status = 'completed' THEN 1 END) as matches_played
+    FROM fixtures
+    WHERE status = 'completed' AND (home_team_id = ? OR away_team_id = ?)
+"""
+
+
+def build_league(n_teams, matches_per_team, seed=42):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(':memory:')
+    migrate(conn)
+    conn.executemany(
+        "INSERT INTO teams (id, name, logo_url) VALUES (?, ?, ?)",
+        [(i, f"Team {i}", None) for i in range(1, n_teams + 1)]
+    )
+    fixtures = []
+    for _ in range(n_teams * matches_per_team // 2):
+        home, away = rng.sample(range(1, n_teams + 1), 2)
+        fixtures.append((home, away, rng.randint(0, 4), rng.randint(0, 4), '2025-01-01', 'completed'))
+    conn.executemany("""
+        INSERT INTO fixtures (home_team_id, away_team_id, home_score, away_score, date, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, fixtures)
+    conn.commit()
+    return conn
+
+
+def legacy_standings(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, name, logo_url FROM teams")
+    table = []
+    for team_id, team_name, logo_url in cursor.fetchall():
+        cursor.execute(LEGACY_QUERY, (team_id,) * 12)
+        result = cursor.fetchone()
+        goals_for = result[1] or 0
+        goals_against = result[2] or 0
+        table.append({
+            'team_id': team_id,
+            'team_name': team_name,
+            'logo_url': logo_url,
+            'matches_played': result[3] or 0,
+            'points': result[0] or 0,
+            'goals_for': goals_for,
+            'goals_against': goals_against,
+            'goal_difference': goals_for - goals_against
+        })
+    return sort_table(table)
+
+
+def time_call(func, conn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(conn)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='League table benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 200, 2000])
+    parser.add_argument('--matches', type=int, default=38, help='matches played per team')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'fixtures':>9} {'legacy ms':>10} {'single-pass ms':>15}")
+    for n_teams in args.sizes:
+        conn = build_league(n_teams, args.matches)
+        n_fixtures = conn.execute("SELECT COUNT(*) FROM fixtures").fetchone()[0]
+        new_ms = time_call(compute_standings, conn, args.repeat)
+        if args.skip_legacy:
+            legacy = '-'
+        else:
+            legacy = f"{time_call(legacy_standings, conn, max(1, args.repeat // 2)):.2f}"
+        print(f"{n_teams:>6} {n_fixtures:>9} {legacy:>10} {new_ms:>15.2f}")
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# Serialization benchmark
+# Encodes the /api/players result for a synthetic roster (50,000 players by
+# default) three ways: the old hand-written dict per row with stdlib json, the
+# generated row mapper with stdlib json, and the row mapper with orjson.
+# Reports rows/sec and the tracemalloc peak of each run.
+#
+# Usage (from backend/):
+#     python -m benchmarks.serialization [--players 50000] [--teams 200] [--repeat 5]
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.images import thumbnail_url
+from app.migrations import migrate
+from app.routes.players import player_list_row
+from app.serialization import map_rows, orjson
+
+QUERY = """
+    SELECT p.id, p.name, p.team_id, t.name as team_name, p.position, p.jersey_number, p.age, p.nationality, p.height, p.weight, p.photo_url
+    FROM players p
+    LEFT JOIN teams t ON p.team_id = t.id
+    ORDER BY t.name, p.name
+"""
+POSITIONS = ('Goalkeeper', 'Defender', 'Midfielder', 'Forward')
+
+
+def legacy(rows):
+    players_list = []
+    for player in rows:
+        players_list.append({
+            'id': player[0],
+            'name': player[1],
+            'team_id': player[2],
+            'team_name': player[3],
+            'position': player[4],
+            'jersey_number': player[5],
+            'age': player[6],
+            'nationality': player[7],
+            'height': player[8],
+            'weight': player[9],
+            'photo_url': player[10],
+            'photo_thumb_url': thumbnail_url(player[10])
+        })
+    return json.dumps(players_list, sort_keys=True).encode()
+
+
+def mapper_stdlib(rows):
+    return json.dumps(map_rows(player_list_row, rows), sort_keys=True).encode()
+
+
+def mapper_orjson(rows):
+    return orjson.dumps(map_rows(player_list_row, rows), option=orjson.OPT_SORT_KEYS)
+
+
+def populate(conn, n_players, n_teams):
+    rng = random.Random(15)
+    migrate(conn)
+    conn.executemany("INSERT INTO teams (name, logo_url) VALUES (?, ?)",
+                     [(f"Team {i:04d}", f"/api/static/uploads/{i:064x}.png") for i in range(n_teams)])
+    conn.executemany("""
+        INSERT INTO players (name, team_id, position, jersey_number, age, nationality, height, weight, photo_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(f"Player {i}", rng.randint(1, n_teams), rng.choice(POSITIONS), rng.randint(1, 99),
+           rng.randint(17, 30), 'Nigeria', round(rng.uniform(1.6, 2.0), 2), round(rng.uniform(60, 95), 1),
+           f"/api/static/uploads/{i:064x}.jpg") for i in range(n_players)])
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serialization benchmark')
+    parser.add_argument('--players', type=int, default=50000)
+    parser.add_argument('--teams', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        populate(conn, args.players, args.teams)
+        rows = conn.execute(QUERY).fetchall()
+        conn.close()
+
+    encoders = [('hand-written + json', legacy), ('row mapper + json', mapper_stdlib)]
+    if orjson is not None:
+        encoders.append(('row mapper + orjson', mapper_orjson))
+    else:
+        print("orjson not installed; skipping the orjson run")
+
+    expected = json.loads(legacy(rows))
+    for label, encode in encoders:
+        assert json.loads(encode(rows)) == expected, label
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            body = encode(rows)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        encode(rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:>20}: {len(rows) / best:12,.0f} rows/s  {best * 1000:8.1f} ms  "
+              f"peak {peak / 1024 / 1024:7.1f} MiB  body {len(body) / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
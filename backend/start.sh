@@ -8,9 +8,12 @@ export FLASK_APP=wsgi.py
 export FLASK_ENV=production
 
 # Start Gunicorn with proper configuration
+# gevent workers let each process hold thousands of idle /api/live streams
 exec gunicorn wsgi:app \
     --bind 0.0.0.0:$PORT \
     --workers 2 \
+    --worker-class ${GUNICORN_WORKER_CLASS:-gevent} \
+    --worker-connections 2000 \
     --timeout 120 \
     --access-logfile - \
     --error-logfile - \
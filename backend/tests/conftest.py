@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from app import create_app
+from app.models import get_db_connection
+
+
+@pytest.fixture
+def app_config():
+    # Extra config for one test: @pytest.mark.parametrize('app_config', [{...}])
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, app_config):
+    uploads = tmp_path / 'uploads'
+    uploads.mkdir()
+    app = create_app({
+        'TESTING': True,
+        'DATABASE': str(tmp_path / 'league.db'),
+        'UPLOAD_FOLDER': str(uploads),
+        'RESPONSE_CACHE_PATH': str(tmp_path / 'response_cache.db'),
+        'METRICS_DIR': str(tmp_path / 'metrics'),
+        'LOG_STREAM': open(os.devnull, 'w'),
+        **app_config
+    })
+    yield app
+    pool = app.extensions.get('db_pool')
+    if pool is not None:
+        pool.close_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(client):
+    response = client.post('/api/login', json={'username': 'admin', 'password': 'admin123'})
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+def db(app):
+    with app.app_context():
+        yield get_db_connection(app)
+
@@ -0,0 +1,46 @@
+def test_conditional_get_and_invalidation(admin):
+    first = admin.get('/api/teams')
+    assert first.status_code == 200 and first.headers['X-Cache'] == 'MISS'
+    etag = first.headers['ETag']
+    assert admin.get('/api/teams').headers['X-Cache'] == 'HIT'
+    assert admin.get('/api/teams', headers={'If-None-Match': etag}).status_code == 304
+
+    assert admin.post('/api/teams', json={'name': 'Alpha'}).status_code == 201
+    changed = admin.get('/api/teams', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert [team['name'] for team in changed.get_json()] == ['Alpha']
+
+
+def test_player_writes_invalidate_team_list(admin):
+    team_id = admin.post('/api/teams', json={'name': 'Alpha'}).get_json()['id']
+    assert admin.get('/api/teams').get_json()[0]['player_count'] == 0
+    assert admin.post('/api/players', json={'name': 'Ade', 'team_id': team_id}).status_code in (200, 201)
+    assert admin.get('/api/teams').get_json()[0]['player_count'] == 1
+
+
+def test_star_matches_only_existing_resources(client):
+    assert client.get('/api/teams/999', headers={'If-None-Match': '*'}).status_code == 404
+    assert client.get('/api/teams', headers={'If-None-Match': '*'}).status_code == 304
+    # Same again once the list is served from the cache
+    assert client.get('/api/teams', headers={'If-None-Match': '*'}).status_code == 304
+    assert client.get('/api/export/teams', headers={'If-None-Match': '*'}).status_code == 404
+    assert client.get('/api/export/players', headers={'If-None-Match': '*'}).status_code == 304
+
+
+def test_repair_commands_invalidate_cached_responses(app, admin, db):
+    home = admin.post('/api/teams', json={'name': 'Alpha'}).get_json()['id']
+    away = admin.post('/api/teams', json={'name': 'Bravo'}).get_json()['id']
+    fixture = admin.post('/api/fixtures', json={'home_team_id': home, 'away_team_id': away,
+                                                'date': '2025-03-01'}).get_json()['id']
+    admin.post(f'/api/fixtures/{fixture}/result', json={'home_score': 1, 'away_score': 0})
+    db.execute("UPDATE standings SET points = 99")
+    db.execute("INSERT INTO teams_fts (teams_fts) VALUES ('delete-all')")
+    db.commit()
+    assert admin.get('/api/league_table').get_json()[0]['points'] == 99
+    assert admin.get('/api/search?q=alpha').get_json()['results'] == []
+
+    runner = app.test_cli_runner()
+    assert runner.invoke(args=['rebuild-standings']).exit_code == 0
+    assert runner.invoke(args=['rebuild-search']).exit_code == 0
+    assert [row['points'] for row in admin.get('/api/league_table').get_json()] == [3, 0]
+    assert [row['title'] for row in admin.get('/api/search?q=alpha').get_json()['results']] == ['Alpha']
@@ -0,0 +1,46 @@
+from app.routes.changes import log_versions
+
+
+def sync(client, since, limit=1000):
+    response = client.get(f'/api/changes?since={since}&limit={limit}')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_delta_sync_reports_latest_state(admin):
+    start = sync(admin, 0)['version']
+    team_id = admin.post('/api/teams', json={'name': 'Alpha'}).get_json()['id']
+    other_id = admin.post('/api/teams', json={'name': 'Bravo'}).get_json()['id']
+    admin.put(f'/api/teams/{team_id}', json={'name': 'Alpha FC'})
+    admin.delete(f'/api/teams/{other_id}')
+
+    delta = sync(admin, start)
+    assert not delta['has_more']
+    changes = dict((change['id'], change) for change in delta['changes'] if change['table'] == 'teams')
+    assert changes[team_id]['op'] in ('insert', 'update') and changes[team_id]['data']['name'] == 'Alpha FC'
+    assert changes[other_id]['op'] == 'delete' and changes[other_id]['data'] is None
+    assert sync(admin, delta['version'])['changes'] == []
+
+
+def test_paging_with_has_more(admin):
+    start = sync(admin, 0)['version']
+    for name in ('Alpha', 'Bravo', 'Charlie'):
+        admin.post('/api/teams', json={'name': name})
+    first = sync(admin, start, limit=2)
+    assert first['has_more'] and len(first['changes']) == 2
+    rest = sync(admin, first['version'], limit=2)
+    assert not rest['has_more'] and len(rest['changes']) == 1
+
+
+def test_pruned_log_answers_gone(app, admin, db):
+    for name in ('Alpha', 'Bravo'):
+        admin.post('/api/teams', json={'name': name})
+    current = sync(admin, 0)['version']
+    result = app.test_cli_runner().invoke(args=['prune-changes', '--keep-days', '-1'])
+    assert result.exit_code == 0
+    assert log_versions(db.cursor()) == (current + 1, current)
+
+    response = admin.get('/api/changes?since=0')
+    assert response.status_code == 410 and response.get_json()['version'] == current
+    assert sync(admin, current) == {'version': current, 'has_more': False, 'changes': []}
+    assert admin.get(f'/api/changes?since={current + 5}').status_code == 410
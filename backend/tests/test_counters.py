@@ -0,0 +1,41 @@
+from app.counters import counter_drift, read_counters
+
+
+def test_counters_follow_route_writes(admin, db):
+    alpha = admin.post('/api/teams', json={'name': 'Alpha'}).get_json()['id']
+    bravo = admin.post('/api/teams', json={'name': 'Bravo'}).get_json()['id']
+    player = admin.post('/api/players', json={'name': 'Ade', 'team_id': alpha}).get_json()['id']
+    admin.post('/api/players', json={'name': 'Bola', 'team_id': alpha})
+    fixture = admin.post('/api/fixtures', json={'home_team_id': alpha, 'away_team_id': bravo,
+                                                'date': '2025-03-01'}).get_json()['id']
+    admin.post('/api/fixtures', json={'home_team_id': bravo, 'away_team_id': alpha, 'date': '2025-03-08'})
+    admin.post(f'/api/fixtures/{fixture}/result', json={'home_score': 1, 'away_score': 0})
+    admin.post('/api/news', json={'title': 'Kickoff', 'content': 'Season starts', 'published': True})
+    admin.post('/api/news', json={'title': 'Draft', 'content': 'Not yet', 'published': False})
+    admin.put(f'/api/players/{player}', json={'name': 'Ade', 'team_id': bravo})
+
+    assert admin.get('/api/stats').get_json() == {
+        'total_teams': 2, 'total_players': 2, 'total_fixtures': 2, 'completed_matches': 1,
+        'upcoming_matches': 1, 'total_news': 2, 'published_news': 1,
+    }
+    squads = dict((team['id'], team['player_count']) for team in admin.get('/api/teams').get_json())
+    assert squads == {alpha: 1, bravo: 1}
+    assert counter_drift(db) == []
+
+    admin.delete(f'/api/fixtures/{fixture}')
+    admin.delete(f'/api/players/{player}')
+    assert read_counters(db)['completed'] == 0 and read_counters(db)['players'] == 1
+    assert counter_drift(db) == []
+
+
+def test_check_counters_command(app, db):
+    db.execute("INSERT INTO teams (name) VALUES ('Alpha')")
+    db.execute("UPDATE league_counters SET teams = 5")
+    db.commit()
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['check-counters'])
+    assert result.exit_code == 1 and 'teams: stored 5, actual 1' in result.output
+    result = runner.invoke(args=['check-counters', '--fix'])
+    assert result.exit_code == 0 and 'Fixed 1 counters' in result.output
+    result = runner.invoke(args=['check-counters'])
+    assert result.exit_code == 0 and 'All counters match' in result.output
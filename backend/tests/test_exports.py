@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.routes.exports import BATCH_SIZE
+
+PLAYERS = 2 * BATCH_SIZE + 1
+
+
+@pytest.fixture
+def players(db):
+    db.execute("INSERT INTO teams (name) VALUES ('Alpha')")
+    db.executemany("INSERT INTO players (name, team_id, jersey_number) VALUES (?, 1, ?)",
+                   [(f'Player {number}', number) for number in range(PLAYERS)])
+    db.commit()
+
+
+def test_ndjson_export_streams_in_batches(client, players):
+    response = client.get('/api/export/players', buffered=False)
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="players.ndjson"'
+    # One chunk per fetchmany batch
+    chunks = list(response.response)
+    response.close()
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+    assert len(rows) == PLAYERS
+    assert rows[0] == {'id': 1, 'name': 'Player 0', 'team_id': 1, 'team_name': 'Alpha', 'position': None,
+                       'jersey_number': 0, 'age': None, 'nationality': None, 'height': None,
+                       'weight': None, 'photo_url': None}
+    assert [row['id'] for row in rows] == list(range(1, PLAYERS + 1))
+
+
+def test_csv_export(client, players):
+    response = client.get('/api/export/players?format=csv')
+    assert response.status_code == 200 and response.mimetype == 'text/csv'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == ['id', 'name', 'team_id', 'team_name', 'position', 'jersey_number', 'age',
+                       'nationality', 'height', 'weight', 'photo_url']
+    assert len(rows) == PLAYERS + 1 and rows[1][:4] == ['1', 'Player 0', '1', 'Alpha']
+
+
+def test_empty_csv_export_has_a_header(client):
+    response = client.get('/api/export/news?format=csv')
+    assert response.get_data(as_text=True) == 'id,title,content,author,category,image_url,created_at\r\n'
+
+
+def test_conditional_export(admin, players):
+    # Each format is its own representation with its own ETag
+    csv_etag = admin.get('/api/export/players?format=csv').headers['ETag']
+    etag = admin.get('/api/export/players').headers['ETag']
+    assert etag != csv_etag
+    for url, tag in (('/api/export/players', etag), ('/api/export/players?format=csv', csv_etag)):
+        response = admin.get(url, headers={'If-None-Match': tag})
+        assert response.status_code == 304 and not response.data
+    admin.post('/api/players', json={'name': 'Newcomer', 'team_id': 1})
+    response = admin.get('/api/export/players', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+    assert len(response.get_data(as_text=True).splitlines()) == PLAYERS + 1
+
+
+def test_bad_export_arguments(client):
+    assert client.get('/api/export/sessions').status_code == 404
+    assert client.get('/api/export/players?format=xml').status_code == 400
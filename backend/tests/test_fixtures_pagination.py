@@ -0,0 +1,46 @@
+import pytest
+
+
+@pytest.fixture
+def fixtures(db):
+    db.executemany("INSERT INTO teams (name) VALUES (?)", [('Alpha',), ('Bravo',)])
+    dates = ['2025-03-01', None, '2025-03-01', '2025-02-01', None, '2025-04-01', '2025-02-01']
+    db.executemany(
+        "INSERT INTO fixtures (home_team_id, away_team_id, date, status) VALUES (1, 2, ?, ?)",
+        [(date, 'completed' if index % 2 else 'scheduled') for index, date in enumerate(dates)])
+    db.commit()
+    return [row[0] for row in db.execute("SELECT id FROM fixtures ORDER BY COALESCE(date, ''), id")]
+
+
+def walk(client, query):
+    ids, cursor = [], None
+    for _ in range(20):
+        url = f'/api/fixtures?limit=2&{query}' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200
+        ids.extend(fixture['id'] for fixture in response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            return ids
+    pytest.fail('pagination did not finish')
+
+
+def test_pages_cover_every_fixture_once(client, fixtures):
+    assert walk(client, 'order=asc') == fixtures
+    assert walk(client, 'order=desc') == fixtures[::-1]
+
+
+def test_pages_with_filters(client, db, fixtures):
+    completed = [row[0] for row in db.execute(
+        "SELECT id FROM fixtures WHERE status = 'completed' ORDER BY COALESCE(date, '') DESC, id DESC")]
+    assert walk(client, 'status=completed') == completed
+    assert walk(client, 'date_from=2025-02-01&date_to=2025-03-01&order=asc') == [
+        row[0] for row in db.execute(
+            "SELECT id FROM fixtures WHERE date BETWEEN '2025-02-01' AND '2025-03-01' ORDER BY date, id")]
+
+
+def test_rejects_bad_arguments(client):
+    assert client.get('/api/fixtures?cursor=not-a-cursor').status_code == 400
+    assert client.get('/api/fixtures?limit=0').status_code == 400
+    assert client.get('/api/fixtures?team_id=abc').status_code == 400
+    assert client.get('/api/fixtures?date_from=03/01/2025').status_code == 400
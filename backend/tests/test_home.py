@@ -0,0 +1,62 @@
+import pytest
+
+from app.routes.misc import HOME_MAX_ITEMS, utc_today
+
+
+def create_team(client, name):
+    return client.post('/api/teams', json={'name': name}).get_json()['id']
+
+
+def create_fixture(client, home, away, date):
+    return client.post('/api/fixtures', json={'home_team_id': home, 'away_team_id': away,
+                                              'date': date}).get_json()['id']
+
+
+def test_upcoming_fixtures_skip_overdue_and_undated(admin, db):
+    alpha, bravo = create_team(admin, 'Alpha'), create_team(admin, 'Bravo')
+    create_fixture(admin, alpha, bravo, '2000-01-01')
+    later = create_fixture(admin, bravo, alpha, '2999-06-01')
+    sooner = create_fixture(admin, alpha, bravo, '2999-01-01')
+    today = create_fixture(admin, bravo, alpha, utc_today())
+    undated = create_fixture(admin, alpha, bravo, '2999-02-01')
+    db.execute("UPDATE fixtures SET date = NULL WHERE id = ?", (undated,))
+    db.commit()
+    fixtures = admin.get('/api/home').get_json()['upcoming_fixtures']
+    assert [fixture['id'] for fixture in fixtures] == [today, sooner, later]
+
+
+def test_section_limits(admin):
+    alpha, bravo = create_team(admin, 'Alpha'), create_team(admin, 'Bravo')
+    for day in range(1, 8):
+        create_fixture(admin, alpha, bravo, f'2999-01-0{day}')
+    for number in range(8):
+        admin.post('/api/news', json={'title': f'Story {number}', 'content': 'Text', 'published': True})
+    bundle = admin.get('/api/home').get_json()
+    assert (len(bundle['news']), len(bundle['upcoming_fixtures']), len(bundle['league_table'])) == (6, 5, 2)
+    bundle = admin.get('/api/home?news=2&fixtures=0&table=1').get_json()
+    assert (len(bundle['news']), len(bundle['upcoming_fixtures']), len(bundle['league_table'])) == (2, 0, 1)
+
+
+@pytest.mark.parametrize('query', [f'news={HOME_MAX_ITEMS + 1}', 'fixtures=-1', 'table=ten'])
+def test_out_of_range_limits(client, query):
+    response = client.get(f'/api/home?{query}')
+    assert response.status_code == 400 and 'must be between 0' in response.get_json()['error']
+
+
+def test_bundle_invalidated_by_writes(admin):
+    etag = admin.get('/api/home').headers['ETag']
+    assert admin.get('/api/home', headers={'If-None-Match': etag}).status_code == 304
+    alpha = create_team(admin, 'Alpha')
+    response = admin.get('/api/home', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and [row['team_name'] for row in response.get_json()['league_table']] == ['Alpha']
+
+    bravo = create_team(admin, 'Bravo')
+    etag = admin.get('/api/home').headers['ETag']
+    create_fixture(admin, alpha, bravo, '2999-01-01')
+    response = admin.get('/api/home', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and len(response.get_json()['upcoming_fixtures']) == 1
+    etag = response.headers['ETag']
+
+    admin.post('/api/news', json={'title': 'Kickoff', 'content': 'Season starts', 'published': True})
+    response = admin.get('/api/home', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and [story['title'] for story in response.get_json()['news']] == ['Kickoff']
@@ -0,0 +1,68 @@
+import io
+
+
+def import_file(client, dataset, data, name, query=''):
+    return client.post(f'/api/import/{dataset}{query}', data={'file': (io.BytesIO(data), name)},
+                       content_type='multipart/form-data')
+
+
+def test_csv_import_resolves_team_names(admin, db):
+    response = import_file(admin, 'teams', b'name,city\nAlpha,Lagos\nBravo,Ibadan\n', 'teams.csv')
+    assert response.status_code == 201 and response.get_json()['imported'] == 2
+    response = admin.post('/api/import/players', json={'rows': [
+        {'name': 'Ade', 'team': 'alpha', 'jersey_number': '9'},
+        {'name': 'Bola', 'team': 'Bravo'},
+    ]})
+    assert response.status_code == 201
+    rows = [tuple(row) for row in db.execute("SELECT p.name, t.name, p.jersey_number FROM players p JOIN teams t ON t.id = p.team_id "
+                      "ORDER BY p.name")]
+    assert rows == [('Ade', 'Alpha', 9), ('Bola', 'Bravo', None)]
+
+
+def test_invalid_rows_reject_the_whole_batch(admin, db):
+    data = b'home_team_id,away_team_id,date\n1,2,2025-03-01\n1,1,not-a-date\n'
+    admin.post('/api/import/teams', json=[{'name': 'Alpha'}, {'name': 'Bravo'}])
+    response = import_file(admin, 'fixtures', data, 'fixtures.csv')
+    assert response.status_code == 422 and response.get_json()['imported'] == 0
+    assert db.execute("SELECT COUNT(*) FROM fixtures").fetchone()[0] == 0
+
+    response = import_file(admin, 'fixtures', data, 'fixtures.csv', '?skip_invalid=1')
+    assert response.status_code == 201 and response.get_json()['imported'] == 1
+
+
+def test_team_routes_and_import_share_the_duplicate_name_rule(admin, db):
+    alpha = admin.post('/api/teams', json={'name': 'Alpha'}).get_json()['id']
+    bravo = admin.post('/api/teams', json={'name': 'Bravo'}).get_json()['id']
+    created = admin.post('/api/teams', json={'name': ' alpha '})
+    assert created.status_code == 400 and created.get_json()['error'] == "name: team ' alpha ' already exists"
+    renamed = admin.put(f'/api/teams/{bravo}', json={'name': 'ALPHA'})
+    assert renamed.status_code == 400 and renamed.get_json()['error'] == "name: team 'ALPHA' already exists"
+    assert admin.put(f'/api/teams/{alpha}', json={'name': 'Alpha', 'city': 'Lagos'}).status_code == 200
+    imported = admin.post('/api/import/teams', json=[{'name': 'ALPHA'}]).get_json()
+    assert imported['errors'] == [{'row': 1, 'errors': ["name: team 'ALPHA' already exists"]}]
+    assert db.execute("SELECT COUNT(*) FROM teams").fetchone()[0] == 2
+
+
+def test_unreadable_files_are_client_errors(admin):
+    response = import_file(admin, 'teams', 'name\nCafé\n'.encode('latin-1'), 'teams.csv')
+    assert response.status_code == 400 and 'offset 8' in response.get_json()['error']
+    # Longer than csv.field_size_limit()
+    response = import_file(admin, 'teams', b'name\n' + b'x' * 200000 + b'\n', 'teams.csv')
+    assert response.status_code == 400 and 'row 1' in response.get_json()['error']
+    response = admin.post('/api/import/teams', data=b'{"rows": [', content_type='application/json')
+    assert response.status_code == 400
+    assert import_file(admin, 'teams', b'name\n', 'teams.xml').status_code == 400
+
+
+def test_import_command(app, db, tmp_path):
+    good = tmp_path / 'teams.csv'
+    good.write_text('name,city\nAlpha,Lagos\n')
+    bad = tmp_path / 'more.csv'
+    bad.write_text('name,city\nAlpha,Ibadan\nBravo,Ibadan\n')
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['import-data', 'teams', str(good)])
+    assert result.exit_code == 0 and 'Imported 1 of 1' in result.output
+    result = runner.invoke(args=['import-data', 'teams', str(bad)])
+    assert result.exit_code == 1 and 'Imported 0 of 2' in result.output
+    result = runner.invoke(args=['import-data', 'teams', str(bad), '--skip-invalid'])
+    assert result.exit_code == 0 and 'Imported 1 of 2' in result.output
@@ -0,0 +1,15 @@
+from app.migrations import MIGRATIONS, migrate, schema_version, unindexed_queries
+
+
+def test_migrated_to_latest_version(db):
+    assert schema_version(db) == MIGRATIONS[-1][0]
+    assert migrate(db) == []
+
+
+def test_hot_queries_use_indexes(db):
+    assert unindexed_queries(db) == {}
+
+
+def test_check_indexes_command(app, db):
+    result = app.test_cli_runner().invoke(args=['check-indexes'])
+    assert result.exit_code == 0 and 'All hot queries use an index' in result.output
@@ -0,0 +1,83 @@
+import itertools
+import time
+
+from app.live import LiveBroker, SQLiteChangeSource, Subscriber, event_stream, format_event, get_broker
+
+
+class FlakySource(SQLiteChangeSource):
+    # Fails on the first connect and the first poll with errors that are not sqlite3.Error
+    def __init__(self, database):
+        super().__init__(database)
+        self.failures = {'connect': 1, 'poll': 1}
+
+    def fail(self, step):
+        if self.failures[step]:
+            self.failures[step] -= 1
+            raise RuntimeError(f'{step} failed')
+
+    def connect(self):
+        self.fail('connect')
+        return super().connect()
+
+    def fixture_changes(self, conn, since, limit):
+        self.fail('poll')
+        return super().fixture_changes(conn, since, limit)
+
+
+def add_fixture(db):
+    db.executemany("INSERT INTO teams (name) VALUES (?)", [('Alpha',), ('Bravo',)])
+    cursor = db.execute("INSERT INTO fixtures (home_team_id, away_team_id, date, status) "
+                        "VALUES (1, 2, '2025-03-01', 'scheduled')")
+    db.commit()
+    return cursor.lastrowid
+
+
+def test_broker_survives_unexpected_errors(app, db):
+    source = FlakySource(app.config['DATABASE'])
+    broker = LiveBroker(source, poll_interval=0.01)
+    subscriber = broker.subscribe()
+    # Write only once both failures have happened, so the event is published
+    # by a broker that has already recovered
+    deadline = time.monotonic() + 5
+    while any(source.failures.values()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    fixture_id = add_fixture(db)
+    version, message = subscriber.queue.get(timeout=5)
+    assert message.startswith(f'id: {version}\nevent: fixture\n') and f'"id":{fixture_id}' in message
+    assert broker._thread.is_alive()
+
+
+def test_stream_skips_live_events_covered_by_backlog():
+    subscriber = Subscriber(10)
+    subscriber.offer('old', 4)
+    subscriber.offer('new', 6)
+    broker = LiveBroker(None)
+    stream = event_stream(broker, subscriber, ['backlog'], 0.01, replayed_through=5)
+    assert list(itertools.islice(stream, 3)) == ['retry: 3000\n\n', 'backlog', 'new']
+    stream.close()
+
+
+def test_resume_replays_missed_fixture_changes(app, db, client):
+    app.config['LIVE_HEARTBEAT'] = 0.01
+    before = db.execute("SELECT COALESCE(MAX(version), 0) FROM change_log").fetchone()[0]
+    fixture_id = add_fixture(db)
+    response = client.get('/api/live', headers={'Last-Event-ID': str(before)}, buffered=False)
+    assert response.status_code == 200
+    chunks = itertools.islice(response.response, 3)
+    assert next(chunks) == b'retry: 3000\n\n'
+    assert f'"id":{fixture_id}'.encode() in next(chunks)
+    assert b'event: standings' in next(chunks)
+    response.close()
+    assert get_broker(app).subscriber_count() == 0
+
+
+def test_rejects_bad_last_event_id(client):
+    assert client.get('/api/live', headers={'Last-Event-ID': 'abc'}).status_code == 400
+
+
+def test_format_event_wire_format():
+    assert format_event('fixture', {'id': 7, 'status': 'completed'}, event_id=12) == (
+        'id: 12\nevent: fixture\ndata: {"id":7,"status":"completed"}\n\n')
+    # Resync events carry no id, so the client's Last-Event-ID is left alone
+    assert format_event('resync', {'reason': 'client too slow'}) == (
+        'event: resync\ndata: {"reason":"client too slow"}\n\n')
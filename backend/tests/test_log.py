@@ -0,0 +1,112 @@
+import io
+import json
+import logging
+
+import pytest
+
+from app import log
+from app.log import REDACTED, RouteFilter, redact, redact_text, stop_logging
+
+
+@pytest.fixture
+def stream():
+    return io.StringIO()
+
+
+@pytest.fixture
+def log_routes():
+    # Override with @pytest.mark.parametrize('log_routes', [{...}])
+    return None
+
+
+@pytest.fixture
+def app_config(stream, log_routes):
+    config = {'LOG_STREAM': stream, 'LOG_LEVEL': 'DEBUG', 'LOG_FORMAT': 'json'}
+    if log_routes is not None:
+        config['LOG_ROUTES'] = log_routes
+    return config
+
+
+def entries(stream):
+    # Drains the queue so everything logged so far has been written
+    stop_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_redact_text():
+    text = redact_text('retry password=hunter2, "token": "abc123" Authorization: Bearer eyJhbGc.x-y')
+    assert 'hunter2' not in text and 'abc123' not in text and 'eyJhbGc' not in text
+    assert text.count(REDACTED) == 3 and text.startswith('retry password=')
+
+
+def test_redact_nested_extra():
+    value = redact({'user': 'ade', 'auth_token': 'abc', 'headers': {'Cookie': 'session=1'},
+                    'notes': ['api_key=xyz', 3]})
+    assert value == {'user': 'ade', 'auth_token': REDACTED, 'headers': {'Cookie': REDACTED},
+                     'notes': [f'api_key={REDACTED}', 3]}
+
+
+def test_messages_and_extra_are_redacted(app, stream):
+    with app.test_request_context('/api/teams'):
+        app.logger.warning('Token refresh failed: token=%s', 'abc123',
+                           extra={'password': 'hunter2', 'context': {'session_id': 's1', 'team': 7}})
+    entry = entries(stream)[0]
+    assert entry['message'] == f'Token refresh failed: token={REDACTED}'
+    assert entry['password'] == REDACTED
+    assert entry['context'] == {'session_id': REDACTED, 'team': 7}
+    assert entry['path'] == '/api/teams' and entry['method'] == 'GET'
+
+
+def test_login_never_logs_credentials(client, stream):
+    response = client.post('/api/login', json={'username': 'admin', 'password': 'admin123'})
+    token = response.get_json()['token']
+    client.get('/api/check_auth')
+    client.post('/api/login', json={'username': 'admin', 'password': 'wrong-password'})
+    entries(stream)
+    output = stream.getvalue()
+    assert 'Login succeeded' in output and 'Login failed' in output
+    for secret in ('admin123', 'wrong-password', token, 'auth_token'):
+        assert secret not in output
+
+
+def test_access_log_fields(admin, stream):
+    teams = admin.get('/api/teams', headers={'X-Request-ID': 'req-1'})
+    admin.get('/api/export/players')
+    access = [entry for entry in entries(stream) if entry['logger'] == 'app.access']
+    listed = next(entry for entry in access if entry['path'] == '/api/teams')
+    assert listed['request_id'] == 'req-1' and listed['status'] == 200 and listed['route'] == '/api/teams'
+    assert listed['bytes'] == len(teams.data) and listed['duration_ms'] >= 0
+    # Measuring a streamed body would consume it
+    exported = next(entry for entry in access if entry['path'] == '/api/export/players')
+    assert exported['status'] == 200 and exported['bytes'] is None
+
+
+@pytest.mark.parametrize('log_routes', [{'/api/teams': {'level': 'WARNING'}}])
+def test_route_level(client, stream):
+    client.get('/api/teams')
+    client.get('/api/players')
+    assert [entry['path'] for entry in entries(stream) if entry['logger'] == 'app.access'] == ['/api/players']
+
+
+def test_sampling_is_decided_once_per_request(app, monkeypatch):
+    draws = []
+    route_filter = RouteFilter({'/api/teams': {'sample': 0.5}})
+
+    def draw(value):
+        monkeypatch.setattr(log.random, 'random', lambda: draws.append(value) or value)
+
+    def record(level):
+        return logging.LogRecord('app', level, __file__, 1, 'message', (), None)
+
+    draw(0.7)
+    with app.test_request_context('/api/teams'):
+        assert not route_filter.filter(record(logging.INFO))
+        assert not route_filter.filter(record(logging.DEBUG))
+        # Warnings and errors are never sampled away
+        assert route_filter.filter(record(logging.WARNING))
+    draw(0.3)
+    with app.test_request_context('/api/teams'):
+        assert route_filter.filter(record(logging.INFO)) and route_filter.filter(record(logging.INFO))
+    with app.test_request_context('/api/players'):
+        assert route_filter.filter(record(logging.DEBUG))
+    assert draws == [0.7, 0.3]
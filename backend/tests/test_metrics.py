@@ -0,0 +1,57 @@
+import pytest
+
+from app.metrics import TimedConnection
+from app.models import get_db_connection
+from app.profiler import ProfiledConnection
+
+
+def sample(text, line_start):
+    return [line for line in text.splitlines() if line.startswith(line_start)]
+
+
+def test_metrics_count_requests_and_statements(client):
+    client.get('/api/teams')
+    text = client.get('/metrics').get_data(as_text=True)
+    assert sample(text, 'nufl_http_requests_total{method="GET",route="/api/teams",status="200"} 1')
+    (count,) = sample(text, 'nufl_db_query_duration_seconds_count')
+    assert int(count.split()[-1]) > 0
+
+
+def test_statements_are_timed_without_the_profiler(app):
+    with app.test_request_context('/api/teams'):
+        app.preprocess_request()
+        conn = get_db_connection(app)
+        assert isinstance(conn, TimedConnection)
+        rows = conn.execute("SELECT 1 UNION ALL SELECT 2").fetchall()
+        assert [tuple(row) for row in rows] == [(1,), (2,)]
+        assert app.extensions['metrics']._histograms[('nufl_db_query_duration_seconds', ())][2] == 1
+
+
+@pytest.mark.parametrize('app_config', [{'SQL_PROFILER': True}])
+def test_profiler_wraps_the_timed_connection(app, client):
+    response = client.get('/api/teams')
+    assert int(response.headers['X-SQL-Queries']) >= 1
+    with app.test_request_context('/api/teams'):
+        app.preprocess_request()
+        assert isinstance(get_db_connection(app), ProfiledConnection)
+
+
+def test_metrics_are_local_only_without_a_token(client):
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.9'}).status_code == 403
+    assert client.get('/metrics', headers={'X-Forwarded-For': '203.0.113.9'}).status_code == 403
+
+
+@pytest.mark.parametrize('app_config', [{'METRICS_TOKEN': 's3cret'}])
+def test_metrics_token(client):
+    assert client.get('/metrics').status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'},
+                          environ_base={'REMOTE_ADDR': '203.0.113.9'})
+    assert response.status_code == 200 and response.content_type.startswith('text/plain; version=0.0.4')
+
+
+@pytest.mark.parametrize('app_config', [{'METRICS_ENABLED': False}])
+def test_metrics_disabled(app, client):
+    assert client.get('/metrics').status_code == 404
+    with app.app_context():
+        assert not isinstance(get_db_connection(app), TimedConnection)
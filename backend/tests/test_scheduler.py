@@ -0,0 +1,76 @@
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from app.scheduler import round_robin
+
+
+@pytest.fixture
+def teams(db):
+    db.executemany("INSERT INTO teams (name, stadium) VALUES (?, ?)",
+                   [('Alpha', 'North'), ('Bravo', 'South'), ('Charlie', 'East'), ('Delta', 'West'), ('Echo', None)])
+    db.commit()
+    return [row[0] for row in db.execute("SELECT id FROM teams ORDER BY id")]
+
+
+def test_round_robin_pairs_every_team_home_and_away():
+    rounds = round_robin([1, 2, 3, 4, 5])
+    pairs = Counter(pair for pairs in rounds for pair in pairs)
+    assert len(rounds) == 10
+    assert set(pairs) == set((a, b) for a in range(1, 6) for b in range(1, 6) if a != b)
+    assert set(pairs.values()) == {1}
+    for pairs in rounds:
+        playing = [team for pair in pairs for team in pair]
+        assert len(playing) == len(set(playing))
+
+
+def test_schedule_respects_rest_days_and_blackouts(admin, db, teams):
+    response = admin.post('/api/fixtures/schedule', json={
+        'start_date': '2025-03-01', 'rest_days': 2, 'blackout_dates': ['2025-03-02'],
+        'venue_blackouts': {'North': ['2025-03-01', '2025-03-03']},
+    })
+    assert response.status_code == 201 and response.get_json()['created'] == 20
+    rows = db.execute("SELECT home_team_id, away_team_id, venue, date FROM fixtures").fetchall()
+    days = dict((team, sorted(date.fromisoformat(row[3]) for row in rows if team in row[:2])) for team in teams)
+    for team_days in days.values():
+        assert all((later - earlier).days > 2 for earlier, later in zip(team_days, team_days[1:]))
+    assert '2025-03-02' not in [row[3] for row in rows]
+    assert not [row for row in rows if row[2] == 'North' and row[3] in ('2025-03-01', '2025-03-03')]
+
+
+def test_dry_run_writes_nothing(admin, db, teams):
+    response = admin.post('/api/fixtures/schedule', json={'start_date': '2025-03-01', 'dry_run': True,
+                                                          'team_ids': teams[:2]})
+    assert response.status_code == 200 and len(response.get_json()['fixtures']) == 2
+    assert db.execute("SELECT COUNT(*) FROM fixtures").fetchone()[0] == 0
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'start_date': '2025-03-01', 'team_ids': 3},
+    {'start_date': '2025-03-01', 'team_ids': ['1', '2']},
+    {'start_date': '2025-03-01', 'team_ids': [1, 999]},
+    {'start_date': '2025-03-01', 'venue_blackouts': ['2025-03-02']},
+    {'start_date': '2025-03-01', 'venue_blackouts': {'North': 5}},
+    {'start_date': '2025-03-01', 'blackout_dates': {'day': '2025-03-02'}},
+    {'start_date': '2025-03-01', 'weekdays': ['someday']},
+    {'start_date': '2025-03-01', 'rest_days': '3'},
+    {'start_date': '2025-03-01', 'kickoff_time': 1500},
+    {'start_date': '2025-03-01', 'end_date': '2025-03-05'},
+])
+def test_invalid_options_are_rejected(admin, db, teams, options):
+    response = admin.post('/api/fixtures/schedule', json=options)
+    assert response.status_code == 400
+    assert db.execute("SELECT COUNT(*) FROM fixtures").fetchone()[0] == 0
+    assert not db.in_transaction
+
+
+def test_schedule_command(app, db, teams):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['schedule-season', '--start', '2025-03-01', '--team', str(teams[0]),
+                                 '--team', str(teams[1]), '--dry-run'])
+    assert result.exit_code == 0 and '2 fixtures planned' in result.output
+    result = runner.invoke(args=['schedule-season', '--start', '2025-03-01', '--weekday', 'sat'])
+    assert result.exit_code == 0 and 'Scheduled 20 fixtures' in result.output
+    assert set(date.fromisoformat(row[0]).weekday() for row in db.execute("SELECT date FROM fixtures")) == {5}
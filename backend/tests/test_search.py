@@ -0,0 +1,92 @@
+import pytest
+
+import app.migrations
+
+
+@pytest.fixture(params=['fts5', 'like'])
+def search_backend(request, monkeypatch):
+    if request.param == 'like':
+        # As on a SQLite build without FTS5: no index, LIKE matching
+        monkeypatch.setattr(app.migrations, 'fts5_available', lambda cursor: False)
+    return request.param
+
+
+@pytest.fixture
+def app_config(search_backend):
+    return {}
+
+
+def search(client, query, **params):
+    response = client.get('/api/search', query_string=dict(q=query, **params))
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def titles(result):
+    return [(row['type'], row['title']) for row in result['results']]
+
+
+def test_searches_teams_players_and_published_news(admin, search_backend):
+    team = admin.post('/api/teams', json={'name': 'Lagos Lions', 'university': 'UNILAG', 'city': 'Lagos'}).get_json()['id']
+    admin.post('/api/players', json={'name': 'Tunde Lawal', 'team_id': team, 'position': 'Striker'})
+    admin.post('/api/news', json={'title': 'Lions roar', 'content': 'Tunde scores twice', 'published': True})
+    admin.post('/api/news', json={'title': 'Lions draft', 'content': 'Tunde transfer rumour', 'published': False})
+    assert sorted(titles(search(admin, 'tunde'))) == [('news', 'Lions roar'), ('players', 'Tunde Lawal')]
+    assert titles(search(admin, 'lions', type='news')) == [('news', 'Lions roar')]
+    # Every word must match
+    assert titles(search(admin, 'tunde striker')) == [('players', 'Tunde Lawal')]
+    assert search(admin, 'nobody')['results'] == []
+
+
+def test_index_follows_inserts_updates_and_deletes(admin, db, search_backend):
+    team = admin.post('/api/teams', json={'name': 'Abuja Eagles', 'city': 'Abuja'}).get_json()['id']
+    assert titles(search(admin, 'eagles')) == [('teams', 'Abuja Eagles')]
+    admin.put(f'/api/teams/{team}', json={'name': 'Abuja Hawks', 'city': 'Abuja'})
+    assert search(admin, 'eagles')['results'] == []
+    assert titles(search(admin, 'hawks')) == [('teams', 'Abuja Hawks')]
+    # Direct SQL writes are indexed too
+    db.execute("UPDATE teams SET city = 'Kano' WHERE id = ?", (team,))
+    db.execute("INSERT INTO teams (name, city) VALUES ('Kano Pillars', 'Kano')")
+    db.commit()
+    admin.delete(f'/api/teams/{team}')
+    assert titles(search(admin, 'kano')) == [('teams', 'Kano Pillars')]
+
+
+def test_fts_ranking_prefixes_and_snippets(admin, search_backend):
+    if search_backend != 'fts5':
+        pytest.skip('ranking and highlighting need FTS5')
+    admin.post('/api/teams', json={'name': 'Enugu Rangers', 'city': 'Lagos'})
+    admin.post('/api/teams', json={'name': 'Lagos Lions', 'city': 'Ikeja'})
+    result = search(admin, 'lagos')
+    # A name match outweighs a city match
+    assert titles(result) == [('teams', 'Lagos Lions'), ('teams', 'Enugu Rangers')]
+    assert result['results'][0]['rank'] < result['results'][1]['rank']
+    assert titles(search(admin, 'rang')) == [('teams', 'Enugu Rangers')]
+
+    admin.post('/api/news', json={'title': 'Preview', 'content': '<b>Derby</b> day at the stadium', 'published': True})
+    snippet = search(admin, 'derby', type='news')['results'][0]['snippet']
+    assert '&lt;b&gt;<mark>Derby</mark>&lt;/b&gt;' in snippet
+
+
+def test_like_fallback_escapes_snippets(admin, search_backend):
+    if search_backend != 'like':
+        pytest.skip('covers the fallback only')
+    admin.post('/api/news', json={'title': 'Preview', 'content': '<b>Derby</b> day', 'published': True})
+    result = search(admin, 'derby')['results']
+    assert result == [{'type': 'news', 'id': 1, 'title': 'Preview', 'snippet': '&lt;b&gt;Derby&lt;/b&gt; day',
+                       'rank': None}]
+
+
+def test_pagination(admin, search_backend):
+    for number in range(3):
+        admin.post('/api/teams', json={'name': f'United {number}'})
+    first = search(admin, 'united', limit=2)
+    assert len(first['results']) == 2 and first['next_offset'] == 2
+    rest = search(admin, 'united', limit=2, offset=2)
+    assert len(rest['results']) == 1 and rest['next_offset'] is None
+
+
+@pytest.mark.parametrize('query', [{'q': '!!'}, {'q': 'a' * 201}, {'q': 'lions', 'type': 'fixtures'},
+                                   {'q': 'lions', 'limit': '0'}, {'q': 'lions', 'offset': '-1'}])
+def test_bad_arguments(client, query):
+    assert client.get('/api/search', query_string=query).status_code == 400
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+
+def test_login_is_stored_server_side(app, admin, db):
+    assert admin.get('/api/check_auth').status_code == 200
+    (sid_count,) = db.execute("SELECT COUNT(*) FROM sessions").fetchone()
+    assert sid_count == 1
+    (data,) = db.execute("SELECT data FROM sessions").fetchone()
+    assert 'admin' in data
+
+    assert admin.post('/api/logout').status_code == 200
+    assert db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
+    assert admin.get('/api/check_auth').status_code == 401
+
+
+def test_tampered_cookie_is_rejected(app, client):
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], 'made-up-session-id.bad-signature')
+    assert client.get('/api/check_auth').status_code == 401
+
+
+def test_expired_sessions_are_rejected_and_swept(app, admin, db):
+    app.session_interface.cache_ttl = 0
+    db.execute("UPDATE sessions SET expires_at = ?", (time.time() - 1,))
+    db.commit()
+    assert admin.get('/api/check_auth').status_code == 401
+
+    app.session_interface.sweep_interval = 0
+    other = app.test_client()
+    other.post('/api/login', json={'username': 'admin', 'password': 'admin123'})
+    assert db.execute("SELECT COUNT(*) FROM sessions WHERE expires_at <= ?", (time.time(),)).fetchone()[0] == 0
+
+
+@pytest.mark.parametrize('app_config', [{'SESSION_BACKEND': 'signed'}])
+def test_signed_cookie_backend(admin, db):
+    assert admin.get('/api/check_auth').status_code == 200
+    assert db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
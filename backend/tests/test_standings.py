@@ -0,0 +1,88 @@
+from app.standings import compute_standings, empty_row, read_standings, sort_table
+
+
+def create_team(client, name):
+    response = client.post('/api/teams', json={'name': name, 'city': 'Lagos'})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def create_fixture(client, home, away, date='2025-03-01'):
+    response = client.post('/api/fixtures', json={'home_team_id': home, 'away_team_id': away, 'date': date})
+    assert response.status_code == 200
+    return response.get_json()['id']
+
+
+def table_by_team(rows):
+    # compute_standings rows have no thumbnail field
+    return dict((row['team_id'], dict((key, value) for key, value in row.items() if key != 'logo_thumb_url'))
+                for row in rows)
+
+
+def assert_matches_recompute(db):
+    assert table_by_team(read_standings(db)) == table_by_team(compute_standings(db))
+
+
+def test_results_update_standings(app, admin, db):
+    a, b, c = (create_team(admin, name) for name in ('Alpha', 'Bravo', 'Charlie'))
+    first = create_fixture(admin, a, b)
+    second = create_fixture(admin, b, c)
+    assert admin.post(f'/api/fixtures/{first}/result', json={'home_score': 2, 'away_score': 1}).status_code == 200
+    assert admin.post(f'/api/fixtures/{second}/result', json={'home_score': 0, 'away_score': 0}).status_code == 200
+
+    table = admin.get('/api/league_table').get_json()
+    # Bravo and Charlie are level on points; Charlie has the better goal difference
+    assert [row['team_id'] for row in table] == [a, c, b]
+    rows = table_by_team(table)
+    assert rows[a]['points'] == 3 and rows[a]['wins'] == 1
+    assert rows[b]['points'] == 1 and rows[b]['losses'] == 1 and rows[b]['draws'] == 1
+    assert rows[c]['points'] == 1 and rows[c]['goal_difference'] == 0
+    assert_matches_recompute(db)
+
+
+def test_corrections_and_deletes_reverse_deltas(app, admin, db):
+    a, b = create_team(admin, 'Alpha'), create_team(admin, 'Bravo')
+    fixture = create_fixture(admin, a, b)
+    admin.post(f'/api/fixtures/{fixture}/result', json={'home_score': 3, 'away_score': 0})
+    admin.post(f'/api/fixtures/{fixture}/result', json={'home_score': 0, 'away_score': 1})
+    rows = table_by_team(read_standings(db))
+    assert rows[a]['points'] == 0 and rows[b]['points'] == 3 and rows[b]['matches_played'] == 1
+    assert_matches_recompute(db)
+
+    assert admin.delete(f'/api/fixtures/{fixture}').status_code == 200
+    rows = table_by_team(read_standings(db))
+    assert rows[a]['matches_played'] == 0 and rows[b]['points'] == 0
+    assert_matches_recompute(db)
+
+
+def test_batch_results_apply_atomically(app, admin, db):
+    a, b, c = (create_team(admin, name) for name in ('Alpha', 'Bravo', 'Charlie'))
+    first = create_fixture(admin, a, b)
+    second = create_fixture(admin, a, c)
+    response = admin.post('/api/fixtures/results', json={'results': [
+        {'fixture_id': first, 'home_score': 1, 'away_score': 0},
+        {'fixture_id': second + 100, 'home_score': 1, 'away_score': 0},
+    ]})
+    assert response.status_code == 404
+    assert table_by_team(read_standings(db))[a]['matches_played'] == 0
+
+    response = admin.post('/api/fixtures/results', json=[
+        {'fixture_id': first, 'home_score': 1, 'away_score': 0},
+        {'fixture_id': second, 'home_score': 2, 'away_score': 2},
+    ])
+    assert response.status_code == 200
+    assert table_by_team(read_standings(db))[a]['points'] == 4
+    assert_matches_recompute(db)
+
+
+def test_level_teams_are_ordered_by_team_id(admin, db):
+    a, b, c, d = (create_team(admin, name) for name in ('Alpha', 'Bravo', 'Charlie', 'Delta'))
+    for home, away in ((d, c), (b, a)):
+        fixture = create_fixture(admin, home, away)
+        admin.post(f'/api/fixtures/{fixture}/result', json={'home_score': 1, 'away_score': 0})
+    expected = [b, d, a, c]
+    assert [row['team_id'] for row in read_standings(db)] == expected
+    assert [row['team_id'] for row in compute_standings(db)] == expected
+    # Whatever order the rows arrive in
+    rows = [empty_row(team_id, str(team_id), None) for team_id in (3, 1, 2)]
+    assert [row['team_id'] for row in sort_table(rows)] == [1, 2, 3]
@@ -0,0 +1,110 @@
+import hashlib
+import io
+import os
+import time
+
+import pytest
+
+from app.images import variant_names
+from app.routes.uploads import IMMUTABLE_CACHE, LEGACY_CACHE, SHORT_CACHE
+from app.storage import referenced_uploads, unreferenced_files
+
+PNG = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                    '1f15c4890000000d4944415478da63f8cfc0f01f0005000201a5f0a1b30000000049454e44ae426082')
+DAY = 86400
+
+
+def upload(client, data, name='logo.png'):
+    return client.post('/api/upload', data={'file': (io.BytesIO(data), name)},
+                       content_type='multipart/form-data')
+
+
+def write_upload(folder, data, age=0):
+    # A blob plus every rendition, all last modified `age` seconds ago
+    blob = f"{hashlib.sha256(data).hexdigest()}.png"
+    names = [blob] + [name for names in variant_names(blob).values() for name in names.values()]
+    for name in names:
+        path = os.path.join(folder, name)
+        with open(path, 'wb') as out:
+            out.write(data)
+        os.utime(path, (time.time() - age, time.time() - age))
+    return names
+
+
+def test_reupload_reuses_blob(client):
+    first = upload(client, PNG).get_json()
+    second = upload(client, PNG, 'copy.png').get_json()
+    assert first['hash'] == second['hash'] == hashlib.sha256(PNG).hexdigest()
+    assert not first['deduplicated'] and second['deduplicated']
+
+
+def test_gc_keeps_uploads_referenced_through_a_rendition(app, db):
+    folder = app.config['UPLOAD_FOLDER']
+    kept = write_upload(folder, PNG, age=2 * DAY)
+    dropped = write_upload(folder, PNG + b'other', age=2 * DAY)
+    db.execute("INSERT INTO teams (name, logo_url) VALUES ('Alpha', ?)",
+               (f'http://localhost/api/static/uploads/{kept[1]}',))
+    db.commit()
+    garbage = [name for name, _ in unreferenced_files(folder, referenced_uploads(db), DAY)]
+    assert garbage == sorted(dropped)
+
+    result = app.test_cli_runner().invoke(args=['gc-uploads'])
+    assert result.exit_code == 0
+    assert sorted(os.listdir(folder)) == sorted(kept)
+
+
+def test_reupload_refreshes_renditions(app, client):
+    folder = app.config['UPLOAD_FOLDER']
+    names = write_upload(folder, PNG, age=2 * DAY)
+    assert upload(client, PNG).get_json()['deduplicated']
+    assert unreferenced_files(folder, set(), DAY) == []
+    assert all(os.path.getmtime(os.path.join(folder, name)) > time.time() - 60 for name in names)
+
+
+def test_legacy_upload_loads_through_its_thumb_url(app, admin):
+    folder = app.config['UPLOAD_FOLDER']
+    with open(os.path.join(folder, 'EBSU logo.jfif'), 'wb') as out:
+        out.write(b'legacy jfif')
+    url = 'http://localhost/api/static/uploads/EBSU logo.jfif'
+    admin.post('/api/teams', json={'name': 'EBSU', 'logo_url': url})
+    team = admin.get('/api/teams').get_json()[0]
+    # No renditions are rendered from .jfif, so the list points at the upload itself
+    assert team['logo_thumb_url'] == url
+    assert admin.get(team['logo_thumb_url']).data == b'legacy jfif'
+    # Thumb URLs handed out before the fix still resolve
+    response = admin.get('/api/static/uploads/EBSU logo_thumb.webp')
+    assert response.status_code == 200 and response.data == b'legacy jfif'
+
+
+def test_served_upload_caching(app, client):
+    url = upload(client, PNG).get_json()['url']
+    response = client.get(url)
+    assert response.data == PNG and response.headers['Cache-Control'] == IMMUTABLE_CACHE
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], 'legacy.png'), 'wb') as out:
+        out.write(PNG)
+    assert client.get('/api/static/uploads/legacy.png').headers['Cache-Control'] == LEGACY_CACHE
+    # A missing rendition serves the upload, but not for long
+    response = client.get('/api/static/uploads/legacy_thumb.webp')
+    assert response.data == PNG and response.headers['Cache-Control'] == SHORT_CACHE
+    assert client.get('/api/static/uploads/missing.png').status_code == 404
+
+
+@pytest.mark.parametrize('app_config', [{'UPLOADS_SERVE_MODE': 'x-sendfile'}])
+def test_x_sendfile_mode(app, client):
+    url = upload(client, PNG).get_json()['url']
+    response = client.get(url)
+    assert response.headers['X-Sendfile'] == os.path.join(app.config['UPLOAD_FOLDER'], url.rsplit('/', 1)[-1])
+    assert not response.data and response.headers['Cache-Control'] == IMMUTABLE_CACHE
+
+
+@pytest.mark.parametrize('app_config', [{'UPLOADS_SERVE_MODE': 'x-accel', 'UPLOADS_ACCEL_PREFIX': '/protected/'}])
+def test_x_accel_mode(app, client):
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], 'EBSU logo.jfif'), 'wb') as out:
+        out.write(b'legacy jfif')
+    response = client.get('/api/static/uploads/EBSU logo.jfif')
+    assert response.headers['X-Accel-Redirect'] == '/protected/EBSU%20logo.jfif'
+    assert not response.data and response.headers['Cache-Control'] == LEGACY_CACHE
+    fallback = client.get('/api/static/uploads/EBSU logo_thumb.webp')
+    assert fallback.headers['X-Accel-Redirect'] == '/protected/EBSU%20logo.jfif'
+    assert fallback.headers['Cache-Control'] == SHORT_CACHE
+    assert client.get('/api/static/uploads/missing.png').status_code == 404
@@ -8,20 +8,6 @@ function Home() {
   const [news, setNews] = useState([]);
   const [loading, setLoading] = useState(true);
 
-  useEffect(() => {
-    async function fetchNews() {
-      try {
-        const response = await dataAPI.getNews();
-        setNews(response.data);
-      } catch (error) {
-        console.error('Error fetching news:', error);
-      } finally {
-        setLoading(false);
-      }
-    }
-    fetchNews();
-  }, []);
-
   useEffect(() => {
     fetchHomeData();
   }, []);
@@ -29,18 +15,11 @@ function Home() {
   const fetchHomeData = async () => {
     try {
       setLoading(true);
-      
-      // Fetch upcoming matches (next 5 fixtures)
-      const fixturesResponse = await dataAPI.getFixtures();
-      const upcoming = fixturesResponse.data
-        .filter(fixture => fixture.status === 'scheduled')
-        .slice(0, 5);
-      setUpcomingMatches(upcoming);
-      
-      // Fetch league table
-      const tableResponse = await dataAPI.getLeagueTable();
-      setLeagueTable(tableResponse.data.slice(0, 10)); // Top 10 teams
-      
+      // One round trip: latest news, next 5 fixtures and the top 10 teams
+      const response = await dataAPI.getHome({ news: 6, fixtures: 5, table: 10 });
+      setNews(response.data.news);
+      setUpcomingMatches(response.data.upcoming_fixtures);
+      setLeagueTable(response.data.league_table);
     } catch (error) {
       console.error('Error fetching home data:', error);
     } finally {
@@ -106,7 +85,7 @@ function Home() {
                         <div className="flex items-center space-x-4">
                           <div className="text-center">
                             <img 
-                              src={match.home_logo || 'https://via.placeholder.com/40x40/22c55e/ffffff?text=H'} 
+                              src={match.home_team_logo_thumb || match.home_team_logo || 'https://via.placeholder.com/40x40/22c55e/ffffff?text=H'} 
                               alt="Home Team"
                               className="w-10 h-10 rounded-full"
                             />
@@ -117,7 +96,7 @@ function Home() {
                           </div>
                           <div className="text-center">
                             <img 
-                              src={match.away_logo || 'https://via.placeholder.com/40x40/3b82f6/ffffff?text=A'} 
+                              src={match.away_team_logo_thumb || match.away_team_logo || 'https://via.placeholder.com/40x40/3b82f6/ffffff?text=A'} 
                               alt="Away Team"
                               className="w-10 h-10 rounded-full"
                             />
@@ -125,7 +104,7 @@ function Home() {
                           </div>
                         </div>
                         <div className="text-right">
-                          <p className="text-sm font-semibold text-gray-900">{match.match_date}</p>
+                          <p className="text-sm font-semibold text-gray-900">{match.date}</p>
                           <p className="text-xs text-gray-500">Matchweek {match.id}</p>
                         </div>
                       </div>
@@ -167,7 +146,7 @@ function Home() {
                         </span>
                         <div className="flex items-center space-x-2">
                           <img 
-                            src={team.logo_url || 'https://via.placeholder.com/24x24/22c55e/ffffff?text=T'} 
+                            src={team.logo_thumb_url || team.logo_url || 'https://via.placeholder.com/24x24/22c55e/ffffff?text=T'} 
                             alt={team.team_name || team.name}
                             className="w-6 h-6 rounded-full"
                           />
@@ -204,7 +183,7 @@ function Home() {
                 {news.map((article) => (
                   <div key={article.id} className="bg-gray-50 rounded-lg overflow-hidden hover:shadow-md transition-shadow">
                     <img 
-                      src={article.image_url || 'https://via.placeholder.com/300x200?text=No+Image'} 
+                      src={article.image_medium_url || article.image_url || 'https://via.placeholder.com/300x200?text=No+Image'} 
                       alt={article.title}
                       className="w-full h-48 object-cover"
                     />
@@ -43,7 +43,7 @@ function News() {
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
           {news.map(article => (
             <div key={article.id} className="bg-white rounded-lg shadow-lg p-6 flex flex-col items-center hover:shadow-xl transition-shadow">
-              <img src={article.image_url || 'https://via.placeholder.com/400x250?text=No+Image'} alt={article.title} className="w-full h-48 object-cover mb-4 rounded" />
+              <img src={article.image_medium_url || article.image_url || 'https://via.placeholder.com/400x250?text=No+Image'} alt={article.title} className="w-full h-48 object-cover mb-4 rounded" />
               <h3 className="text-lg font-bold text-gray-900 mb-1">{article.title}</h3>
               <div className="text-sm text-gray-500 mb-2">{article.author} - {article.category}</div>
               <div className="text-xs text-gray-400">{article.created_at}</div>
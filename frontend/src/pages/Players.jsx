@@ -42,7 +42,7 @@ function Players() {
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-8">
           {players.map(player => (
             <div key={player.id} className="bg-white rounded-lg shadow-lg p-6 flex flex-col items-center hover:shadow-xl transition-shadow">
-              <img src={player.photo_url || 'https://via.placeholder.com/64x64?text=No+Image'} alt={player.name} className="w-16 h-16 rounded-full mb-4 object-cover" />
+              <img src={player.photo_thumb_url || player.photo_url || 'https://via.placeholder.com/64x64?text=No+Image'} alt={player.name} className="w-16 h-16 rounded-full mb-4 object-cover" />
               <h3 className="text-lg font-bold text-gray-900 mb-1">{player.name}</h3>
               <div className="text-sm text-gray-500 mb-2">{player.position} - {player.team_name || player.team}</div>
               <div className="flex space-x-4 mt-2">
@@ -13,9 +13,8 @@ function Results() {
   const fetchResults = async () => {
     try {
       setLoading(true);
-      const response = await dataAPI.getFixtures();
-      const completedMatches = response.data.filter(fixture => fixture.status === 'completed');
-      setResults(completedMatches);
+      const response = await dataAPI.getFixtures({ status: 'completed' });
+      setResults(response.data);
     } catch (error) {
       console.error('Error fetching results:', error);
     } finally {
@@ -109,7 +108,7 @@ function Results() {
                     <div className="flex items-center justify-between mb-4">
                       <div className="flex items-center space-x-3 flex-1">
                         <img 
-                          src={match.home_team_logo || 'https://via.placeholder.com/48x48/22c55e/ffffff?text=H'} 
+                          src={match.home_team_logo_thumb || match.home_team_logo || 'https://via.placeholder.com/48x48/22c55e/ffffff?text=H'} 
                           alt={match.home_team}
                           className="w-12 h-12 rounded-full object-cover"
                         />
@@ -121,7 +120,7 @@ function Results() {
                       <div className="flex items-center space-x-3 flex-1 justify-end">
                         <span className="font-medium">{match.away_team}</span>
                         <img 
-                          src={match.away_team_logo || 'https://via.placeholder.com/48x48/22c55e/ffffff?text=A'} 
+                          src={match.away_team_logo_thumb || match.away_team_logo || 'https://via.placeholder.com/48x48/22c55e/ffffff?text=A'} 
                           alt={match.away_team}
                           className="w-12 h-12 rounded-full object-cover"
                         />
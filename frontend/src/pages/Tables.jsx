@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { dataAPI } from '../services/api';
+import { dataAPI, liveAPI } from '../services/api';
 
 function Tables() {
   const [leagueTable, setLeagueTable] = useState([]);
@@ -9,6 +9,23 @@ function Tables() {
     fetchLeagueTable();
   }, []);
 
+  // Apply live standings changes while the page is open
+  useEffect(() => {
+    const source = liveAPI.subscribe({
+      standings: ({ rows, removed }) => {
+        setLeagueTable((table) => {
+          const updates = new Map(rows.map((row) => [row.team_id, row]));
+          return table
+            .filter((team) => !removed.includes(team.team_id))
+            .map((team) => (updates.has(team.team_id) ? { ...team, ...updates.get(team.team_id) } : team))
+            .sort((a, b) => b.points - a.points || b.goal_difference - a.goal_difference || b.goals_for - a.goals_for);
+        });
+      },
+      resync: () => fetchLeagueTable(),
+    });
+    return () => source.close();
+  }, []);
+
   const fetchLeagueTable = async () => {
     try {
       setLoading(true);
@@ -133,7 +150,7 @@ function Tables() {
                     <td className="px-6 py-4 whitespace-nowrap">
                       <div className="flex items-center">
                         <img 
-                          src={team.logo_url} 
+                          src={team.logo_thumb_url || team.logo_url} 
                           alt={team.team_name || team.name}
                           className="w-8 h-8 rounded-full mr-3"
                         />
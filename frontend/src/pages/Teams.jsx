@@ -43,7 +43,7 @@ function Teams() {
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-8">
           {teams.map(team => (
             <div key={team.id} className="bg-white rounded-lg shadow-lg p-6 flex flex-col items-center hover:shadow-xl transition-shadow">
-              <img src={team.logo_url || 'https://via.placeholder.com/64x64?text=No+Logo'} alt={team.name} className="w-16 h-16 rounded-full mb-4 object-cover" />
+              <img src={team.logo_thumb_url || team.logo_url || 'https://via.placeholder.com/64x64?text=No+Logo'} alt={team.name} className="w-16 h-16 rounded-full mb-4 object-cover" />
               <h3 className="text-lg font-bold text-gray-900 mb-1">{team.name}</h3>
               <div className="text-sm text-gray-500 mb-2">{team.university} - {team.city}</div>
               <div className="text-xs text-gray-400">Founded: {team.founded}</div>
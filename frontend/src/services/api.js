@@ -97,6 +97,8 @@ export const fixturesAPI = {
   updateFixture: (id, fixtureData) => api.put(`/fixtures/${id}`, fixtureData),
   deleteFixture: (id) => api.delete(`/fixtures/${id}`),
   updateResult: (id, resultData) => api.post(`/fixtures/${id}/result`, resultData),
+  // results: [{ fixture_id, home_score, away_score }], saved all-or-nothing
+  updateResults: (results) => api.post('/fixtures/results', { results }),
 };
 
 // News API
@@ -113,9 +115,30 @@ export const dataAPI = {
   getLeagueTable: () => api.get('/league_table'),
   getTeams: () => api.get('/teams'),
   getPlayers: () => api.get('/players'),
-  getFixtures: () => api.get('/fixtures'),
+  // params: status, team_id, date_from, date_to, order, limit, cursor
+  getFixtures: (params) => api.get('/fixtures', { params }),
   getStats: () => api.get('/stats'),
   getNews: () => api.get('/news'),
+  // params: news, fixtures, table (item count per section)
+  getHome: (params) => api.get('/home', { params }),
+};
+
+// Live match updates (Server-Sent Events). handlers: { fixture, standings, resync }
+// Returns the EventSource; call .close() to stop listening.
+export const liveAPI = {
+  subscribe: (handlers) => {
+    const source = new EventSource(`${import.meta.env.VITE_API_URL || '/api'}/live`, { withCredentials: true });
+    Object.entries(handlers).forEach(([event, handler]) => {
+      source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+    });
+    return source;
+  },
+};
+
+// Search API
+export const searchAPI = {
+  // params: type (teams,players,news), limit, offset
+  search: (q, params) => api.get('/search', { params: { q, ...params } }),
 };
 
 // Actions API (legacy - keeping for compatibility)